@@ -0,0 +1,112 @@
+"""
+Deployment Event Stream Endpoints
+Push deployment lifecycle events over Server-Sent Events and WebSocket
+"""
+import asyncio
+import logging
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from app.config import settings
+from app.core.dependencies import get_event_bus
+from app.services.event_bus import DeploymentEventBus, SlowConsumerError
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/deployments", tags=["deployment events"])
+
+SLOW_CONSUMER_SSE = b'event: disconnect\ndata: {"reason":"slow_consumer"}\n\n'
+
+
+@router.get(
+    "/events",
+    summary="Stream deployment events (Server-Sent Events)",
+    responses={200: {"content": {"text/event-stream": {}}}}
+)
+async def stream_events(
+    application: Optional[str] = None,
+    environment: Optional[str] = None,
+    deployment_id: Optional[str] = None,
+    bus: DeploymentEventBus = Depends(get_event_bus)
+) -> StreamingResponse:
+    """
+    Stream created, started and completed events of matching deployments
+    
+    Filter by application and/or environment, or watch a single
+    deployment by ID. Events come from the service as deployments change,
+    no repository reads are involved. A client that falls too far behind
+    receives a `disconnect` event and the stream ends.
+    """
+    return StreamingResponse(
+        _sse_stream(bus, application, environment, deployment_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/events/ws")
+async def websocket_events(
+    websocket: WebSocket,
+    application: Optional[str] = None,
+    environment: Optional[str] = None,
+    deployment_id: Optional[str] = None,
+    bus: DeploymentEventBus = Depends(get_event_bus)
+) -> None:
+    """Same events as /events, one JSON text frame per event"""
+    await websocket.accept()
+    subscription = bus.subscribe(application, environment, deployment_id)
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(websocket))
+    try:
+        while True:
+            next_event = asyncio.ensure_future(subscription.get())
+            await asyncio.wait({next_event, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                next_event.cancel()
+                return
+            try:
+                events = [next_event.result(), *subscription.drain()]
+            except SlowConsumerError:
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="slow consumer")
+                return
+            for event in events:
+                await websocket.send_text(event.text)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        subscription.close()
+
+
+async def _sse_stream(
+    bus: DeploymentEventBus,
+    application: Optional[str],
+    environment: Optional[str],
+    deployment_id: Optional[str]
+) -> AsyncIterator[bytes]:
+    # Subscribe once streaming starts, so the finally clause always runs
+    subscription = bus.subscribe(application, environment, deployment_id)
+    try:
+        yield b": connected\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.get(), timeout=settings.event_heartbeat_seconds
+                )
+                events = [event, *subscription.drain()]
+            except asyncio.TimeoutError:
+                # Comment lines keep proxies from closing an idle stream
+                yield b": keepalive\n\n"
+                continue
+            except SlowConsumerError:
+                yield SLOW_CONSUMER_SSE
+                return
+            yield b"".join(event.sse for event in events)
+    finally:
+        subscription.close()
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    """Read and ignore client frames until the client goes away"""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
@@ -2,22 +2,101 @@
 Deployment API Endpoints
 RESTful API for deployment management
 """
-from fastapi import APIRouter, Depends, status, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, Header, Query, status, HTTPException
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+import csv
+import io
 import logging
 
 from app.schemas.deployment_schema import (
     DeploymentCreateRequest,
     DeploymentResponse,
-    DeploymentListResponse
+    DeploymentListResponse,
+    DeploymentBatchCreateRequest,
+    DeploymentBatchStartRequest,
+    DeploymentBatchCompleteRequest,
+    DeploymentBatchResponse
+)
+from app.schemas.deployment_serializers import (
+    BatchItemPayload,
+    batch_result_json,
+    deployment_fields_json,
+    deployment_json,
+    deployment_list_json
+)
+from app.services.deployment_service import BatchResult, DeploymentService, deployment_cache_key
+from app.services.cache_service import CacheService
+from app.core.dependencies import get_deployment_service, get_cache_service
+from app.core.responses import FastJSONResponse, etag_matches, not_modified
+from app.config import settings
+from app.models.deployment import Deployment, DeploymentFilter, DeploymentStatus
+from app.utils.constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.exceptions import (
+    ApplicationError,
+    DeploymentNotFoundError,
+    InvalidStateTransitionError,
+    ValidationError
 )
-from app.services.deployment_service import DeploymentService
-from app.core.dependencies import get_deployment_service
-from app.core.exceptions import DeploymentNotFoundError
 
 logger = logging.getLogger(__name__)
+# Service calls block on the repository (a SQL round trip or a pool wait),
+# so the endpoints run them in the threadpool, never on the event loop
 router = APIRouter(prefix="/deployments", tags=["deployments"])
 
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_COMPLETED_STATUSES = (DeploymentStatus.SUCCESS, DeploymentStatus.FAILED)
+
+
+def deployment_cache_headers(updated_at: datetime, deployment_status: DeploymentStatus) -> Dict[str, str]:
+    """ETag and Cache-Control of a single deployment"""
+    if DeploymentStatus(deployment_status) in _COMPLETED_STATUSES:
+        max_age = settings.completed_deployment_max_age_seconds
+        cache_control = f"public, max-age={max_age}, immutable"
+    else:
+        # Still changing, caches revalidate every time; the ETag makes that cheap
+        cache_control = "no-cache"
+    version = (updated_at - _EPOCH) // _MICROSECOND
+    return {"ETag": f'W/"{version:x}"', "Cache-Control": cache_control}
+
+
+def deployment_filter(
+    application: Optional[str] = None,
+    environment: Optional[str] = None,
+    deployment_status: Optional[DeploymentStatus] = Query(None, alias="status"),
+    deployed_by: Optional[str] = None,
+    created_since: Optional[datetime] = Query(None, description="Created at or after (inclusive)"),
+    created_before: Optional[datetime] = Query(None, description="Created before (exclusive)")
+) -> DeploymentFilter:
+    """Deployment filter from query parameters"""
+    return DeploymentFilter(
+        application=application,
+        environment=environment,
+        status=deployment_status,
+        deployed_by=deployed_by,
+        created_since=created_since,
+        created_before=created_before
+    )
+
+
+def response_fields(
+    fields: Optional[str] = Query(
+        None, description="Comma-separated deployment fields to return, all when omitted"
+    )
+) -> Optional[List[str]]:
+    """Projected response fields from the `fields` query parameter"""
+    if not fields:
+        return None
+    requested = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in DeploymentResponse.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return requested
+
 
 @router.post(
     "",
@@ -28,15 +107,72 @@ router = APIRouter(prefix="/deployments", tags=["deployments"])
 async def create_deployment(
     request: DeploymentCreateRequest,
     service: DeploymentService = Depends(get_deployment_service)
-) -> DeploymentResponse:
+) -> FastJSONResponse:
     """Create a new deployment"""
-    deployment = service.create_deployment(
+    deployment = await run_in_threadpool(
+        service.create_deployment,
         application=request.application,
         version=request.version,
         environment=request.environment,
         deployed_by=request.deployed_by
     )
-    return DeploymentResponse.model_validate(deployment)
+    return FastJSONResponse(deployment_json(deployment), status_code=status.HTTP_201_CREATED)
+
+
+@router.post(
+    ":batch",
+    response_model=DeploymentBatchResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create several deployments"
+)
+async def create_deployments(
+    request: DeploymentBatchCreateRequest,
+    service: DeploymentService = Depends(get_deployment_service)
+) -> FastJSONResponse:
+    """
+    Create several deployments at once
+    
+    The whole batch is validated before anything is written and is
+    created in one transaction, so either every deployment is created or
+    none is.
+    """
+    deployments = await run_in_threadpool(
+        service.create_deployments, [item.model_dump() for item in request.deployments]
+    )
+    return _batch_response(
+        [(d.id, d) for d in deployments], status.HTTP_201_CREATED, status.HTTP_201_CREATED
+    )
+
+
+@router.post(
+    ":batchStart",
+    response_model=DeploymentBatchResponse,
+    summary="Start several deployments"
+)
+async def start_deployments(
+    request: DeploymentBatchStartRequest,
+    service: DeploymentService = Depends(get_deployment_service)
+) -> FastJSONResponse:
+    """Start several deployments, each item succeeds or fails on its own"""
+    results = await run_in_threadpool(service.start_deployments, request.ids)
+    return _batch_response(results, status.HTTP_200_OK)
+
+
+@router.post(
+    ":batchComplete",
+    response_model=DeploymentBatchResponse,
+    summary="Complete several deployments"
+)
+async def complete_deployments(
+    request: DeploymentBatchCompleteRequest,
+    service: DeploymentService = Depends(get_deployment_service)
+) -> FastJSONResponse:
+    """Complete several deployments, each item succeeds or fails on its own"""
+    results = await run_in_threadpool(
+        service.complete_deployments,
+        [(item.id, item.success, item.error) for item in request.deployments]
+    )
+    return _batch_response(results, status.HTTP_200_OK)
 
 
 @router.get(
@@ -45,21 +181,78 @@ async def create_deployment(
     summary="List all deployments"
 )
 async def list_deployments(
-    page: int = 1,
-    page_size: int = 20,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    filters: DeploymentFilter = Depends(deployment_filter),
+    fields: Optional[List[str]] = Depends(response_fields),
+    if_none_match: Optional[str] = Header(None),
     service: DeploymentService = Depends(get_deployment_service)
-) -> DeploymentListResponse:
-    """List all deployments with pagination"""
-    deployments, total = service.list_deployments(page=page, page_size=page_size)
+) -> Response:
+    """
+    List deployments matching the filters with pagination
+    
+    Pass the `next_cursor` of a page as `cursor` to fetch the following
+    page without an offset scan; keep the same filters. With `fields`
+    only those attributes of each deployment are built and returned.
+    The ETag changes with every deployment write; send it back as
+    If-None-Match to get a 304 while nothing has changed.
+    """
+    # Read before the page, so a concurrent write makes the tag stale, never the body
+    version = await run_in_threadpool(service.collection_version)
+    headers = {"ETag": f'W/"{version}"', "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return not_modified(headers)
+    
+    try:
+        deployments, total, next_cursor = await run_in_threadpool(
+            service.list_deployments, page=page, page_size=page_size, cursor=cursor, filters=filters
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return DeploymentListResponse(
-        deployments=[DeploymentResponse.model_validate(d) for d in deployments],
-        total=total,
-        page=page,
-        page_size=page_size
+    return FastJSONResponse(
+        deployment_list_json(deployments, total, page, page_size, next_cursor, fields=fields),
+        headers=headers
     )
 
 
+@router.get(
+    "/export",
+    summary="Export deployment history",
+    responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}}
+)
+async def export_deployments(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    cursor: Optional[str] = Query(None, description="Resume after the record with this cursor"),
+    filters: DeploymentFilter = Depends(deployment_filter),
+    fields: Optional[List[str]] = Depends(response_fields),
+    service: DeploymentService = Depends(get_deployment_service)
+) -> StreamingResponse:
+    """
+    Stream every matching deployment in creation order as NDJSON or CSV
+    
+    The repository is read one batch at a time in the threadpool, so
+    memory use does not depend on the size of the history and the event
+    loop keeps serving other requests meanwhile. Every record carries a
+    `cursor`; pass the cursor of the last record received to resume an
+    interrupted export with the same filters.
+    """
+    try:
+        batches = service.export_deployments(filters=filters, cursor=cursor)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    columns = fields or list(DeploymentResponse.model_fields)
+    if format == "csv":
+        return StreamingResponse(
+            _export_csv(batches, columns),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="deployments.csv"'}
+        )
+    return StreamingResponse(_export_ndjson(batches, columns), media_type="application/x-ndjson")
+
+
 @router.get(
     "/{deployment_id}",
     response_model=DeploymentResponse,
@@ -67,12 +260,31 @@ async def list_deployments(
 )
 async def get_deployment(
     deployment_id: str,
-    service: DeploymentService = Depends(get_deployment_service)
-) -> DeploymentResponse:
-    """Get a specific deployment by ID"""
+    if_none_match: Optional[str] = Header(None),
+    service: DeploymentService = Depends(get_deployment_service),
+    cache: CacheService = Depends(get_cache_service)
+) -> Response:
+    """
+    Get a specific deployment by ID
+    
+    Revalidating with If-None-Match only looks up the update time and
+    status, the deployment is neither loaded nor serialized for a 304.
+    """
     try:
-        deployment = service.get_deployment(deployment_id)
-        return DeploymentResponse.model_validate(deployment)
+        if if_none_match:
+            revision = await run_in_threadpool(service.get_revision, deployment_id)
+            headers = deployment_cache_headers(*revision)
+            if etag_matches(if_none_match, headers["ETag"]):
+                return not_modified(headers)
+        deployment = await cache.get_or_load(
+            deployment_cache_key(deployment_id),
+            lambda: run_in_threadpool(service.get_deployment, deployment_id),
+            ttl_seconds=settings.deployment_cache_ttl_seconds
+        )
+        return FastJSONResponse(
+            deployment_json(deployment),
+            headers=deployment_cache_headers(deployment.updated_at, deployment.status)
+        )
     except DeploymentNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -85,13 +297,15 @@ async def get_deployment(
 async def start_deployment(
     deployment_id: str,
     service: DeploymentService = Depends(get_deployment_service)
-) -> DeploymentResponse:
+) -> FastJSONResponse:
     """Start a pending deployment"""
     try:
-        deployment = service.start_deployment(deployment_id)
-        return DeploymentResponse.model_validate(deployment)
+        deployment = await run_in_threadpool(service.start_deployment, deployment_id)
+        return FastJSONResponse(deployment_json(deployment))
     except DeploymentNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except InvalidStateTransitionError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 
 @router.post(
@@ -104,10 +318,83 @@ async def complete_deployment(
     success: bool = True,
     error: str = None,
     service: DeploymentService = Depends(get_deployment_service)
-) -> DeploymentResponse:
+) -> FastJSONResponse:
     """Mark a deployment as complete"""
     try:
-        deployment = service.complete_deployment(deployment_id, success=success, error=error)
-        return DeploymentResponse.model_validate(deployment)
+        deployment = await run_in_threadpool(
+            service.complete_deployment, deployment_id, success=success, error=error
+        )
+        return FastJSONResponse(deployment_json(deployment))
     except DeploymentNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except InvalidStateTransitionError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+def _batch_response(
+    results: Sequence[BatchResult],
+    success_code: int,
+    response_code: int = status.HTTP_200_OK
+) -> FastJSONResponse:
+    """Map per-item service results to the batch response"""
+    items: List[BatchItemPayload] = []
+    for deployment_id, result in results:
+        if isinstance(result, ApplicationError):
+            if isinstance(result, DeploymentNotFoundError):
+                code = status.HTTP_404_NOT_FOUND
+            elif isinstance(result, InvalidStateTransitionError):
+                code = status.HTTP_409_CONFLICT
+            else:
+                code = status.HTTP_400_BAD_REQUEST
+            items.append({
+                "id": deployment_id,
+                "status_code": code,
+                "deployment": None,
+                "error": result.code,
+                "message": result.message,
+            })
+        else:
+            items.append({
+                "id": deployment_id,
+                "status_code": success_code,
+                "deployment": result,
+                "error": None,
+                "message": None,
+            })
+    return FastJSONResponse(batch_result_json(items), status_code=response_code)
+
+
+ExportBatches = Iterator[List[Tuple[str, Deployment]]]
+
+
+def _export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+async def _export_ndjson(batches: ExportBatches, columns: List[str]) -> AsyncIterator[bytes]:
+    """One JSON object per line, one chunk per repository batch"""
+    async for entries in iterate_in_threadpool(batches):
+        # Cursors are URL-safe base64, they can be spliced in without escaping
+        yield b"".join(
+            deployment_fields_json(d, columns)[:-1] + b',"cursor":"' + cursor.encode() + b'"}\n'
+            for cursor, d in entries
+        )
+
+
+async def _export_csv(batches: ExportBatches, columns: List[str]) -> AsyncIterator[str]:
+    """Header row, then one row per deployment, one chunk per repository batch"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([*columns, "cursor"])
+    async for entries in iterate_in_threadpool(batches):
+        for cursor, d in entries:
+            writer.writerow([*(_export_value(getattr(d, c)) for c in columns), cursor])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -2,20 +2,17 @@
 Health Check API Endpoints
 Kubernetes-style health probes
 """
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import JSONResponse
 from app.schemas.metrics_schema import HealthCheckResponse
 from app.health.health_service import HealthCheckService
+from app.core.dependencies import get_health_service
+from app.core.routing import PrerenderedRoute
 from app.config import settings
 
 router = APIRouter(prefix="/health", tags=["health"])
-health_service = HealthCheckService()
 
 
-@router.get(
-    "",
-    response_model=HealthCheckResponse,
-    summary="Basic health check"
-)
 async def health_check() -> HealthCheckResponse:
     """Basic health check endpoint for ALB"""
     return HealthCheckResponse(
@@ -25,12 +22,25 @@ async def health_check() -> HealthCheckResponse:
     )
 
 
+# Polled by every load balancer target check; the response only depends on
+# the settings, so it is rendered once and served without dependency
+# injection or validation
+router.add_api_route(
+    "",
+    health_check,
+    methods=["GET"],
+    response_model=HealthCheckResponse,
+    summary="Basic health check",
+    route_class_override=PrerenderedRoute
+)
+
+
 @router.get(
     "/live",
     status_code=status.HTTP_200_OK,
     summary="Liveness probe"
 )
-async def liveness_probe():
+async def liveness_probe(health_service: HealthCheckService = Depends(get_health_service)):
     """
     Kubernetes liveness probe
     Indicates if the application is running
@@ -41,14 +51,21 @@ async def liveness_probe():
 @router.get(
     "/ready",
     status_code=status.HTTP_200_OK,
-    summary="Readiness probe"
+    summary="Readiness probe",
+    responses={503: {"description": "A dependency check failed"}}
 )
-async def readiness_probe():
+async def readiness_probe(health_service: HealthCheckService = Depends(get_health_service)):
     """
     Kubernetes readiness probe
     Indicates if the application is ready to serve traffic
+    
+    Dependency checks run concurrently with a timeout each; results are
+    cached briefly, so probes do not add load to the dependencies.
     """
-    return health_service.check_readiness()
+    result = await health_service.check_readiness()
+    if result["status"] != "ready":
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=result)
+    return result
 
 
 @router.get(
@@ -56,7 +73,7 @@ async def readiness_probe():
     status_code=status.HTTP_200_OK,
     summary="Startup probe"
 )
-async def startup_probe():
+async def startup_probe(health_service: HealthCheckService = Depends(get_health_service)):
     """
     Kubernetes startup probe
     Indicates if the application has finished starting
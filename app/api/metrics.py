@@ -5,7 +5,7 @@ Exposes application and system metrics
 from fastapi import APIRouter, Depends, Response
 from app.schemas.metrics_schema import MetricsResponse
 from app.services.metrics_service import MetricsService
-from app.core.dependencies import get_metrics_service, get_deployment_repository
+from app.core.dependencies import get_metrics_service
 from app.metrics.prometheus_metrics import metrics as prom_metrics
 from prometheus_client import CONTENT_TYPE_LATEST
 
@@ -18,13 +18,12 @@ router = APIRouter(prefix="/metrics", tags=["metrics"])
     summary="Get application metrics"
 )
 async def get_metrics(
-    metrics_service: MetricsService = Depends(get_metrics_service),
-    deployment_repo = Depends(get_deployment_repository)
+    metrics_service: MetricsService = Depends(get_metrics_service)
 ) -> MetricsResponse:
     """Get comprehensive application metrics"""
     system_metrics = metrics_service.get_system_metrics()
     app_metrics = metrics_service.get_application_metrics()
-    deployment_metrics = metrics_service.get_deployment_metrics(deployment_repo)
+    deployment_metrics = metrics_service.get_deployment_metrics()
     
     return MetricsResponse(
         system=system_metrics,
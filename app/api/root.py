@@ -4,8 +4,10 @@ Welcome and version information
 """
 from fastapi import APIRouter
 from app.config import settings
+from app.core.routing import PrerenderedRoute
 
-router = APIRouter(tags=["root"])
+# Both responses only depend on the settings, so they are rendered once
+router = APIRouter(tags=["root"], route_class=PrerenderedRoute)
 
 
 @router.get("/")
@@ -4,12 +4,14 @@ Creates and configures the FastAPI application instance
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.config import settings
 from app.core.events import startup_event, shutdown_event
-from app.middlewares.request_id import RequestIDMiddleware
-from app.middlewares.logging_middleware import LoggingMiddleware
-from app.middlewares.error_handler import error_handler_middleware
-from app.api import root, health, deployments, metrics
+from app.core.routing import PrerenderedRoute
+from app.middlewares.compression import CompressionMiddleware
+from app.middlewares.idempotency import IdempotencyMiddleware
+from app.middlewares.request_context import RequestContextMiddleware
+from app.api import root, health, deployments, deployment_events, metrics
 
 
 def create_application() -> FastAPI:
@@ -26,6 +28,13 @@ def create_application() -> FastAPI:
         openapi_url="/openapi.json"
     )
     
+    # Innermost, so replayed responses still get CORS headers and request IDs
+    app.add_middleware(IdempotencyMiddleware)
+    
+    # Outside idempotency, so replays are encoded for each client
+    if settings.compression_enabled:
+        app.add_middleware(CompressionMiddleware)
+    
     # CORS middleware
     app.add_middleware(
         CORSMiddleware,
@@ -35,17 +44,30 @@ def create_application() -> FastAPI:
         allow_headers=["*"],
     )
     
-    # Custom middlewares
-    app.add_middleware(RequestIDMiddleware)
-    app.add_middleware(LoggingMiddleware)
-    app.middleware("http")(error_handler_middleware)
+    # Request ID, logging, metrics and error handling in a single ASGI layer
+    app.add_middleware(RequestContextMiddleware)
     
     # Register routers
     app.include_router(root.router)
     app.include_router(health.router)
+    # Before the deployments router, whose /{deployment_id} would match /events
+    app.include_router(deployment_events.router, prefix="/api/v1")
     app.include_router(deployments.router, prefix="/api/v1")
     app.include_router(metrics.router, prefix="/api/v1")
     
+    # The schema only changes with the code: replace FastAPI's own route, which
+    # re-encodes it on every request, with one rendered and compressed at startup
+    app.router.routes[:] = [
+        route for route in app.router.routes if getattr(route, "path", None) != app.openapi_url
+    ]
+    
+    async def openapi() -> JSONResponse:
+        return JSONResponse(app.openapi())
+    
+    app.router.add_api_route(
+        app.openapi_url, openapi, include_in_schema=False, route_class_override=PrerenderedRoute
+    )
+    
     # Lifecycle events
     @app.on_event("startup")
     async def on_startup():
@@ -3,18 +3,40 @@ Logging Configuration
 Structured logging for production environments
 """
 import logging
+import queue
 import sys
-from typing import Any
+import threading
+from typing import Any, List, Optional, TextIO
 import json
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RESERVED_ATTRS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {"message", "asctime"}
+
+OVERFLOW_DROP = "drop"
+OVERFLOW_BLOCK = "block"
+
+
+def _dumps(data: dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(data, default=str).decode()
+    return json.dumps(data, default=str)
+
 
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging"""
     
     def format(self, record: logging.LogRecord) -> str:
         log_data: dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat(),
+            # record.created is the emit time, formatting may happen later
+            "timestamp": datetime.utcfromtimestamp(record.created).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -26,13 +48,123 @@ class JSONFormatter(logging.Formatter):
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
         
-        if hasattr(record, "request_id"):
-            log_data["request_id"] = record.request_id
-            
-        return json.dumps(log_data)
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and key not in log_data:
+                log_data[key] = value
+        
+        return _dumps(log_data)
+
+
+class BatchingQueueHandler(logging.Handler):
+    """
+    Handler that enqueues records and writes them from a background thread
+    
+    emit() never formats or writes, it only puts the record on a bounded
+    queue. The writer thread drains the queue in batches, formats them and
+    issues a single write per batch. When the queue is full records are
+    dropped (and counted) or, with the "block" policy, the caller waits.
+    """
+    
+    def __init__(
+        self,
+        stream: TextIO,
+        queue_size: int = 10000,
+        batch_size: int = 256,
+        flush_interval_seconds: float = 0.2,
+        overflow_policy: str = OVERFLOW_DROP
+    ):
+        super().__init__()
+        if overflow_policy not in (OVERFLOW_DROP, OVERFLOW_BLOCK):
+            raise ValueError(f"Unknown log overflow policy: {overflow_policy}")
+        self.stream = stream
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.overflow_policy = overflow_policy
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._queue: "queue.Queue[Optional[logging.LogRecord]]" = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            # Merge args now, they may be mutated before the writer gets to them
+            record.msg = record.getMessage()
+            record.args = None
+            if self.overflow_policy == OVERFLOW_BLOCK:
+                self._queue.put(record)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+        except Exception:
+            self.handleError(record)
+    
+    def close(self) -> None:
+        """Flush queued records and stop the writer thread"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        super().close()
+    
+    def _run(self) -> None:
+        while True:
+            try:
+                record = self._queue.get(timeout=self.flush_interval_seconds)
+            except queue.Empty:
+                continue
+            batch: List[logging.LogRecord] = []
+            stop = record is None
+            if not stop:
+                batch.append(record)
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    stop = True
+                else:
+                    batch.append(record)
+            self._write(batch)
+            if stop:
+                return
+    
+    def _write(self, batch: List[logging.LogRecord]) -> None:
+        lines = []
+        for record in batch:
+            try:
+                lines.append(self.format(record))
+            except Exception:
+                self.handleError(record)
+        dropped = self.dropped - self._reported_dropped
+        if dropped:
+            self._reported_dropped += dropped
+            lines.append(self.format(logging.makeLogRecord({
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"Dropped {dropped} log records, log queue full",
+                "dropped_records": dropped,
+            })))
+        if not lines:
+            return
+        try:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+        except Exception:
+            self.handleError(batch[0] if batch else None)
 
 
-def setup_logging(log_level: str = "INFO", log_format: str = "json") -> None:
+def setup_logging(
+    log_level: str = "INFO",
+    log_format: str = "json",
+    async_logging: bool = False,
+    queue_size: int = 10000,
+    batch_size: int = 256,
+    flush_interval_seconds: float = 0.2,
+    overflow_policy: str = OVERFLOW_DROP
+) -> None:
     """Configure application logging"""
     
     logger = logging.getLogger()
@@ -41,9 +173,20 @@ def setup_logging(log_level: str = "INFO", log_format: str = "json") -> None:
     # Remove existing handlers
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
+        if isinstance(handler, BatchingQueueHandler):
+            handler.close()
     
     # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
+    if async_logging:
+        console_handler = BatchingQueueHandler(
+            sys.stdout,
+            queue_size=queue_size,
+            batch_size=batch_size,
+            flush_interval_seconds=flush_interval_seconds,
+            overflow_policy=overflow_policy
+        )
+    else:
+        console_handler = logging.StreamHandler(sys.stdout)
     
     if log_format == "json":
         console_handler.setFormatter(JSONFormatter())
@@ -55,3 +198,15 @@ def setup_logging(log_level: str = "INFO", log_format: str = "json") -> None:
         )
     
     logger.addHandler(console_handler)
+
+
+def shutdown_logging() -> None:
+    """Flush queued log handlers and fall back to synchronous output"""
+    logger = logging.getLogger()
+    for handler in logger.handlers[:]:
+        if isinstance(handler, BatchingQueueHandler):
+            logger.removeHandler(handler)
+            handler.close()
+            fallback_handler = logging.StreamHandler(handler.stream)
+            fallback_handler.setFormatter(handler.formatter)
+            logger.addHandler(fallback_handler)
@@ -27,19 +27,94 @@ class Settings(BaseSettings):
     # CORS
     cors_origins: list[str] = ["*"]
     
+    # Response compression (brotli when the 'brotli' package is installed, else gzip)
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    # Levels of per-request encoding; the bodies of /, /version and /openapi.json
+    # never change and are encoded once at startup at the highest levels instead
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    
     # Logging
     log_level: str = "INFO"
     log_format: str = "json"
+    log_async: bool = True
+    log_queue_size: int = 10000
+    log_batch_size: int = 256
+    log_flush_interval_seconds: float = 0.2
+    log_overflow_policy: str = "drop"
+    # Request log sampling by path prefix (1.0 logs every request, 0.0 none);
+    # failed and slow requests are always logged
+    log_sample_rates: dict[str, float] = {
+        "/health": 0.01,
+        "/api/v1/metrics/prometheus": 0.0,
+    }
+    log_route_levels: dict[str, str] = {}
+    log_slow_request_ms: float = 1000.0
     
     # Monitoring
     enable_metrics: bool = True
     metrics_port: int = 9090
+    system_metrics_interval_seconds: float = 5.0
+    system_metrics_history_size: int = 120
+    # How often workers sharing a database reload the deployment aggregates
+    deployment_metrics_refresh_seconds: float = 30.0
+    # Shared directory for multi-worker Prometheus metrics (PROMETHEUS_MULTIPROC_DIR)
+    prometheus_multiproc_dir: Optional[str] = None
     
-    # Database (placeholder for future expansion)
+    # Database (in-memory store when unset, e.g. sqlite:///./devops.db or postgresql://...)
     database_url: Optional[str] = None
+    database_pool_size: int = 5
+    database_pool_timeout_seconds: float = 5.0
+    # Columnar in-memory store, for large histories without a database
+    compact_storage: bool = False
+    # Lock stripes of the in-memory stores; the API calls them from worker threads,
+    # so at least one is always used
+    repository_lock_stripes: int = 64
+    
+    # Cache
+    cache_max_entries: int = 10000
+    # Invalidation is per process, so keep this short when workers share a database
+    deployment_cache_ttl_seconds: float = 5.0
+    # Browser and proxy lifetime of completed deployments, which no longer change
+    completed_deployment_max_age_seconds: int = 86400
+    
+    # Idempotency-Key responses kept for replay
+    idempotency_ttl_seconds: float = 86400.0
+    idempotency_max_keys: int = 10000
+    
+    # Health checks (readiness results are reused for health_check_cache_seconds)
+    health_check_timeout_seconds: float = 5.0
+    health_check_cache_seconds: float = 2.0
+    
+    # Deployment event stream
+    event_queue_size: int = 100
+    event_heartbeat_seconds: float = 15.0
+    
+    # Notifications (channels without a webhook URL are written to the log)
+    notification_channels: list[str] = ["slack"]
+    notification_webhook_urls: dict[str, str] = {}
+    notification_queue_size: int = 1000
+    notification_workers: int = 4
+    notification_batch_window_seconds: float = 1.0
+    notification_max_batch_size: int = 50
+    # Batches per second per channel
+    notification_rate_limits: dict[str, float] = {"email": 1.0, "slack": 1.0, "sns": 10.0}
+    notification_max_attempts: int = 5
+    notification_timeout_seconds: float = 5.0
     
-    # AWS
+    # AWS (placeholder data unless enabled; requires boto3)
     aws_region: str = "us-east-1"
+    aws_enabled: bool = False
+    # Local stand-in such as moto_server, e.g. http://localhost:5000
+    aws_endpoint_url: Optional[str] = None
+    # Keep the connection pool at least as large as the worker pool
+    aws_max_pool_connections: int = 10
+    aws_max_workers: int = 8
+    aws_connect_timeout_seconds: float = 2.0
+    aws_read_timeout_seconds: float = 5.0
+    aws_max_attempts: int = 3
+    aws_cache_ttl_seconds: dict[str, float] = {"ecs": 15.0, "ecr": 300.0, "cloudwatch": 60.0}
     
     class Config:
         env_file = ".env"
@@ -2,25 +2,84 @@
 Dependency Injection Container
 Manages application-wide dependencies and services
 """
-from typing import Generator
+from typing import Generator, Union
 from functools import lru_cache
 from app.config import settings
 from app.services.deployment_service import DeploymentService
 from app.services.metrics_service import MetricsService
+from app.services.cache_service import CacheService
+from app.services.event_bus import DeploymentEventBus, deployment_events
+from app.services.notification_service import NotificationService
+from app.services.aws_service import AWSService, aws_service
+from app.health.health_service import HealthCheckService
+from app.metrics.deployment_aggregator import deployment_aggregator
 from app.repositories.deployment_repository import DeploymentRepository
+from app.repositories.compact_deployment_repository import CompactDeploymentRepository
+from app.repositories.sql_deployment_repository import SQLDeploymentRepository
 
 
 @lru_cache()
-def get_deployment_repository() -> DeploymentRepository:
-    """Get deployment repository instance"""
-    return DeploymentRepository()
+def get_deployment_repository() -> Union[DeploymentRepository, SQLDeploymentRepository]:
+    """Get deployment repository instance for the configured backend"""
+    if settings.database_url:
+        return SQLDeploymentRepository(
+            settings.database_url,
+            pool_size=settings.database_pool_size,
+            pool_timeout_seconds=settings.database_pool_timeout_seconds
+        )
+    lock_stripes = max(1, settings.repository_lock_stripes)
+    if settings.compact_storage:
+        return CompactDeploymentRepository(lock_stripes=lock_stripes)
+    return DeploymentRepository(lock_stripes=lock_stripes)
+
+
+@lru_cache()
+def get_cache_service() -> CacheService:
+    """Get shared cache instance"""
+    return CacheService(name="app", max_entries=settings.cache_max_entries)
 
 
 @lru_cache()
 def get_deployment_service() -> DeploymentService:
     """Get deployment service instance"""
     repo = get_deployment_repository()
-    return DeploymentService(repository=repo)
+    return DeploymentService(
+        repository=repo,
+        cache=get_cache_service(),
+        aggregator=deployment_aggregator,
+        events=deployment_events,
+        notifications=get_notification_service()
+    )
+
+
+@lru_cache()
+def get_notification_service() -> NotificationService:
+    """Get notification service instance"""
+    return NotificationService()
+
+
+def get_event_bus() -> DeploymentEventBus:
+    """Get the deployment event bus"""
+    return deployment_events
+
+
+@lru_cache()
+def get_health_service() -> HealthCheckService:
+    """Get health check service with a check per configured dependency"""
+    service = HealthCheckService(
+        timeout_seconds=settings.health_check_timeout_seconds,
+        cache_ttl_seconds=settings.health_check_cache_seconds
+    )
+    service.register_check("repository", get_deployment_repository().ping)
+    service.register_check("cache", get_cache_service().stats)
+    if aws_service.enabled:
+        service.register_check("aws", aws_service.ping)
+    return service
+
+
+def get_aws_service() -> AWSService:
+    """Get the shared AWS service"""
+    return aws_service
 
 
 @lru_cache()
@@ -3,16 +3,33 @@ Application Lifecycle Events
 Startup and shutdown event handlers
 """
 import logging
+import os
 from fastapi import FastAPI
 from app.config import settings
-from app.config.logging_config import setup_logging
+from app.config.logging_config import setup_logging, shutdown_logging
+from app.metrics.system_sampler import system_sampler
+from app.metrics.prometheus_metrics import metrics as prom_metrics
+from app.metrics.deployment_aggregator import deployment_aggregator
+from app.core.dependencies import get_deployment_repository
+from app.core.routing import prerender_routes
+from app.services.notification_dispatcher import notification_dispatcher
+from app.services.aws_service import aws_service
+from app.repositories.sql_deployment_repository import SQLDeploymentRepository
 
 logger = logging.getLogger(__name__)
 
 
 async def startup_event(app: FastAPI) -> None:
     """Execute on application startup"""
-    setup_logging(settings.log_level, settings.log_format)
+    setup_logging(
+        settings.log_level,
+        settings.log_format,
+        async_logging=settings.log_async,
+        queue_size=settings.log_queue_size,
+        batch_size=settings.log_batch_size,
+        flush_interval_seconds=settings.log_flush_interval_seconds,
+        overflow_policy=settings.log_overflow_policy
+    )
     
     logger.info(
         "Application starting",
@@ -24,6 +41,19 @@ async def startup_event(app: FastAPI) -> None:
     )
     
     # Initialize connections, caches, etc.
+    repository = get_deployment_repository()
+    if isinstance(repository, SQLDeploymentRepository):
+        repository.open()
+        deployment_aggregator.load(repository)
+        await deployment_aggregator.start(repository)
+    
+    aws_service.start()
+    await system_sampler.start()
+    await notification_dispatcher.start()
+    
+    # Settings-derived responses, rendered before the first request
+    await prerender_routes(app)
+    
     logger.info("Startup complete")
 
 
@@ -32,4 +62,17 @@ async def shutdown_event(app: FastAPI) -> None:
     logger.info("Application shutting down")
     
     # Close connections, cleanup resources
+    await system_sampler.stop()
+    await deployment_aggregator.stop()
+    # Deliver queued notifications before the process exits
+    await notification_dispatcher.stop()
+    aws_service.close()
+    
+    repository = get_deployment_repository()
+    if isinstance(repository, SQLDeploymentRepository):
+        repository.close()
+    
+    prom_metrics.mark_process_dead(os.getpid())
+    
     logger.info("Shutdown complete")
+    shutdown_logging()
@@ -33,6 +33,18 @@ class DeploymentFailedError(ApplicationError):
         )
 
 
+class InvalidStateTransitionError(ApplicationError):
+    """Raised when a deployment is not in a status it can change from"""
+    
+    def __init__(self, deployment_id: str, current_status: str, target_status: str):
+        super().__init__(
+            message=f"Deployment {deployment_id} is {current_status}, it cannot move to {target_status}",
+            code="INVALID_STATE_TRANSITION"
+        )
+        self.current_status = current_status
+        self.target_status = target_status
+
+
 class ValidationError(ApplicationError):
     """Raised when validation fails"""
     
@@ -48,3 +60,11 @@ class ServiceUnavailableError(ApplicationError):
             message=f"Service {service} is unavailable",
             code="SERVICE_UNAVAILABLE"
         )
+
+
+class CircuitOpenError(ServiceUnavailableError):
+    """Raised when a circuit breaker rejects a call to a failing service"""
+    
+    def __init__(self, service: str, retry_after_seconds: float):
+        super().__init__(service)
+        self.retry_after_seconds = retry_after_seconds
@@ -0,0 +1,50 @@
+"""
+Response Classes
+Responses that send pre-encoded JSON without re-validating it
+"""
+import json
+from typing import Any, Dict, Optional
+from fastapi import status
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response for content that is already serialized
+    
+    Bytes are sent as they are, so endpoints can hand over the output of a
+    precompiled serializer. Other content is encoded with orjson when it
+    is installed and the standard library otherwise. Returning a Response
+    also makes FastAPI skip its own response_model validation.
+    """
+    
+    media_type = "application/json"
+    
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(content, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header with an entity tag"""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def not_modified(headers: Dict[str, str]) -> Response:
+    """304 response carrying the validators and caching headers of the full response"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
@@ -0,0 +1,97 @@
+"""
+Routing
+Routes whose response is rendered once instead of on every request
+"""
+import inspect
+from typing import Any, Callable, Optional
+from fastapi import FastAPI, status
+from fastapi.responses import Response
+from fastapi.routing import APIRoute, serialize_response
+from starlette.types import Receive, Scope, Send
+from app.config import settings
+from app.core.responses import FastJSONResponse
+from app.utils.compression import SUPPORTED_ENCODINGS, StaticBody, choose_encoding
+
+_ACCEPT_ENCODING = b"accept-encoding"
+
+
+class PrerenderedRoute(APIRoute):
+    """
+    Route that answers every request with the same pre-rendered bytes
+    
+    For endpoints without parameters whose response only depends on the
+    settings or the code, like the root, version, load balancer health
+    check and OpenAPI schema. The endpoint runs once, from prerender() at
+    startup or on the first request otherwise, and its result is validated
+    against the response model then. Requests are answered with the stored
+    status, headers and body as raw ASGI messages, without building a
+    Request, solving dependencies or validating anything. The routes still
+    appear in the OpenAPI schema as usual.
+    
+    With compression enabled, bodies of at least the minimum size are also
+    encoded once with every supported encoding, and each request gets the
+    variant its Accept-Encoding prefers. The compression middleware passes
+    those through as they are.
+    """
+    
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, endpoint, **kwargs)
+        dependant = self.dependant
+        if any((
+            dependant.path_params,
+            dependant.query_params,
+            dependant.header_params,
+            dependant.cookie_params,
+            dependant.body_params,
+            dependant.dependencies,
+            dependant.request_param_name,
+        )):
+            raise ValueError(f"Pre-rendered route {path} cannot take parameters or dependencies")
+        self._rendered: Optional[StaticBody] = None
+        self.app = self._send_rendered
+    
+    async def prerender(self) -> None:
+        """Run the endpoint and keep its encoded response"""
+        content = self.endpoint()
+        if inspect.isawaitable(content):
+            content = await content
+        if isinstance(content, Response):
+            response = content
+        else:
+            content = await serialize_response(
+                field=self.response_field,
+                response_content=content,
+                include=self.response_model_include,
+                exclude=self.response_model_exclude,
+                by_alias=self.response_model_by_alias,
+                exclude_unset=self.response_model_exclude_unset,
+                exclude_defaults=self.response_model_exclude_defaults,
+                exclude_none=self.response_model_exclude_none
+            )
+            response = FastJSONResponse(content, status_code=self.status_code or status.HTTP_200_OK)
+        self._rendered = StaticBody(
+            response.status_code,
+            list(response.raw_headers),
+            response.body,
+            settings.compression_minimum_size,
+            SUPPORTED_ENCODINGS if settings.compression_enabled else ()
+        )
+    
+    async def _send_rendered(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self._rendered is None:
+            await self.prerender()
+        rendered = self._rendered
+        encoding = None
+        if len(rendered.variants) > 1:
+            for name, value in scope["headers"]:
+                if name == _ACCEPT_ENCODING:
+                    encoding = choose_encoding(value.decode("latin-1"), rendered.encodings)
+                    break
+        await rendered.send(send, encoding)
+
+
+async def prerender_routes(app: FastAPI) -> None:
+    """Render the responses of every PrerenderedRoute of an application"""
+    for route in app.routes:
+        if isinstance(route, PrerenderedRoute):
+            await route.prerender()
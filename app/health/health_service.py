@@ -2,14 +2,62 @@
 Health Check Service
 Performs application health checks
 """
+import asyncio
+import concurrent.futures
+import inspect
 import logging
-from typing import Dict, Any
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+from app.services.cache_service import CacheService
+from app.utils.constants import HEALTH_CHECK_TIMEOUT_SECONDS
 
 logger = logging.getLogger(__name__)
 
+# A check passes unless it raises or returns False; plain functions run in
+# a thread of their own so a blocking ping cannot stall the event loop
+HealthCheck = Callable[[], Union[Any, Awaitable[Any]]]
+
+_READINESS_KEY = "readiness"
+
+
+class _StillRunning(Exception):
+    """The previous run of a check has not returned yet"""
+
 
 class HealthCheckService:
-    """Service for health check operations"""
+    """
+    Service for health check operations
+    
+    Readiness runs every registered dependency check concurrently, each
+    bounded by `timeout_seconds`, and caches the result for
+    `cache_ttl_seconds`. Probes arriving while a run is in progress wait
+    for it, so probe traffic reaches the dependencies at most once per
+    interval however many load balancers and kubelets are polling.
+    
+    A timeout only stops waiting: a plain function check that hangs keeps
+    its thread until it returns. Those run on daemon threads owned by the
+    service rather than the shared default executor, and a check still
+    running from an earlier probe is reported as timed out instead of
+    being started again, so a stuck dependency holds one thread at most.
+    """
+    
+    def __init__(
+        self,
+        checks: Optional[Dict[str, HealthCheck]] = None,
+        timeout_seconds: float = HEALTH_CHECK_TIMEOUT_SECONDS,
+        cache_ttl_seconds: float = 2.0
+    ):
+        self.checks: Dict[str, HealthCheck] = dict(checks or {})
+        self.timeout_seconds = timeout_seconds
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self._cache = CacheService(name="health", max_entries=1, default_ttl_seconds=cache_ttl_seconds)
+        self._threads: Dict[str, concurrent.futures.Future] = {}
+    
+    def register_check(self, name: str, check: HealthCheck) -> None:
+        """Add a dependency check to readiness"""
+        self.checks[name] = check
+        self._cache.clear()
     
     def check_liveness(self) -> Dict[str, Any]:
         """
@@ -23,29 +71,12 @@ class HealthCheckService:
             }
         }
     
-    def check_readiness(self) -> Dict[str, Any]:
+    async def check_readiness(self) -> Dict[str, Any]:
         """
         Readiness probe - is the application ready to serve traffic?
         Checks dependencies like database, cache, etc.
         """
-        checks = {}
-        healthy = True
-        
-        # Check application state
-        checks["application"] = "ok"
-        
-        # Would check database connection
-        # checks["database"] = self._check_database()
-        
-        # Would check external services
-        # checks["external_api"] = self._check_external_api()
-        
-        status = "ready" if healthy else "not_ready"
-        
-        return {
-            "status": status,
-            "checks": checks
-        }
+        return await self._cache.get_or_load(_READINESS_KEY, self._run_checks)
     
     def check_startup(self) -> Dict[str, Any]:
         """
@@ -57,3 +88,54 @@ class HealthCheckService:
                 "initialization": "complete"
             }
         }
+    
+    async def _run_checks(self) -> Dict[str, Any]:
+        names = list(self.checks)
+        results = await asyncio.gather(*(self._run_check(name, self.checks[name]) for name in names))
+        checks = {"application": {"status": "ok", "latency_ms": 0.0}}
+        checks.update(zip(names, results))
+        healthy = all(result["status"] == "ok" for result in results)
+        
+        return {
+            "status": "ready" if healthy else "not_ready",
+            "checks": checks
+        }
+    
+    async def _run_check(self, name: str, check: HealthCheck) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(check):
+                outcome = await asyncio.wait_for(check(), self.timeout_seconds)
+            else:
+                running = self._threads.get(name)
+                if running is not None and not running.done():
+                    raise _StillRunning()
+                future = self._start_thread(name, check)
+                outcome = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout_seconds)
+            result: Dict[str, Any] = {"status": "ok" if outcome is not False else "error"}
+        except _StillRunning:
+            result = {"status": "timeout", "error": "Still running since an earlier probe"}
+        except asyncio.TimeoutError:
+            result = {"status": "timeout", "error": f"No answer within {self.timeout_seconds}s"}
+        except Exception as e:
+            result = {"status": "error", "error": str(e) or type(e).__name__}
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        if result["status"] != "ok":
+            logger.warning(f"Readiness check {name} failed", extra={"check": name, **result})
+        return result
+    
+    def _start_thread(self, name: str, check: HealthCheck) -> concurrent.futures.Future:
+        """Run a plain function check on a daemon thread, which cannot hold up shutdown"""
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        
+        def run() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(check())
+            except BaseException as e:
+                future.set_exception(e)
+        
+        self._threads[name] = future
+        threading.Thread(target=run, name=f"health-check-{name}", daemon=True).start()
+        return future
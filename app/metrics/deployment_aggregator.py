@@ -0,0 +1,169 @@
+"""
+Deployment Metrics Aggregator
+Maintains deployment aggregates incrementally as deployments change state
+"""
+import asyncio
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+from app.config import settings
+from app.metrics.prometheus_metrics import metrics as prom_metrics
+from app.metrics.quantiles import QuantileSketch
+from app.models.deployment import Deployment, DeploymentStatus
+from app.models.metrics import DeploymentMetrics
+
+logger = logging.getLogger(__name__)
+
+
+class DeploymentMetricsAggregator:
+    """
+    Incremental deployment aggregates
+    
+    DeploymentService reports every state change, so reading the
+    aggregates is O(1) instead of a scan over the repository. Updates hold
+    a lock, so threads sharing a repository can report changes
+    concurrently.
+    
+    The aggregates are per process. With a shared database, other workers'
+    changes only arrive through load(), so start() reloads them from the
+    repository every `refresh_seconds`; between reloads each worker
+    reports its own changes right away and the others' up to one interval
+    late.
+    """
+    
+    def __init__(self, refresh_seconds: float = 30.0):
+        self.refresh_seconds = refresh_seconds
+        self._by_status: Counter = Counter()
+        self._by_environment: Counter = Counter()
+        self._by_application: Counter = Counter()
+        self._durations = self._new_sketch()
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+    
+    def record_created(self, deployment: Deployment) -> None:
+        """Count a newly created deployment"""
+        with self._lock:
+            self._by_status[DeploymentStatus(deployment.status)] += 1
+            self._by_environment[deployment.environment] += 1
+            self._by_application[deployment.application] += 1
+    
+    def record_transition(self, deployment: Deployment, old_status: DeploymentStatus) -> None:
+        """Move a deployment between status counts"""
+        new_status = DeploymentStatus(deployment.status)
+        old_status = DeploymentStatus(old_status)
+        if new_status == old_status:
+            return
+        with self._lock:
+            self._by_status[old_status] -= 1
+            self._by_status[new_status] += 1
+        
+        if new_status in (DeploymentStatus.SUCCESS, DeploymentStatus.FAILED):
+            duration = self.deployment_duration(deployment)
+            if duration is not None:
+                with self._lock:
+                    self._durations.add(duration)
+                prom_metrics.record_deployment(
+                    status=new_status.value,
+                    environment=deployment.environment,
+                    duration=duration
+                )
+    
+    def load(self, repository, batch_size: int = 1000) -> None:
+        """Replace the aggregates with those of every deployment in a repository"""
+        by_status: Counter = Counter()
+        by_environment: Counter = Counter()
+        by_application: Counter = Counter()
+        durations = self._new_sketch()
+        cursor = None
+        while True:
+            deployments, cursor = repository.list_page(cursor=cursor, limit=batch_size)
+            for deployment in deployments:
+                status = DeploymentStatus(deployment.status)
+                by_status[status] += 1
+                by_environment[deployment.environment] += 1
+                by_application[deployment.application] += 1
+                if status in (DeploymentStatus.SUCCESS, DeploymentStatus.FAILED):
+                    duration = self.deployment_duration(deployment)
+                    if duration is not None:
+                        durations.add(duration)
+            if cursor is None:
+                break
+        
+        # Swapped in at once, readers never see a partly loaded state
+        with self._lock:
+            self._by_status = by_status
+            self._by_environment = by_environment
+            self._by_application = by_application
+            self._durations = durations
+        logger.debug(f"Loaded deployment aggregates for {self.total} deployments")
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    async def start(self, repository) -> None:
+        """Start reloading the aggregates from a shared repository in the background"""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run(repository))
+    
+    async def stop(self) -> None:
+        """Stop the background reloads"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+    
+    async def _run(self, repository) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                # A full read of the repository, keep it off the event loop
+                await asyncio.to_thread(self.load, repository)
+            except Exception:
+                logger.exception("Deployment aggregates reload failed")
+    
+    @property
+    def total(self) -> int:
+        return sum(self._by_status.values())
+    
+    def snapshot(self) -> DeploymentMetrics:
+        """Get the current deployment metrics"""
+        with self._lock:
+            return DeploymentMetrics(
+                total_deployments=self.total,
+                successful_deployments=self._by_status[DeploymentStatus.SUCCESS],
+                failed_deployments=self._by_status[DeploymentStatus.FAILED],
+                average_deployment_time_seconds=self._durations.mean,
+                p50_deployment_time_seconds=self._durations.quantile(0.50),
+                p95_deployment_time_seconds=self._durations.quantile(0.95),
+                p99_deployment_time_seconds=self._durations.quantile(0.99),
+                by_status={status.value: count for status, count in self._by_status.items() if count},
+                by_environment=dict(self._by_environment),
+                by_application=dict(self._by_application),
+                timestamp=datetime.utcnow()
+            )
+    
+    @staticmethod
+    def _new_sketch() -> QuantileSketch:
+        return QuantileSketch(min_value=1e-3, max_value=7 * 24 * 3600)
+    
+    @staticmethod
+    def deployment_duration(deployment: Deployment) -> Optional[float]:
+        """Seconds from start (or creation) to completion"""
+        if deployment.completed_at is None:
+            return None
+        started_at = deployment.started_at or deployment.created_at
+        return max((deployment.completed_at - started_at).total_seconds(), 0.0)
+
+
+# Global aggregator instance
+deployment_aggregator = DeploymentMetricsAggregator(
+    refresh_seconds=settings.deployment_metrics_refresh_seconds
+)
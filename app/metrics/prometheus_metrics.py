@@ -2,12 +2,30 @@
 Prometheus Metrics Collector
 Exposes application metrics in Prometheus format
 """
+import os
+from app.config import settings
+
+# prometheus_client picks its value storage at import time, so the
+# multiprocess directory must be in the environment before it is imported
+if settings.prometheus_multiproc_dir:
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.prometheus_multiproc_dir)
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
-from typing import Dict
+from prometheus_client import CollectorRegistry, multiprocess
+from typing import Dict, List
+
+MULTIPROCESS_MODE = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+CIRCUIT_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
 
 
 class PrometheusMetrics:
-    """Prometheus metrics collector"""
+    """
+    Prometheus metrics collector
+    
+    In multiprocess mode every uvicorn worker writes its samples to
+    mmap-backed files and a scrape aggregates the files of all workers.
+    """
     
     def __init__(self):
         # Request metrics
@@ -36,10 +54,94 @@ class PrometheusMetrics:
             ['environment']
         )
         
+        # Cache metrics
+        self.cache_events = Counter(
+            'cache_events_total',
+            'Cache lookups and removals',
+            ['cache', 'event']
+        )
+        
+        # Event stream metrics
+        self.events_published = Counter(
+            'deployment_events_published_total',
+            'Deployment events published to subscribers',
+            ['event']
+        )
+        self.event_slow_consumers = Counter(
+            'deployment_event_slow_consumers_total',
+            'Event subscribers disconnected because their queue was full'
+        )
+        self.event_subscribers = Gauge(
+            'deployment_event_subscribers',
+            'Connected deployment event subscribers',
+            multiprocess_mode='livesum'
+        )
+        
+        # Notification metrics
+        self.notifications_delivered = Counter(
+            'notifications_delivered_total',
+            'Notifications delivered',
+            ['channel']
+        )
+        self.notifications_dropped = Counter(
+            'notifications_dropped_total',
+            'Notifications not delivered (queue_full, coalesced, failed, rejected, shutdown)',
+            ['channel', 'reason']
+        )
+        self.notification_latency = Histogram(
+            'notification_delivery_seconds',
+            'Time from queueing a notification to its delivery',
+            ['channel'],
+            buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+        )
+        
+        # Retry and circuit breaker metrics
+        self.retries = Counter(
+            'retries_total',
+            'Retry decisions by operation (retried, exhausted, deadline, budget)',
+            ['operation', 'outcome']
+        )
+        self.circuit_state = Gauge(
+            'circuit_breaker_state',
+            'Circuit breaker state (0 closed, 1 half open, 2 open)',
+            ['name'],
+            multiprocess_mode='livemax'
+        )
+        self.circuit_transitions = Counter(
+            'circuit_breaker_transitions_total',
+            'Circuit breaker state changes',
+            ['name', 'state']
+        )
+        self.circuit_rejections = Counter(
+            'circuit_breaker_rejected_calls_total',
+            'Calls rejected while a circuit breaker was open',
+            ['name']
+        )
+        
+        # Logging metrics
+        self.suppressed_logs = Counter(
+            'log_records_suppressed_total',
+            'Request log records suppressed by sampling or route log level',
+            ['route', 'reason']
+        )
+        
         # System metrics
-        self.cpu_usage = Gauge('cpu_usage_percent', 'CPU usage percentage')
-        self.memory_usage = Gauge('memory_usage_percent', 'Memory usage percentage')
-        self.active_tasks = Gauge('active_ecs_tasks', 'Number of active ECS tasks')
+        # Host-level gauges report the same value from every worker
+        self.cpu_usage = Gauge(
+            'cpu_usage_percent',
+            'CPU usage percentage',
+            multiprocess_mode='livemostrecent'
+        )
+        self.memory_usage = Gauge(
+            'memory_usage_percent',
+            'Memory usage percentage',
+            multiprocess_mode='livemostrecent'
+        )
+        self.active_tasks = Gauge(
+            'active_ecs_tasks',
+            'Number of active ECS tasks',
+            multiprocess_mode='livemax'
+        )
     
     def record_request(self, method: str, endpoint: str, status: int, duration: float):
         """Record HTTP request metrics"""
@@ -51,6 +153,42 @@ class PrometheusMetrics:
         self.deployment_count.labels(status=status, environment=environment).inc()
         self.deployment_duration.labels(environment=environment).observe(duration)
     
+    def record_cache_event(self, cache: str, event: str):
+        """Record a cache hit, miss, eviction or expiration"""
+        self.cache_events.labels(cache=cache, event=event).inc()
+    
+    def record_event_published(self, event: str):
+        """Record a deployment event fanned out to subscribers"""
+        self.events_published.labels(event=event).inc()
+    
+    def record_notifications_delivered(self, channel: str, latencies: List[float]):
+        """Record a delivered batch of notifications"""
+        self.notifications_delivered.labels(channel=channel).inc(len(latencies))
+        histogram = self.notification_latency.labels(channel=channel)
+        for latency in latencies:
+            histogram.observe(latency)
+    
+    def record_notifications_dropped(self, channel: str, reason: str, count: int = 1):
+        """Record notifications that will not be delivered"""
+        self.notifications_dropped.labels(channel=channel, reason=reason).inc(count)
+    
+    def record_retry(self, operation: str, outcome: str):
+        """Record whether a failed call was retried or given up"""
+        self.retries.labels(operation=operation, outcome=outcome).inc()
+    
+    def set_circuit_state(self, name: str, state: str):
+        """Record a circuit breaker entering a state"""
+        self.circuit_state.labels(name=name).set(CIRCUIT_STATE_VALUES[state])
+        self.circuit_transitions.labels(name=name, state=state).inc()
+    
+    def record_circuit_rejection(self, name: str):
+        """Record a call rejected by an open circuit breaker"""
+        self.circuit_rejections.labels(name=name).inc()
+    
+    def record_suppressed_log(self, route: str, reason: str):
+        """Record a request log record that was not emitted"""
+        self.suppressed_logs.labels(route=route, reason=reason).inc()
+    
     def update_system_metrics(self, cpu: float, memory: float):
         """Update system metrics"""
         self.cpu_usage.set(cpu)
@@ -58,7 +196,17 @@ class PrometheusMetrics:
     
     def export_metrics(self) -> bytes:
         """Export metrics in Prometheus format"""
+        if MULTIPROCESS_MODE:
+            # A fresh registry per scrape, as the collector reads the files on collect
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            return generate_latest(registry)
         return generate_latest()
+    
+    def mark_process_dead(self, pid: int) -> None:
+        """Remove the live gauge files of a worker that is exiting"""
+        if MULTIPROCESS_MODE:
+            multiprocess.mark_process_dead(pid)
 
 
 # Global metrics instance
@@ -0,0 +1,96 @@
+"""
+Streaming Quantiles
+Fixed-size, mergeable quantile sketch for latency and duration metrics
+"""
+import math
+from array import array
+from typing import Optional
+
+
+class QuantileSketch:
+    """
+    Log-bucketed quantile sketch
+    
+    Values are counted in buckets whose bounds grow geometrically, so any
+    reported quantile is within `relative_accuracy` of the true value.
+    Storage is a preallocated array sized by the value range, adding a
+    value is O(1) and reading a quantile never depends on how many values
+    were added. Sketches with the same parameters can be merged.
+    """
+    
+    def __init__(
+        self,
+        min_value: float = 1e-3,
+        max_value: float = 1e6,
+        relative_accuracy: float = 0.01
+    ):
+        self.min_value = min_value
+        self.max_value = max_value
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._offset = math.ceil(math.log(min_value) / self._log_gamma)
+        size = math.ceil(math.log(max_value) / self._log_gamma) - self._offset + 2
+        # Bucket 0 holds everything at or below min_value
+        self._counts = array("Q", bytes(8 * size))
+        self.count = 0
+        self.sum = 0.0
+        self.max: Optional[float] = None
+    
+    def add(self, value: float) -> None:
+        """Add a value to the sketch"""
+        self._counts[self._index(value)] += 1
+        self.count += 1
+        self.sum += value
+        if self.max is None or value > self.max:
+            self.max = value
+    
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile (0 <= q <= 1), 0.0 when empty"""
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            seen += bucket_count
+            if seen > rank:
+                return min(self._value(index), self.max)
+        return self.max
+    
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+    
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add all values of another sketch with the same parameters"""
+        if (other.min_value, other.max_value, other.relative_accuracy) != (
+            self.min_value, self.max_value, self.relative_accuracy
+        ):
+            raise ValueError("Cannot merge sketches with different parameters")
+        for index, bucket_count in enumerate(other._counts):
+            if bucket_count:
+                self._counts[index] += bucket_count
+        self.count += other.count
+        self.sum += other.sum
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+    
+    def copy(self) -> "QuantileSketch":
+        """Independent copy, cheap enough to take while holding a lock"""
+        clone = QuantileSketch.__new__(QuantileSketch)
+        clone.__dict__.update(self.__dict__)
+        clone._counts = array("Q", self._counts)
+        return clone
+    
+    def _index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        index = math.ceil(math.log(value) / self._log_gamma) - self._offset + 1
+        return min(index, len(self._counts) - 1)
+    
+    def _value(self, index: int) -> float:
+        if index == 0:
+            return self.min_value
+        # Midpoint of the bucket keeps the relative error symmetric
+        upper = self._gamma ** (index + self._offset - 1)
+        return 2 * upper / (1 + self._gamma)
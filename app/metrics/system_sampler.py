@@ -0,0 +1,98 @@
+"""
+System Metrics Sampler
+Samples CPU, memory and disk usage in the background
+"""
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Deque, List, Optional
+
+import psutil
+
+from app.config import settings
+from app.metrics.prometheus_metrics import metrics as prom_metrics
+from app.models.metrics import SystemMetrics
+
+logger = logging.getLogger(__name__)
+
+
+class SystemMetricsSampler:
+    """
+    Background sampler for system metrics
+    
+    Samples are taken on a fixed interval and kept in a ring buffer so
+    readers never block on psutil.
+    """
+    
+    def __init__(self, interval_seconds: float = 5.0, history_size: int = 120):
+        self.interval_seconds = interval_seconds
+        self._samples: Deque[SystemMetrics] = deque(maxlen=history_size)
+        self._task: Optional[asyncio.Task] = None
+    
+    def sample(self) -> SystemMetrics:
+        """Take a single non-blocking sample and record it"""
+        snapshot = SystemMetrics(
+            # interval=None compares against the previous call instead of sleeping
+            cpu_usage_percent=psutil.cpu_percent(interval=None),
+            memory_usage_percent=psutil.virtual_memory().percent,
+            disk_usage_percent=psutil.disk_usage('/').percent,
+            timestamp=datetime.utcnow()
+        )
+        self._samples.append(snapshot)
+        prom_metrics.update_system_metrics(
+            cpu=snapshot.cpu_usage_percent,
+            memory=snapshot.memory_usage_percent
+        )
+        return snapshot
+    
+    def latest(self) -> SystemMetrics:
+        """Get the most recent sample, sampling once if none exists yet"""
+        try:
+            return self._samples[-1]
+        except IndexError:
+            return self.sample()
+    
+    def history(self) -> List[SystemMetrics]:
+        """Get all buffered samples, oldest first"""
+        return list(self._samples)
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    async def start(self) -> None:
+        """Start the background sampling task"""
+        if self.running:
+            return
+        # Prime the CPU counter so the first real sample is meaningful
+        psutil.cpu_percent(interval=None)
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the background sampling task"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+    
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                # disk_usage may hit a slow filesystem, keep it off the event loop
+                await loop.run_in_executor(None, self.sample)
+            except Exception:
+                logger.exception("System metrics sampling failed")
+
+
+# Global sampler instance
+system_sampler = SystemMetricsSampler(
+    interval_seconds=settings.system_metrics_interval_seconds,
+    history_size=settings.system_metrics_history_size
+)
@@ -0,0 +1,121 @@
+"""
+Compression Middleware
+gzip/brotli response compression negotiated on Accept-Encoding
+"""
+from typing import List, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from fastapi import status
+from app.config import settings
+from app.utils.compression import (
+    BROTLI,
+    GZIP,
+    StreamEncoder,
+    choose_encoding,
+    compress,
+    compressible,
+    set_encoded_headers
+)
+
+
+class _CompressingSend:
+    """Send wrapper that encodes one response once it reaches the minimum size"""
+    
+    def __init__(self, send: Send, encoding: str, level: int, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.start: Optional[Message] = None
+        self.pending: List[bytes] = []
+        self.pending_size = 0
+        self.encoder: Optional[StreamEncoder] = None
+        self.passthrough = False
+    
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the body shows whether it gets encoded
+            self.start = message
+            self.passthrough = (
+                message["status"] in (status.HTTP_204_NO_CONTENT, status.HTTP_304_NOT_MODIFIED)
+                or not compressible(Headers(raw=message.get("headers", [])))
+            )
+            if self.passthrough:
+                await self.send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+        
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.encoder is not None:
+            encoded = self.encoder.encode(body) if body else b""
+            if not more_body:
+                encoded += self.encoder.finish()
+            await self.send({"type": "http.response.body", "body": encoded, "more_body": more_body})
+            return
+        
+        self.pending.append(body)
+        self.pending_size += len(body)
+        if more_body and self.pending_size < self.minimum_size:
+            return
+        body = b"".join(self.pending)
+        self.pending = []
+        headers = MutableHeaders(raw=list(self.start.get("headers", [])))
+        
+        if not more_body:
+            if self.pending_size < self.minimum_size:
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            body = compress(body, self.encoding, self.level)
+            set_encoded_headers(headers, self.encoding, len(body))
+            await self.send({**self.start, "headers": headers.raw})
+            await self.send({"type": "http.response.body", "body": body})
+            return
+        
+        # A stream past the minimum size: encode it chunk by chunk from here on
+        self.encoder = StreamEncoder(self.encoding, self.level)
+        set_encoded_headers(headers, self.encoding, None)
+        await self.send({**self.start, "headers": headers.raw})
+        await self.send({"type": "http.response.body", "body": self.encoder.encode(body), "more_body": True})
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with brotli or gzip, whichever the client prefers
+    
+    Text and JSON responses of at least `minimum_size` bytes are encoded;
+    streamed responses are buffered only until they reach that size and
+    then encoded chunk by chunk, flushing each chunk so NDJSON exports keep
+    streaming. Event streams and responses that already carry a
+    Content-Encoding pass through untouched, such as those of pre-rendered
+    routes (/, /version, /openapi.json), which pick one of the variants
+    they encoded at startup.
+    Brotli is used when the optional 'brotli' package is installed.
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = settings.compression_minimum_size,
+        gzip_level: int = settings.compression_gzip_level,
+        brotli_quality: int = settings.compression_brotli_quality
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {GZIP: gzip_level, BROTLI: brotli_quality}
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(
+            scope, receive, _CompressingSend(send, encoding, self.levels[encoding], self.minimum_size)
+        )
@@ -0,0 +1,166 @@
+"""
+Idempotency Middleware
+Replays the stored response of requests retried with the same Idempotency-Key
+"""
+import hashlib
+import logging
+from typing import List, Optional, Tuple
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from fastapi import status
+from app.config import settings
+from app.services.cache_service import CacheService
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+REPLAYED_HEADER = (b"idempotent-replayed", b"true")
+MAX_KEY_LENGTH = 255
+_METHODS = frozenset({"POST", "PATCH"})
+
+
+class StoredResponse:
+    """Response captured for an idempotency key"""
+    
+    __slots__ = ("fingerprint", "status_code", "headers", "body")
+    
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        self.headers: List[Tuple[bytes, bytes]] = []
+        self.body = b""
+    
+    async def send(self, send: Send, replayed: bool) -> None:
+        headers = [*self.headers, REPLAYED_HEADER] if replayed else self.headers
+        await send({"type": "http.response.start", "status": self.status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": self.body})
+
+
+class IdempotencyMiddleware:
+    """
+    Runs POST and PATCH requests that carry an Idempotency-Key at most once
+    
+    The first request with a key runs and its response is kept for
+    `ttl_seconds` in a bounded LRU store keyed by method, path and key.
+    Retries get the stored response back without reaching the endpoint,
+    and duplicates arriving while the first request is still running wait
+    for its response instead of running again. Reusing a key for a
+    different body or query string is rejected with 422. Server errors are
+    not stored, so a retry after a 5xx runs the request again.
+    
+    The store is per process; retries reaching another worker are only
+    collapsed by the state checks of the endpoints.
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        ttl_seconds: float = settings.idempotency_ttl_seconds,
+        max_keys: int = settings.idempotency_max_keys
+    ):
+        self.app = app
+        self.store = CacheService(name="idempotency", max_entries=max_keys, default_ttl_seconds=ttl_seconds)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in _METHODS:
+            await self.app(scope, receive, send)
+            return
+        key = self._idempotency_key(scope)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await self._send_error(
+                scope, receive, send,
+                status.HTTP_400_BAD_REQUEST,
+                "INVALID_IDEMPOTENCY_KEY",
+                f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters"
+            )
+            return
+        
+        body = await self._read_body(receive)
+        fingerprint = hashlib.sha256(scope.get("query_string", b"") + b"?" + body).hexdigest()
+        store_key = f"{scope['method']} {scope['path']} {key}"
+        executed = False
+        
+        async def execute() -> StoredResponse:
+            nonlocal executed
+            executed = True
+            return await self._execute(scope, receive, body, fingerprint)
+        
+        stored = await self.store.get_or_load(store_key, execute)
+        if stored.fingerprint != fingerprint:
+            await self._send_error(
+                scope, receive, send,
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+                "IDEMPOTENCY_KEY_REUSED",
+                "Idempotency-Key was already used for a different request"
+            )
+            return
+        if executed and stored.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+            self.store.delete(store_key)
+        elif not executed:
+            logger.info(f"Replaying response for idempotency key {key}", extra={"path": scope["path"]})
+        await stored.send(send, replayed=not executed)
+    
+    async def _execute(self, scope: Scope, receive: Receive, body: bytes, fingerprint: str) -> StoredResponse:
+        """Run the request with its buffered body and capture the response"""
+        stored = StoredResponse(fingerprint)
+        chunks: List[bytes] = []
+        body_sent = False
+        
+        async def receive_body() -> Message:
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        
+        async def capture(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                stored.status_code = message["status"]
+                stored.headers = list(message.get("headers", ()))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+        
+        await self.app(scope, receive_body, capture)
+        stored.body = b"".join(chunks)
+        return stored
+    
+    @staticmethod
+    def _idempotency_key(scope: Scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == IDEMPOTENCY_HEADER:
+                return value.decode("latin-1").strip()
+        return None
+    
+    @staticmethod
+    async def _read_body(receive: Receive) -> bytes:
+        chunks: List[bytes] = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+    
+    @staticmethod
+    async def _send_error(
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        status_code: int,
+        error: str,
+        message: str
+    ) -> None:
+        response = JSONResponse(
+            status_code=status_code,
+            content={
+                "error": error,
+                "message": message,
+                "request_id": scope.get("state", {}).get("request_id")
+            }
+        )
+        await response(scope, receive, send)
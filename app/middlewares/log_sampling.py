@@ -0,0 +1,83 @@
+"""
+Request Log Sampling
+Per-route sampling and log levels for request logs
+"""
+import logging
+import random
+from typing import Dict, NamedTuple, Optional
+from app.metrics.prometheus_metrics import metrics as prom_metrics
+
+DEFAULT_ROUTE = "default"
+
+
+class LogDecision(NamedTuple):
+    """How the log records of one request are handled"""
+    route: str
+    level: int
+    sampled: bool
+
+
+class RequestLogPolicy:
+    """
+    Decides which request log records are emitted
+    
+    Routes are matched by longest path prefix. A sampled-out request only
+    logs its completion when it failed or was slower than the threshold,
+    so errors and slow requests are never lost.
+    """
+    
+    def __init__(
+        self,
+        sample_rates: Optional[Dict[str, float]] = None,
+        route_levels: Optional[Dict[str, str]] = None,
+        slow_request_ms: float = 1000.0,
+        default_level: int = logging.INFO
+    ):
+        self.sample_rates = dict(sample_rates or {})
+        self.route_levels = {
+            prefix: logging.getLevelName(level.upper())
+            for prefix, level in (route_levels or {}).items()
+        }
+        self.slow_request_ms = slow_request_ms
+        self.default_level = default_level
+        # Longest prefix first so "/health/ready" wins over "/health"
+        self._prefixes = sorted(
+            set(self.sample_rates) | set(self.route_levels), key=len, reverse=True
+        )
+    
+    def decide(self, path: str) -> LogDecision:
+        """Resolve the route, level and sampling outcome for a request path"""
+        route = DEFAULT_ROUTE
+        for prefix in self._prefixes:
+            if path == prefix or path.startswith(prefix.rstrip("/") + "/"):
+                route = prefix
+                break
+        
+        rate = self.sample_rates.get(route, 1.0)
+        sampled = rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+        return LogDecision(route, self.route_levels.get(route, self.default_level), sampled)
+    
+    def log(
+        self,
+        logger: logging.Logger,
+        decision: LogDecision,
+        message: str,
+        extra: dict,
+        force: bool = False
+    ) -> None:
+        """Emit a request log record unless sampling or the route level suppress it"""
+        if not (decision.sampled or force):
+            prom_metrics.record_suppressed_log(decision.route, "sampled")
+            return
+        # Forced records are never quieter than the default level
+        level = max(decision.level, self.default_level) if force else decision.level
+        if not logger.isEnabledFor(level):
+            # Only route overrides count, the global log level is not suppression
+            if decision.route in self.route_levels:
+                prom_metrics.record_suppressed_log(decision.route, "level")
+            return
+        logger.log(level, message, extra=extra)
+    
+    def is_notable(self, status_code: int, duration_ms: float) -> bool:
+        """Errors and slow requests are always logged"""
+        return status_code >= 400 or duration_ms >= self.slow_request_ms
@@ -1,43 +0,0 @@
-"""
-Request Logging Middleware
-Logs all incoming requests and responses
-"""
-import logging
-import time
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-
-logger = logging.getLogger(__name__)
-
-
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log all requests and responses"""
-    
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        
-        logger.info(
-            f"Request started: {request.method} {request.url.path}",
-            extra={
-                "method": request.method,
-                "path": request.url.path,
-                "request_id": getattr(request.state, "request_id", None),
-            }
-        )
-        
-        response = await call_next(request)
-        
-        duration = time.time() - start_time
-        
-        logger.info(
-            f"Request completed: {request.method} {request.url.path}",
-            extra={
-                "method": request.method,
-                "path": request.url.path,
-                "status_code": response.status_code,
-                "duration_ms": round(duration * 1000, 2),
-                "request_id": getattr(request.state, "request_id", None),
-            }
-        )
-        
-        return response
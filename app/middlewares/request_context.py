@@ -0,0 +1,158 @@
+"""
+Request Context Middleware
+Pure ASGI middleware for request IDs, logging, metrics and error handling
+"""
+import logging
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from fastapi import status
+from app.config import settings
+from app.core.exceptions import ApplicationError, ServiceUnavailableError
+from app.core.dependencies import get_metrics_service
+from app.metrics.prometheus_metrics import metrics as prom_metrics
+from app.middlewares.log_sampling import RequestLogPolicy
+from app.services.metrics_service import MetricsService
+
+logger = logging.getLogger(__name__)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestContextMiddleware:
+    """
+    Middleware that handles the whole per-request context in one pass
+    
+    Replaces the RequestIDMiddleware, LoggingMiddleware and
+    error_handler_middleware stack. Working on raw ASGI messages avoids the
+    task hop and response buffering of BaseHTTPMiddleware, so streaming
+    responses pass straight through.
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        log_policy: Optional[RequestLogPolicy] = None,
+        metrics_service: Optional[MetricsService] = None
+    ):
+        self.app = app
+        self.metrics_service = metrics_service or get_metrics_service()
+        self.log_policy = log_policy or RequestLogPolicy(
+            sample_rates=settings.log_sample_rates,
+            route_levels=settings.log_route_levels,
+            slow_request_ms=settings.log_slow_request_ms
+        )
+        self._route_paths: Dict[Callable, str] = {}
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        request_id = str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
+        request_id_header = (b"x-request-id", request_id.encode("latin-1"))
+        method = scope["method"]
+        path = scope["path"]
+        start_time = time.perf_counter()
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        response_started = False
+        log_decision = self.log_policy.decide(path)
+        self.metrics_service.request_started()
+        
+        self.log_policy.log(
+            logger,
+            log_decision,
+            f"Request started: {method} {path}",
+            extra={"method": method, "path": path, "request_id": request_id}
+        )
+        
+        async def send_with_context(message: Message) -> None:
+            nonlocal status_code, response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                status_code = message["status"]
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", ()), request_id_header]
+                }
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_context)
+        except ApplicationError as exc:
+            if response_started:
+                raise
+            logger.error(
+                f"Application error: {exc.message}",
+                extra={"error_code": exc.code, "request_id": request_id}
+            )
+            error_status = (
+                status.HTTP_503_SERVICE_UNAVAILABLE
+                if isinstance(exc, ServiceUnavailableError)
+                else status.HTTP_400_BAD_REQUEST
+            )
+            await self._send_error(
+                scope, receive, send_with_context,
+                error_status, exc.code, exc.message, request_id
+            )
+        except Exception:
+            if response_started:
+                raise
+            logger.exception("Unhandled exception", extra={"request_id": request_id})
+            await self._send_error(
+                scope, receive, send_with_context,
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                "INTERNAL_SERVER_ERROR", "An unexpected error occurred", request_id
+            )
+        finally:
+            duration = time.perf_counter() - start_time
+            duration_ms = round(duration * 1000, 2)
+            self.log_policy.log(
+                logger,
+                log_decision,
+                f"Request completed: {method} {path}",
+                extra={
+                    "method": method,
+                    "path": path,
+                    "status_code": status_code,
+                    "duration_ms": duration_ms,
+                    "request_id": request_id,
+                },
+                force=self.log_policy.is_notable(status_code, duration_ms)
+            )
+            route_path = self._route_path(scope)
+            prom_metrics.record_request(method, route_path, status_code, duration)
+            self.metrics_service.record_request(method, route_path, status_code, duration * 1000)
+    
+    def _route_path(self, scope: Scope) -> str:
+        """Resolve the route template so metric labels do not explode per ID"""
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        route_path = self._route_paths.get(endpoint)
+        if route_path is None:
+            app: Any = scope.get("app")
+            for route in getattr(app, "routes", ()):
+                if getattr(route, "endpoint", None) is not None:
+                    self._route_paths[route.endpoint] = route.path
+            route_path = self._route_paths.setdefault(endpoint, scope["path"])
+        return route_path
+    
+    @staticmethod
+    async def _send_error(
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        status_code: int,
+        error: str,
+        message: str,
+        request_id: str
+    ) -> None:
+        response = JSONResponse(
+            status_code=status_code,
+            content={"error": error, "message": message, "request_id": request_id}
+        )
+        await response(scope, receive, send)
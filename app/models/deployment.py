@@ -2,10 +2,10 @@
 Deployment Domain Model
 Represents a deployment entity in the system
 """
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 from enum import Enum
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class DeploymentStatus(str, Enum):
@@ -15,6 +15,17 @@ class DeploymentStatus(str, Enum):
     SUCCESS = "success"
     FAILED = "failed"
     ROLLED_BACK = "rolled_back"
+    
+    def can_transition_to(self, target: "DeploymentStatus") -> bool:
+        """Whether a deployment in this status may move to `target`"""
+        return target in DEPLOYMENT_TRANSITIONS.get(self, ())
+
+
+# Deployments go PENDING -> IN_PROGRESS -> SUCCESS or FAILED
+DEPLOYMENT_TRANSITIONS = {
+    DeploymentStatus.PENDING: frozenset({DeploymentStatus.IN_PROGRESS}),
+    DeploymentStatus.IN_PROGRESS: frozenset({DeploymentStatus.SUCCESS, DeploymentStatus.FAILED}),
+}
 
 
 class Deployment(BaseModel):
@@ -27,9 +38,54 @@ class Deployment(BaseModel):
     status: DeploymentStatus = Field(default=DeploymentStatus.PENDING)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     error_message: Optional[str] = None
     deployed_by: str = Field(default="system")
     
     class Config:
         use_enum_values = True
+
+
+class DeploymentFilter(BaseModel):
+    """
+    Criteria for selecting deployments
+    
+    Unset criteria match everything. The creation time range includes
+    `created_since` and excludes `created_before`; timestamps are compared
+    as naive UTC like the stored ones.
+    """
+    
+    application: Optional[str] = None
+    environment: Optional[str] = None
+    status: Optional[DeploymentStatus] = None
+    deployed_by: Optional[str] = None
+    created_since: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    
+    @field_validator("created_since", "created_before")
+    @classmethod
+    def _to_naive_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+    
+    @property
+    def is_empty(self) -> bool:
+        return not self.model_dump(exclude_none=True)
+    
+    def matches(self, deployment: Deployment) -> bool:
+        """Check a deployment against every criterion"""
+        if self.application is not None and deployment.application != self.application:
+            return False
+        if self.environment is not None and deployment.environment != self.environment:
+            return False
+        if self.status is not None and DeploymentStatus(deployment.status) != self.status:
+            return False
+        if self.deployed_by is not None and deployment.deployed_by != self.deployed_by:
+            return False
+        if self.created_since is not None and deployment.created_at < self.created_since:
+            return False
+        if self.created_before is not None and deployment.created_at >= self.created_before:
+            return False
+        return True
@@ -16,13 +16,30 @@ class SystemMetrics(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
+class RouteMetrics(BaseModel):
+    """Request metrics of a single route"""
+    
+    request_count: int = Field(default=0, ge=0)
+    error_count: int = Field(default=0, ge=0)
+    average_response_time_ms: float = Field(default=0.0, ge=0)
+    p50_response_time_ms: float = Field(default=0.0, ge=0)
+    p90_response_time_ms: float = Field(default=0.0, ge=0)
+    p99_response_time_ms: float = Field(default=0.0, ge=0)
+    max_response_time_ms: float = Field(default=0.0, ge=0)
+
+
 class ApplicationMetrics(BaseModel):
     """Application-level metrics"""
     
     request_count: int = Field(default=0, ge=0)
     error_count: int = Field(default=0, ge=0)
     average_response_time_ms: float = Field(default=0.0, ge=0)
+    p50_response_time_ms: float = Field(default=0.0, ge=0)
+    p90_response_time_ms: float = Field(default=0.0, ge=0)
+    p99_response_time_ms: float = Field(default=0.0, ge=0)
+    max_response_time_ms: float = Field(default=0.0, ge=0)
     active_connections: int = Field(default=0, ge=0)
+    routes: Dict[str, RouteMetrics] = Field(default_factory=dict)
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -33,4 +50,10 @@ class DeploymentMetrics(BaseModel):
     successful_deployments: int = Field(default=0, ge=0)
     failed_deployments: int = Field(default=0, ge=0)
     average_deployment_time_seconds: float = Field(default=0.0, ge=0)
+    p50_deployment_time_seconds: float = Field(default=0.0, ge=0)
+    p95_deployment_time_seconds: float = Field(default=0.0, ge=0)
+    p99_deployment_time_seconds: float = Field(default=0.0, ge=0)
+    by_status: Dict[str, int] = Field(default_factory=dict)
+    by_environment: Dict[str, int] = Field(default_factory=dict)
+    by_application: Dict[str, int] = Field(default_factory=dict)
     timestamp: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,227 @@
+"""
+Compact Deployment Repository
+Columnar in-memory storage for large deployment histories
+"""
+import uuid
+from array import array
+from collections import defaultdict
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Callable, Optional, Tuple
+from app.models.deployment import Deployment, DeploymentFilter, DeploymentStatus
+from app.repositories.deployment_repository import DeploymentRepository
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_NO_TIME = -(2 ** 63)
+_STATUSES = list(DeploymentStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+# Deployments leave these statuses again, so their sets stay small; the
+# terminal statuses are found by scanning the status column instead
+_INDEXED_STATUSES = (DeploymentStatus.PENDING, DeploymentStatus.IN_PROGRESS)
+
+
+def _to_micros(value: Optional[datetime]) -> int:
+    return _NO_TIME if value is None else (value - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(value: int) -> Optional[datetime]:
+    return None if value == _NO_TIME else _EPOCH + timedelta(microseconds=value)
+
+
+class CompactDeploymentRepository(DeploymentRepository):
+    """
+    Deployment repository that stores records as columns
+    
+    Instead of one Pydantic model per deployment every attribute lives in
+    a typed array indexed by sequence number: UUIDs as 16 bytes, statuses
+    as one-byte codes, timestamps as epoch microseconds and repeated
+    strings (application, environment, version, deployed_by) as codes into
+    a shared intern table. Deployment models are built only when a record
+    is read, so callers get copies and must call update() to persist
+    changes, as with the SQL repository.
+    """
+    
+    def __init__(self, lock_stripes: int = 0):
+        super().__init__(lock_stripes)
+        self._by_status = {status: set() for status in _INDEXED_STATUSES}
+        self._by_application = defaultdict(lambda: array("I"))
+        self._by_environment = defaultdict(lambda: array("I"))
+        self._by_deployed_by = defaultdict(lambda: array("I"))
+        self._status_counts = array("Q", bytes(8 * len(_STATUSES)))
+        
+        self._strings: list[str] = []
+        self._string_codes: dict[str, int] = {}
+        self._uuid_seqs: dict[int, int] = {}
+        # IDs that are not canonical UUID strings are kept as they are
+        self._other_seqs: dict[str, int] = {}
+        self._other_ids: dict[int, str] = {}
+        
+        self._ids = bytearray()
+        self._applications = array("I")
+        self._versions = array("I")
+        self._environments = array("I")
+        self._deployed_bys = array("I")
+        self._statuses = bytearray()
+        self._created_ats = array("q")
+        self._updated_ats = array("q")
+        self._started_ats = array("q")
+        self._completed_ats = array("q")
+        self._errors: dict[int, str] = {}
+    
+    def get_by_id(self, deployment_id: str) -> Optional[Deployment]:
+        """Get deployment by ID"""
+        seq = self._seq_of(deployment_id)
+        return self._record(seq) if seq is not None else None
+    
+    def get_revision(self, deployment_id: str) -> Optional[Tuple[datetime, DeploymentStatus]]:
+        """Last update time and status of a deployment, without loading it"""
+        seq = self._seq_of(deployment_id)
+        if seq is None:
+            return None
+        return _from_micros(self._updated_ats[seq]), _STATUSES[self._statuses[seq]]
+    
+    def _write(self, deployment: Deployment) -> None:
+        seq = self._seq_of(deployment.id)
+        old_status = _STATUSES[self._statuses[seq]]
+        new_status = DeploymentStatus(deployment.status)
+        
+        self._updated_ats[seq] = _to_micros(deployment.updated_at)
+        self._started_ats[seq] = _to_micros(deployment.started_at)
+        self._completed_ats[seq] = _to_micros(deployment.completed_at)
+        if deployment.error_message is not None:
+            self._errors[seq] = deployment.error_message
+        else:
+            self._errors.pop(seq, None)
+        
+        # The status goes last, get_revision() never pairs it with an older update time
+        with self._structure_lock:
+            if new_status != old_status:
+                self._set_status(seq, old_status, new_status)
+            self._version += 1
+    
+    def count(self) -> int:
+        """Count total deployments"""
+        return len(self._statuses)
+    
+    def count_by_status(self, status: DeploymentStatus) -> int:
+        """Count deployments by status"""
+        return self._status_counts[_STATUS_CODES[DeploymentStatus(status)]]
+    
+    def _record(self, seq: int) -> Deployment:
+        strings = self._strings
+        raw_id = self._ids[seq * 16:seq * 16 + 16]
+        return Deployment.model_construct(
+            id=self._other_ids[seq] if seq in self._other_ids else str(uuid.UUID(bytes=bytes(raw_id))),
+            application=strings[self._applications[seq]],
+            version=strings[self._versions[seq]],
+            environment=strings[self._environments[seq]],
+            status=_STATUSES[self._statuses[seq]].value,
+            created_at=_from_micros(self._created_ats[seq]),
+            updated_at=_from_micros(self._updated_ats[seq]),
+            started_at=_from_micros(self._started_ats[seq]),
+            completed_at=_from_micros(self._completed_ats[seq]),
+            error_message=self._errors.get(seq),
+            deployed_by=strings[self._deployed_bys[seq]]
+        )
+    
+    def _seq_of(self, deployment_id: str) -> Optional[int]:
+        key = self._uuid_key(deployment_id)
+        if key is None:
+            return self._other_seqs.get(deployment_id)
+        return self._uuid_seqs.get(key)
+    
+    def _insert(self, deployment: Deployment) -> None:
+        seq = self.count()
+        key = self._uuid_key(deployment.id)
+        if key is None:
+            self._other_ids[seq] = deployment.id
+            self._ids += bytes(16)
+        else:
+            self._ids += key.to_bytes(16, "big")
+        
+        status = DeploymentStatus(deployment.status)
+        self._applications.append(self._intern(deployment.application))
+        self._versions.append(self._intern(deployment.version))
+        self._environments.append(self._intern(deployment.environment))
+        self._deployed_bys.append(self._intern(deployment.deployed_by))
+        self._created_ats.append(_to_micros(deployment.created_at))
+        self._updated_ats.append(_to_micros(deployment.updated_at))
+        self._started_ats.append(_to_micros(deployment.started_at))
+        self._completed_ats.append(_to_micros(deployment.completed_at))
+        if deployment.error_message is not None:
+            self._errors[seq] = deployment.error_message
+        
+        self._status_counts[_STATUS_CODES[status]] += 1
+        if status in self._by_status:
+            self._by_status[status].add(seq)
+        self._by_application[deployment.application].append(seq)
+        self._by_environment[deployment.environment].append(seq)
+        self._by_deployed_by[deployment.deployed_by].append(seq)
+        # Published last, count() and lookups by ID only see complete records
+        self._statuses.append(_STATUS_CODES[status])
+        if key is None:
+            self._other_seqs[deployment.id] = seq
+        else:
+            self._uuid_seqs[key] = seq
+    
+    def _set_status(self, seq: int, old_status: DeploymentStatus, new_status: DeploymentStatus) -> None:
+        self._statuses[seq] = _STATUS_CODES[new_status]
+        self._status_counts[_STATUS_CODES[old_status]] -= 1
+        self._status_counts[_STATUS_CODES[new_status]] += 1
+        if old_status in self._by_status:
+            self._by_status[old_status].discard(seq)
+        if new_status in self._by_status:
+            self._by_status[new_status].add(seq)
+    
+    def _matcher(self, filters: DeploymentFilter) -> Callable[[int], bool]:
+        """Compare codes column by column without building models"""
+        checks = []
+        for column, value in (
+            (self._applications, filters.application),
+            (self._environments, filters.environment),
+            (self._deployed_bys, filters.deployed_by),
+        ):
+            if value is not None:
+                code = self._string_codes.get(value)
+                if code is None:
+                    return lambda seq: False
+                checks.append((column, code))
+        if filters.status is not None:
+            checks.append((self._statuses, _STATUS_CODES[filters.status]))
+        
+        since = _to_micros(filters.created_since) if filters.created_since else None
+        before = _to_micros(filters.created_before) if filters.created_before else None
+        created_ats = self._created_ats
+        
+        def matches(seq: int) -> bool:
+            for column, code in checks:
+                if column[seq] != code:
+                    return False
+            if since is not None and created_ats[seq] < since:
+                return False
+            return before is None or created_ats[seq] < before
+        
+        return matches
+    
+    def _status_members(self, status: DeploymentStatus) -> Optional[set]:
+        return self._by_status.get(status)
+    
+    def _seq_at(self, created_at: datetime) -> int:
+        return bisect_left(self._created_ats, _to_micros(created_at))
+    
+    def _intern(self, value: str) -> int:
+        code = self._string_codes.get(value)
+        if code is None:
+            code = self._string_codes[value] = len(self._strings)
+            self._strings.append(value)
+        return code
+    
+    @staticmethod
+    def _uuid_key(deployment_id: str) -> Optional[int]:
+        """128-bit integer of a canonical UUID string, None for other IDs"""
+        try:
+            parsed = uuid.UUID(deployment_id)
+        except (ValueError, AttributeError, TypeError):
+            return None
+        return parsed.int if str(parsed) == deployment_id else None
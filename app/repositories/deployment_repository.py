@@ -2,48 +2,379 @@
 Deployment Repository
 Data access layer for deployments (in-memory for demo, would be DB in production)
 """
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from collections import defaultdict
+from bisect import bisect_left, bisect_right
+from contextlib import nullcontext
 from datetime import datetime
+import base64
+import heapq
+import threading
 import uuid
-from app.models.deployment import Deployment, DeploymentStatus
+from app.models.deployment import Deployment, DeploymentFilter, DeploymentStatus
+from app.core.exceptions import (
+    ApplicationError,
+    DeploymentNotFoundError,
+    InvalidStateTransitionError,
+    ValidationError
+)
+
+# A compare-and-set status change: deployment ID, target status and the
+# change that moves the deployment there
+Transition = Tuple[str, DeploymentStatus, Callable[[Deployment], None]]
+# Outcome of a transition: the updated deployment and its previous status,
+# or the error of that deployment
+TransitionResult = Union[Tuple[Deployment, DeploymentStatus], ApplicationError]
+
+_NO_LOCK = nullcontext()
+
+
+def encode_cursor(seq: int) -> str:
+    """Encode a sequence number as an opaque pagination cursor"""
+    return base64.urlsafe_b64encode(str(seq).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode an opaque pagination cursor back to a sequence number"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        seq = int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise ValidationError(f"Invalid cursor: {cursor}")
+    if seq < 0:
+        raise ValidationError(f"Invalid cursor: {cursor}")
+    return seq
 
 
 class DeploymentRepository:
-    """Repository for deployment data access"""
+    """
+    Repository for deployment data access
+    
+    Every deployment gets a sequence number in creation order. Secondary
+    indexes hold sequence numbers, so application/environment/deployed_by
+    indexes are append-only sorted lists and keyset pagination is a bisect
+    away. Creation times are assigned on insert, under the same lock as
+    the sequence number and never below the previous one, so they ascend
+    with it and a created_at range becomes a seq range.
     
-    def __init__(self):
+    With `lock_stripes` the repository can be shared between threads.
+    Writes to a deployment hold one of `lock_stripes` locks chosen by its
+    ID, so writers of different deployments rarely wait for each other;
+    inserts and status index moves take a short structure lock. Reads take
+    no lock: a record becomes visible only once it is fully inserted, and
+    transition() stores a changed copy instead of editing the stored one.
+    """
+    
+    def __init__(self, lock_stripes: int = 0):
+        self._stripes = [threading.Lock() for _ in range(lock_stripes)]
+        self._structure_lock = threading.Lock() if lock_stripes else _NO_LOCK
+        # Bumped after every write; the epoch tells this process's counts
+        # apart from those of an earlier one
+        self._epoch = uuid.uuid4().hex[:8]
+        self._version = 0
+        self._last_created_at: Optional[datetime] = None
         self._deployments: dict[str, Deployment] = {}
+        self._order: list[str] = []
+        self._seq_by_id: dict[str, int] = {}
+        self._status_by_seq: list[DeploymentStatus] = []
+        self._created_at_by_seq: list[datetime] = []
+        self._by_status: dict[DeploymentStatus, set[int]] = defaultdict(set)
+        self._by_application: dict[str, list[int]] = defaultdict(list)
+        self._by_environment: dict[str, list[int]] = defaultdict(list)
+        self._by_deployed_by: dict[str, list[int]] = defaultdict(list)
     
     def create(self, deployment: Deployment) -> Deployment:
         """Create a new deployment"""
         if not deployment.id:
             deployment.id = str(uuid.uuid4())
         
-        deployment.created_at = datetime.utcnow()
-        deployment.updated_at = datetime.utcnow()
-        
-        self._deployments[deployment.id] = deployment
+        with self._structure_lock:
+            now = self._creation_time()
+            deployment.created_at = now
+            deployment.updated_at = now
+            self._insert(deployment)
+            self._version += 1
         return deployment
     
+    def create_many(self, deployments: List[Deployment]) -> List[Deployment]:
+        """Create several deployments at once"""
+        for deployment in deployments:
+            if not deployment.id:
+                deployment.id = str(uuid.uuid4())
+        with self._structure_lock:
+            now = self._creation_time()
+            for deployment in deployments:
+                deployment.created_at = now
+                deployment.updated_at = now
+                self._insert(deployment)
+            self._version += 1
+        return deployments
+    
     def get_by_id(self, deployment_id: str) -> Optional[Deployment]:
         """Get deployment by ID"""
         return self._deployments.get(deployment_id)
     
-    def list_all(self, skip: int = 0, limit: int = 100) -> List[Deployment]:
+    def get_revision(self, deployment_id: str) -> Optional[Tuple[datetime, DeploymentStatus]]:
+        """Last update time and status of a deployment, without loading it"""
+        deployment = self._deployments.get(deployment_id)
+        if deployment is None:
+            return None
+        return deployment.updated_at, DeploymentStatus(deployment.status)
+    
+    def collection_version(self) -> str:
+        """Token that changes whenever a deployment is created or updated"""
+        return f"{self._epoch}.{self._version}"
+    
+    def get_many(self, deployment_ids: Iterable[str]) -> Dict[str, Deployment]:
+        """Get the existing deployments among several IDs, keyed by ID"""
+        found = {}
+        for deployment_id in deployment_ids:
+            seq = self._seq_of(deployment_id)
+            if seq is not None:
+                found[deployment_id] = self._record(seq)
+        return found
+    
+    def list_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[DeploymentFilter] = None
+    ) -> List[Deployment]:
         """List all deployments with pagination"""
-        deployments = list(self._deployments.values())
-        return deployments[skip:skip + limit]
+        if filters is None or filters.is_empty:
+            seqs = range(skip, min(skip + limit, self.count()))
+        else:
+            seqs = self._page_seqs(-1, skip + limit, filters)[skip:]
+        return [self._record(s) for s in seqs]
+    
+    def list_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Optional[DeploymentFilter] = None
+    ) -> tuple[List[Deployment], Optional[str]]:
+        """
+        List deployments after a cursor in creation order (keyset pagination)
+        
+        Returns the page and the cursor for the next page, or None when
+        there are no more results.
+        """
+        after = decode_cursor(cursor) if cursor else -1
+        seqs = self._page_seqs(after, limit + 1, filters or DeploymentFilter())
+        
+        next_cursor = None
+        if len(seqs) > limit:
+            seqs = seqs[:limit]
+            next_cursor = encode_cursor(seqs[-1])
+        
+        return [self._record(s) for s in seqs], next_cursor
+    
+    def scan(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Optional[DeploymentFilter] = None
+    ) -> List[Tuple[str, Deployment]]:
+        """List deployments after a cursor, each paired with the cursor that resumes after it"""
+        after = decode_cursor(cursor) if cursor else -1
+        seqs = self._page_seqs(after, limit, filters or DeploymentFilter())
+        return [(encode_cursor(s), self._record(s)) for s in seqs]
+    
+    def cursor_after(self, deployment: Deployment) -> str:
+        """Get the cursor that continues after the given deployment"""
+        return encode_cursor(self._seq_of(deployment.id))
     
     def update(self, deployment: Deployment) -> Deployment:
         """Update existing deployment"""
         deployment.updated_at = datetime.utcnow()
-        self._deployments[deployment.id] = deployment
+        with self._lock_for(deployment.id):
+            self._write(deployment)
         return deployment
     
+    def update_many(self, deployments: List[Deployment]) -> List[Deployment]:
+        """Update several existing deployments"""
+        for deployment in deployments:
+            self.update(deployment)
+        return deployments
+    
+    def transition(
+        self,
+        deployment_id: str,
+        target: DeploymentStatus,
+        apply: Callable[[Deployment], None]
+    ) -> Tuple[Deployment, DeploymentStatus]:
+        """
+        Compare-and-set a status change
+        
+        Under the deployment's lock, checks that its current status may move
+        to `target` and stores a copy changed by `apply`, so of two racing
+        writers exactly one wins. Returns the updated deployment and its
+        previous status.
+        """
+        with self._lock_for(deployment_id):
+            current = self.get_by_id(deployment_id)
+            if current is None:
+                raise DeploymentNotFoundError(deployment_id)
+            old_status = DeploymentStatus(current.status)
+            if not old_status.can_transition_to(target):
+                raise InvalidStateTransitionError(deployment_id, old_status.value, target.value)
+            deployment = current.model_copy()
+            apply(deployment)
+            deployment.updated_at = datetime.utcnow()
+            self._write(deployment)
+        return deployment, old_status
+    
+    def transition_many(self, transitions: Sequence[Transition]) -> List[TransitionResult]:
+        """Apply several compare-and-set status changes, each succeeding or failing on its own"""
+        results: List[TransitionResult] = []
+        for deployment_id, target, apply in transitions:
+            try:
+                results.append(self.transition(deployment_id, target, apply))
+            except ApplicationError as e:
+                results.append(e)
+        return results
+    
     def count(self) -> int:
         """Count total deployments"""
         return len(self._deployments)
     
+    def ping(self) -> None:
+        """Check the store is reachable, in memory it always is"""
+    
+    def count_matching(self, filters: Optional[DeploymentFilter] = None) -> int:
+        """Count deployments matching the filters"""
+        if filters is None or filters.is_empty:
+            return self.count()
+        return len(self._page_seqs(-1, self.count(), filters))
+    
     def count_by_status(self, status: DeploymentStatus) -> int:
         """Count deployments by status"""
-        return sum(1 for d in self._deployments.values() if d.status == status)
+        return len(self._by_status.get(DeploymentStatus(status), ()))
+    
+    def count_by_application(self, application: str) -> int:
+        """Count deployments of an application"""
+        return len(self._by_application.get(application, ()))
+    
+    def count_by_environment(self, environment: str) -> int:
+        """Count deployments to an environment"""
+        return len(self._by_environment.get(environment, ()))
+    
+    def _lock_for(self, deployment_id: str):
+        """Stripe lock guarding writes to a deployment"""
+        if not self._stripes:
+            return _NO_LOCK
+        return self._stripes[hash(deployment_id) % len(self._stripes)]
+    
+    def _write(self, deployment: Deployment) -> None:
+        """Store an existing deployment, the caller holds its stripe lock"""
+        seq = self._seq_by_id[deployment.id]
+        old_status = self._status_by_seq[seq]
+        new_status = DeploymentStatus(deployment.status)
+        self._deployments[deployment.id] = deployment
+        with self._structure_lock:
+            if new_status != old_status:
+                self._set_status(seq, old_status, new_status)
+            self._version += 1
+    
+    def _set_status(self, seq: int, old_status: DeploymentStatus, new_status: DeploymentStatus) -> None:
+        self._by_status[old_status].discard(seq)
+        self._by_status[new_status].add(seq)
+        self._status_by_seq[seq] = new_status
+    
+    def _record(self, seq: int) -> Deployment:
+        """Deployment stored under a sequence number"""
+        return self._deployments[self._order[seq]]
+    
+    def _seq_of(self, deployment_id: str) -> Optional[int]:
+        """Sequence number of a deployment ID, None when unknown"""
+        return self._seq_by_id.get(deployment_id)
+    
+    def _insert(self, deployment: Deployment) -> None:
+        seq = len(self._order)
+        status = DeploymentStatus(deployment.status)
+        self._order.append(deployment.id)
+        self._status_by_seq.append(status)
+        self._created_at_by_seq.append(deployment.created_at)
+        self._by_status[status].add(seq)
+        self._by_application[deployment.application].append(seq)
+        self._by_environment[deployment.environment].append(seq)
+        self._by_deployed_by[deployment.deployed_by].append(seq)
+        # Published last, count() and lookups by ID only see complete records
+        self._deployments[deployment.id] = deployment
+        self._seq_by_id[deployment.id] = seq
+    
+    def _page_seqs(self, after: int, limit: int, filters: DeploymentFilter) -> List[int]:
+        """Select up to `limit` matching sequence numbers greater than `after`"""
+        if filters.created_since is not None:
+            after = max(after, self._seq_at(filters.created_since) - 1)
+        end = self.count()
+        if filters.created_before is not None:
+            end = self._seq_at(filters.created_before)
+        
+        sorted_candidates = [
+            index.get(value, [])
+            for index, value in (
+                (self._by_application, filters.application),
+                (self._by_environment, filters.environment),
+                (self._by_deployed_by, filters.deployed_by),
+            )
+            if value is not None
+        ]
+        status = filters.status
+        matches = self._matcher(filters)
+        
+        if sorted_candidates:
+            # Walk the smallest append-only index and check the rest per item
+            candidates = min(sorted_candidates, key=len)
+            start = bisect_right(candidates, after)
+            stop = bisect_left(candidates, end)
+            return self._take(
+                (candidates[i] for i in range(start, stop)), matches, limit
+            )
+        
+        if status is not None:
+            members = self._status_members(status)
+            # Sparse statuses are cheaper to select from the set directly,
+            # dense ones are cheaper to find by walking creation order
+            if members is not None and len(members) * 8 < end - after:
+                # Copied in one step, writers may change the set meanwhile
+                return heapq.nsmallest(limit, (s for s in tuple(members) if after < s < end))
+            return self._take(range(after + 1, end), matches, limit)
+        
+        return list(range(after + 1, min(after + 1 + limit, end)))
+    
+    def _matcher(self, filters: DeploymentFilter) -> Callable[[int], bool]:
+        """Predicate telling whether the deployment at a sequence number matches"""
+        return lambda seq: filters.matches(self._record(seq))
+    
+    def _status_members(self, status: DeploymentStatus) -> Optional[set]:
+        """Sequence numbers with a status, None when that status is not indexed"""
+        return self._by_status.get(status, set())
+    
+    def _creation_time(self) -> datetime:
+        """
+        Creation time of the next insert, called under the structure lock
+        
+        Clamped to the last one handed out, so a clock step backwards or a
+        thread stamped before another cannot break the order _seq_at
+        bisects over.
+        """
+        now = datetime.utcnow()
+        if self._last_created_at is not None and now < self._last_created_at:
+            now = self._last_created_at
+        self._last_created_at = now
+        return now
+    
+    def _seq_at(self, created_at: datetime) -> int:
+        """First sequence number created at or after a time"""
+        return bisect_left(self._created_at_by_seq, created_at)
+    
+    @staticmethod
+    def _take(seqs: Iterable[int], matches, limit: int) -> List[int]:
+        selected = []
+        for seq in seqs:
+            if matches(seq):
+                selected.append(seq)
+                if len(selected) == limit:
+                    break
+        return selected
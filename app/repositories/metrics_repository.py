@@ -2,45 +2,102 @@
 Metrics Repository
 Collects and stores application metrics
 """
+import threading
 from datetime import datetime
-from typing import List
-from app.models.metrics import SystemMetrics, ApplicationMetrics, DeploymentMetrics
+from typing import Dict
+from app.metrics.quantiles import QuantileSketch
+from app.models.metrics import ApplicationMetrics, RouteMetrics
 
+# Latencies are recorded in milliseconds
+LATENCY_MIN_MS = 0.01
+LATENCY_MAX_MS = 10 * 60 * 1000
 
-class MetricsRepository:
-    """Repository for metrics data"""
+
+class _RouteStats:
+    """Counters and latency sketch of one route"""
+    
+    __slots__ = ("request_count", "error_count", "latencies")
     
     def __init__(self):
-        self._request_count = 0
-        self._error_count = 0
-        self._response_times: List[float] = []
+        self.request_count = 0
+        self.error_count = 0
+        self.latencies = QuantileSketch(min_value=LATENCY_MIN_MS, max_value=LATENCY_MAX_MS)
+
+
+class MetricsRepository:
+    """
+    Repository for request metrics
     
-    def increment_request_count(self) -> None:
-        """Increment request counter"""
-        self._request_count += 1
+    Latencies go into a fixed-size quantile sketch per route, so recording
+    is O(1) and never allocates. Writes and snapshots share one lock; a
+    snapshot only copies the counters and sketch arrays while holding it
+    and computes percentiles afterwards, so readers never stall writers
+    for longer than a copy. Metrics are per process.
+    """
     
-    def increment_error_count(self) -> None:
-        """Increment error counter"""
-        self._error_count += 1
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, _RouteStats] = {}
+        self._active_requests = 0
     
-    def record_response_time(self, time_ms: float) -> None:
-        """Record response time"""
-        self._response_times.append(time_ms)
-        # Keep only last 1000 entries
-        if len(self._response_times) > 1000:
-            self._response_times = self._response_times[-1000:]
+    def request_started(self) -> None:
+        """Count a request that is being handled"""
+        with self._lock:
+            self._active_requests += 1
+    
+    def record_request(self, route: str, duration_ms: float, is_error: bool) -> None:
+        """Record a completed request of a route"""
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = _RouteStats()
+            stats.request_count += 1
+            if is_error:
+                stats.error_count += 1
+            stats.latencies.add(duration_ms)
+            self._active_requests -= 1
     
     def get_application_metrics(self) -> ApplicationMetrics:
         """Get current application metrics"""
-        avg_response_time = (
-            sum(self._response_times) / len(self._response_times)
-            if self._response_times else 0.0
-        )
+        with self._lock:
+            active_requests = self._active_requests
+            routes = {
+                route: (stats.request_count, stats.error_count, stats.latencies.copy())
+                for route, stats in self._routes.items()
+            }
+        
+        total = QuantileSketch(min_value=LATENCY_MIN_MS, max_value=LATENCY_MAX_MS)
+        route_metrics: Dict[str, RouteMetrics] = {}
+        request_count = error_count = 0
+        for route, (route_requests, route_errors, latencies) in sorted(routes.items()):
+            request_count += route_requests
+            error_count += route_errors
+            total.merge(latencies)
+            route_metrics[route] = RouteMetrics(
+                request_count=route_requests,
+                error_count=route_errors,
+                **self._latency_fields(latencies)
+            )
         
         return ApplicationMetrics(
-            request_count=self._request_count,
-            error_count=self._error_count,
-            average_response_time_ms=avg_response_time,
-            active_connections=0,  # Would track actual connections
-            timestamp=datetime.utcnow()
+            request_count=request_count,
+            error_count=error_count,
+            active_connections=active_requests,
+            routes=route_metrics,
+            timestamp=datetime.utcnow(),
+            **self._latency_fields(total)
         )
+    
+    @staticmethod
+    def _latency_fields(latencies: QuantileSketch) -> Dict[str, float]:
+        return {
+            "average_response_time_ms": latencies.mean,
+            "p50_response_time_ms": latencies.quantile(0.50),
+            "p90_response_time_ms": latencies.quantile(0.90),
+            "p99_response_time_ms": latencies.quantile(0.99),
+            "max_response_time_ms": latencies.max or 0.0,
+        }
+
+
+# Global metrics repository instance
+metrics_repository = MetricsRepository()
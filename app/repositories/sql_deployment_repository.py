@@ -0,0 +1,555 @@
+"""
+SQL Deployment Repository
+Persistent data access layer for deployments backed by SQLite or PostgreSQL
+"""
+import logging
+import queue
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from app.models.deployment import Deployment, DeploymentFilter, DeploymentStatus
+from app.core.exceptions import (
+    ApplicationError,
+    DeploymentNotFoundError,
+    InvalidStateTransitionError,
+    ServiceUnavailableError
+)
+from app.repositories.deployment_repository import (
+    Transition,
+    TransitionResult,
+    encode_cursor,
+    decode_cursor
+)
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = (
+    "id", "application", "version", "environment", "status", "created_at",
+    "updated_at", "completed_at", "error_message", "deployed_by", "started_at"
+)
+SELECT_COLUMNS = "seq, " + ", ".join(COLUMNS)
+
+
+class SQLiteDialect:
+    """SQLite connection and SQL flavour"""
+    
+    placeholder = "?"
+    seq_column = "seq INTEGER PRIMARY KEY AUTOINCREMENT"
+    
+    def __init__(self, database_url: str):
+        self.path = database_url.split(":///", 1)[1] if ":///" in database_url else ":memory:"
+    
+    def connect(self):
+        if self.path == ":memory:":
+            # A named shared-cache database lets every pooled connection see the same data
+            conn = sqlite3.connect(
+                "file:deployments?mode=memory&cache=shared",
+                uri=True,
+                check_same_thread=False
+            )
+        else:
+            # Identical SQL text reuses the connection's compiled statement cache
+            conn = sqlite3.connect(self.path, check_same_thread=False, cached_statements=256)
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+    
+    def column_names(self, cursor, table: str) -> set:
+        cursor.execute(f"PRAGMA table_info({table})")
+        return {row[1] for row in cursor.fetchall()}
+    
+    def to_db(self, value: Optional[datetime]) -> Optional[str]:
+        return value.isoformat() if value is not None else None
+    
+    def from_db(self, value: Any) -> Optional[datetime]:
+        return datetime.fromisoformat(value) if value is not None else None
+
+
+class PostgresDialect:
+    """PostgreSQL connection and SQL flavour (requires psycopg 3)"""
+    
+    placeholder = "%s"
+    seq_column = "seq BIGSERIAL PRIMARY KEY"
+    
+    def __init__(self, database_url: str):
+        self.database_url = database_url
+    
+    def connect(self):
+        try:
+            import psycopg
+        except ImportError as e:
+            raise RuntimeError(
+                "PostgreSQL database_url requires the 'psycopg' package"
+            ) from e
+        # prepare_threshold=0 makes the server prepare every statement on first use
+        return psycopg.connect(self.database_url, prepare_threshold=0)
+    
+    def column_names(self, cursor, table: str) -> set:
+        cursor.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_name = %s",
+            (table,)
+        )
+        return {row[0] for row in cursor.fetchall()}
+    
+    def to_db(self, value: Optional[datetime]) -> Optional[datetime]:
+        return value
+    
+    def from_db(self, value: Any) -> Optional[datetime]:
+        return value
+
+
+def get_dialect(database_url: str):
+    """Select the SQL dialect for a database URL"""
+    scheme = database_url.split(":", 1)[0].split("+", 1)[0]
+    if scheme == "sqlite":
+        return SQLiteDialect(database_url)
+    if scheme in ("postgres", "postgresql"):
+        return PostgresDialect(database_url)
+    raise ValueError(f"Unsupported database URL scheme: {scheme}")
+
+
+class ConnectionPool:
+    """Bounded pool of DB-API connections"""
+    
+    def __init__(self, dialect, size: int = 5, timeout_seconds: float = 5.0):
+        self.dialect = dialect
+        self.size = size
+        self.timeout_seconds = timeout_seconds
+        self._idle: "queue.LifoQueue" = queue.LifoQueue(maxsize=size)
+        self._all: list = []
+    
+    def open(self) -> None:
+        """Open all pooled connections"""
+        for _ in range(self.size):
+            conn = self.dialect.connect()
+            self._all.append(conn)
+            self._idle.put(conn)
+    
+    def close(self) -> None:
+        """Close all pooled connections"""
+        for conn in self._all:
+            try:
+                conn.close()
+            except Exception:
+                logger.exception("Failed to close database connection")
+        self._all.clear()
+        self._idle = queue.LifoQueue(maxsize=self.size)
+    
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Borrow a connection for one transaction"""
+        try:
+            conn = self._idle.get(timeout=self.timeout_seconds)
+        except queue.Empty:
+            raise ServiceUnavailableError("database")
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._idle.put(conn)
+
+
+class SQLDeploymentRepository:
+    """
+    Repository for deployment data access backed by a SQL database
+    
+    Mirrors the in-memory DeploymentRepository interface, so services do
+    not need to know which backend is configured.
+    """
+    
+    def __init__(self, database_url: str, pool_size: int = 5, pool_timeout_seconds: float = 5.0):
+        self.dialect = get_dialect(database_url)
+        self.pool = ConnectionPool(self.dialect, size=pool_size, timeout_seconds=pool_timeout_seconds)
+        self._opened = False
+        
+        p = self.dialect.placeholder
+        self._sql_insert = (
+            f"INSERT INTO deployments ({', '.join(COLUMNS)}) "
+            f"VALUES ({', '.join([p] * len(COLUMNS))})"
+        )
+        self._sql_get = f"SELECT {SELECT_COLUMNS} FROM deployments WHERE id = {p}"
+        self._sql_seq = f"SELECT seq FROM deployments WHERE id = {p}"
+        self._sql_update = (
+            f"UPDATE deployments SET status = {p}, updated_at = {p}, started_at = {p}, "
+            f"completed_at = {p}, error_message = {p} WHERE id = {p}"
+        )
+        self._sql_update_if_status = f"{self._sql_update} AND status = {p}"
+        self._sql_status = f"SELECT status FROM deployments WHERE id = {p}"
+        self._sql_revision = f"SELECT updated_at, status FROM deployments WHERE id = {p}"
+        # One-row counter bumped by every write transaction; the row lock
+        # orders concurrent writers, so the token never goes backwards
+        self._sql_collection_version = "SELECT epoch, version FROM deployments_version WHERE id = 1"
+        self._sql_bump_version = "UPDATE deployments_version SET version = version + 1 WHERE id = 1"
+        self._sql_count = "SELECT COUNT(*) FROM deployments"
+        self._sql_count_by = {
+            column: f"SELECT COUNT(*) FROM deployments WHERE {column} = {p}"
+            for column in ("status", "application", "environment")
+        }
+    
+    def open(self) -> None:
+        """Open the connection pool and create the schema"""
+        if self._opened:
+            return
+        self.pool.open()
+        self._opened = True
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""CREATE TABLE IF NOT EXISTS deployments (
+                    {self.dialect.seq_column},
+                    id VARCHAR(36) NOT NULL UNIQUE,
+                    application VARCHAR(100) NOT NULL,
+                    version VARCHAR(50) NOT NULL,
+                    environment VARCHAR(20) NOT NULL,
+                    status VARCHAR(20) NOT NULL,
+                    created_at TIMESTAMP NOT NULL,
+                    updated_at TIMESTAMP NOT NULL,
+                    completed_at TIMESTAMP,
+                    error_message TEXT,
+                    deployed_by VARCHAR(100) NOT NULL,
+                    started_at TIMESTAMP
+                )"""
+            )
+            # Tables created before started_at existed
+            if "started_at" not in self.dialect.column_names(cursor, "deployments"):
+                cursor.execute("ALTER TABLE deployments ADD COLUMN started_at TIMESTAMP")
+            # Composite indexes end in seq so filtered keyset pages are index range scans
+            for column in ("status", "application", "environment", "deployed_by"):
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS ix_deployments_{column} "
+                    f"ON deployments ({column}, seq)"
+                )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS ix_deployments_created_at ON deployments (created_at)"
+            )
+            cursor.execute(
+                """CREATE TABLE IF NOT EXISTS deployments_version (
+                    id INTEGER PRIMARY KEY,
+                    epoch VARCHAR(32) NOT NULL,
+                    version BIGINT NOT NULL
+                )"""
+            )
+            # The epoch keeps tokens of a recreated database apart from the old ones
+            p = self.dialect.placeholder
+            cursor.execute(
+                f"INSERT INTO deployments_version (id, epoch, version) VALUES (1, {p}, 0) "
+                "ON CONFLICT (id) DO NOTHING",
+                (uuid.uuid4().hex[:8],)
+            )
+        logger.info("Deployment database opened")
+    
+    def close(self) -> None:
+        """Close the connection pool"""
+        if not self._opened:
+            return
+        self.pool.close()
+        self._opened = False
+        logger.info("Deployment database closed")
+    
+    def create(self, deployment: Deployment) -> Deployment:
+        """Create a new deployment"""
+        if not deployment.id:
+            deployment.id = str(uuid.uuid4())
+        
+        deployment.created_at = datetime.utcnow()
+        deployment.updated_at = datetime.utcnow()
+        
+        self._execute(self._sql_insert, self._to_row(deployment))
+        return deployment
+    
+    def create_many(self, deployments: List[Deployment]) -> List[Deployment]:
+        """Create several deployments in a single transaction"""
+        now = datetime.utcnow()
+        for deployment in deployments:
+            if not deployment.id:
+                deployment.id = str(uuid.uuid4())
+            deployment.created_at = now
+            deployment.updated_at = now
+        
+        self._execute_many(self._sql_insert, [self._to_row(d) for d in deployments])
+        return deployments
+    
+    def get_by_id(self, deployment_id: str) -> Optional[Deployment]:
+        """Get deployment by ID"""
+        rows = self._fetch(self._sql_get, (deployment_id,))
+        return self._from_row(rows[0]) if rows else None
+    
+    def get_revision(self, deployment_id: str) -> Optional[Tuple[datetime, DeploymentStatus]]:
+        """Last update time and status of a deployment, without loading it"""
+        rows = self._fetch(self._sql_revision, (deployment_id,))
+        if not rows:
+            return None
+        updated_at, status = rows[0]
+        return self.dialect.from_db(updated_at), DeploymentStatus(status)
+    
+    def collection_version(self) -> str:
+        """
+        Token that changes whenever a deployment is created or updated
+        
+        Read from a counter that every write bumps in its own transaction,
+        so every worker sharing the database sees the same token and no
+        write can leave it unchanged, whatever the clocks of the workers.
+        """
+        epoch, version = self._fetch(self._sql_collection_version, ())[0]
+        return f"{epoch}.{version}"
+    
+    def get_many(self, deployment_ids: Iterable[str]) -> Dict[str, Deployment]:
+        """Get the existing deployments among several IDs, keyed by ID"""
+        deployment_ids = list(dict.fromkeys(deployment_ids))
+        if not deployment_ids:
+            return {}
+        placeholders = ", ".join([self.dialect.placeholder] * len(deployment_ids))
+        rows = self._fetch(
+            f"SELECT {SELECT_COLUMNS} FROM deployments WHERE id IN ({placeholders})",
+            tuple(deployment_ids)
+        )
+        deployments = (self._from_row(row) for row in rows)
+        return {deployment.id: deployment for deployment in deployments}
+    
+    def list_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[DeploymentFilter] = None
+    ) -> List[Deployment]:
+        """List all deployments with pagination"""
+        p = self.dialect.placeholder
+        where, params = self._where(filters)
+        rows = self._fetch(
+            f"SELECT {SELECT_COLUMNS} FROM deployments{where} ORDER BY seq LIMIT {p} OFFSET {p}",
+            (*params, limit, skip)
+        )
+        return [self._from_row(row) for row in rows]
+    
+    def list_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Optional[DeploymentFilter] = None
+    ) -> tuple[List[Deployment], Optional[str]]:
+        """List deployments after a cursor in creation order (keyset pagination)"""
+        p = self.dialect.placeholder
+        where, params = self._where(filters, after=decode_cursor(cursor) if cursor else -1)
+        rows = self._fetch(
+            f"SELECT {SELECT_COLUMNS} FROM deployments{where} ORDER BY seq LIMIT {p}",
+            (*params, limit + 1)
+        )
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][0])
+        
+        return [self._from_row(row) for row in rows], next_cursor
+    
+    def scan(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Optional[DeploymentFilter] = None
+    ) -> List[Tuple[str, Deployment]]:
+        """List deployments after a cursor, each paired with the cursor that resumes after it"""
+        p = self.dialect.placeholder
+        where, params = self._where(filters, after=decode_cursor(cursor) if cursor else -1)
+        rows = self._fetch(
+            f"SELECT {SELECT_COLUMNS} FROM deployments{where} ORDER BY seq LIMIT {p}",
+            (*params, limit)
+        )
+        return [(encode_cursor(row[0]), self._from_row(row)) for row in rows]
+    
+    def cursor_after(self, deployment: Deployment) -> str:
+        """Get the cursor that continues after the given deployment"""
+        return encode_cursor(self._fetch(self._sql_seq, (deployment.id,))[0][0])
+    
+    def update(self, deployment: Deployment) -> Deployment:
+        """Update existing deployment"""
+        deployment.updated_at = datetime.utcnow()
+        self._execute(self._sql_update, self._to_update_row(deployment))
+        return deployment
+    
+    def update_many(self, deployments: List[Deployment]) -> List[Deployment]:
+        """Update several existing deployments in a single transaction"""
+        now = datetime.utcnow()
+        for deployment in deployments:
+            deployment.updated_at = now
+        self._execute_many(self._sql_update, [self._to_update_row(d) for d in deployments])
+        return deployments
+    
+    def transition(
+        self,
+        deployment_id: str,
+        target: DeploymentStatus,
+        apply: Callable[[Deployment], None]
+    ) -> Tuple[Deployment, DeploymentStatus]:
+        """
+        Compare-and-set a status change
+        
+        The UPDATE only matches while the row still has the status that was
+        read, so when writers race the database picks the winner and the
+        others get InvalidStateTransitionError.
+        """
+        result = self.transition_many([(deployment_id, target, apply)])[0]
+        if isinstance(result, ApplicationError):
+            raise result
+        return result
+    
+    def transition_many(self, transitions: Sequence[Transition]) -> List[TransitionResult]:
+        """Apply several compare-and-set status changes in a single transaction"""
+        found = self.get_many(deployment_id for deployment_id, _, _ in transitions)
+        now = datetime.utcnow()
+        results: List[TransitionResult] = []
+        changed = False
+        self.open()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            for deployment_id, target, apply in transitions:
+                deployment = found.get(deployment_id)
+                if deployment is None:
+                    results.append(DeploymentNotFoundError(deployment_id))
+                    continue
+                old_status = DeploymentStatus(deployment.status)
+                if not old_status.can_transition_to(target):
+                    results.append(
+                        InvalidStateTransitionError(deployment_id, old_status.value, target.value)
+                    )
+                    continue
+                apply(deployment)
+                deployment.updated_at = now
+                cursor.execute(
+                    self._sql_update_if_status,
+                    self._to_update_row(deployment) + (old_status.value,)
+                )
+                if cursor.rowcount == 1:
+                    results.append((deployment, old_status))
+                    changed = True
+                    continue
+                # Another writer changed the status since it was read
+                cursor.execute(self._sql_status, (deployment_id,))
+                row = cursor.fetchone()
+                current = row[0] if row else old_status.value
+                results.append(InvalidStateTransitionError(deployment_id, current, target.value))
+            if changed:
+                cursor.execute(self._sql_bump_version)
+        return results
+    
+    def count(self) -> int:
+        """Count total deployments"""
+        return self._fetch(self._sql_count, ())[0][0]
+    
+    def ping(self) -> None:
+        """Check the database answers, raises when it does not"""
+        self._fetch("SELECT 1", ())
+    
+    def count_matching(self, filters: Optional[DeploymentFilter] = None) -> int:
+        """Count deployments matching the filters"""
+        where, params = self._where(filters)
+        return self._fetch(f"SELECT COUNT(*) FROM deployments{where}", params)[0][0]
+    
+    def count_by_status(self, status: DeploymentStatus) -> int:
+        """Count deployments by status"""
+        return self._fetch(self._sql_count_by["status"], (DeploymentStatus(status).value,))[0][0]
+    
+    def count_by_application(self, application: str) -> int:
+        """Count deployments of an application"""
+        return self._fetch(self._sql_count_by["application"], (application,))[0][0]
+    
+    def count_by_environment(self, environment: str) -> int:
+        """Count deployments to an environment"""
+        return self._fetch(self._sql_count_by["environment"], (environment,))[0][0]
+    
+    def _where(
+        self,
+        filters: Optional[DeploymentFilter],
+        after: Optional[int] = None
+    ) -> tuple[str, tuple]:
+        """WHERE clause and parameters selecting the filtered deployments"""
+        p = self.dialect.placeholder
+        clauses = []
+        params: list = []
+        if after is not None:
+            clauses.append(f"seq > {p}")
+            params.append(after)
+        if filters is not None:
+            for condition, value in (
+                (f"application = {p}", filters.application),
+                (f"environment = {p}", filters.environment),
+                (f"status = {p}", filters.status.value if filters.status is not None else None),
+                (f"deployed_by = {p}", filters.deployed_by),
+                (f"created_at >= {p}", self.dialect.to_db(filters.created_since)),
+                (f"created_at < {p}", self.dialect.to_db(filters.created_before)),
+            ):
+                if value is not None:
+                    clauses.append(condition)
+                    params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, tuple(params)
+    
+    def _execute(self, sql: str, params: tuple) -> None:
+        """Run a write and bump the collection version in the same transaction"""
+        self.open()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            cursor.execute(self._sql_bump_version)
+    
+    def _execute_many(self, sql: str, params: List[tuple]) -> None:
+        """Run a batch of writes and bump the collection version in the same transaction"""
+        if not params:
+            return
+        self.open()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(sql, params)
+            cursor.execute(self._sql_bump_version)
+    
+    def _fetch(self, sql: str, params: tuple) -> list:
+        self.open()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+    
+    def _to_row(self, deployment: Deployment) -> tuple:
+        return (
+            deployment.id,
+            deployment.application,
+            deployment.version,
+            deployment.environment,
+            DeploymentStatus(deployment.status).value,
+            self.dialect.to_db(deployment.created_at),
+            self.dialect.to_db(deployment.updated_at),
+            self.dialect.to_db(deployment.completed_at),
+            deployment.error_message,
+            deployment.deployed_by,
+            self.dialect.to_db(deployment.started_at),
+        )
+    
+    def _to_update_row(self, deployment: Deployment) -> tuple:
+        return (
+            DeploymentStatus(deployment.status).value,
+            self.dialect.to_db(deployment.updated_at),
+            self.dialect.to_db(deployment.started_at),
+            self.dialect.to_db(deployment.completed_at),
+            deployment.error_message,
+            deployment.id,
+        )
+    
+    def _from_row(self, row: tuple) -> Deployment:
+        return Deployment(
+            id=row[1],
+            application=row[2],
+            version=row[3],
+            environment=row[4],
+            status=row[5],
+            created_at=self.dialect.from_db(row[6]),
+            updated_at=self.dialect.from_db(row[7]),
+            completed_at=self.dialect.from_db(row[8]),
+            error_message=row[9],
+            deployed_by=row[10],
+            started_at=self.dialect.from_db(row[11]),
+        )
@@ -6,6 +6,7 @@ from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel, Field
 from app.models.deployment import DeploymentStatus
+from app.utils.constants import MAX_BATCH_SIZE
 
 
 class DeploymentCreateRequest(BaseModel):
@@ -27,6 +28,7 @@ class DeploymentResponse(BaseModel):
     status: DeploymentStatus
     created_at: datetime
     updated_at: datetime
+    started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     error_message: Optional[str] = None
     deployed_by: str
@@ -42,3 +44,48 @@ class DeploymentListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
+
+
+class DeploymentBatchCreateRequest(BaseModel):
+    """Request schema for creating several deployments"""
+    
+    deployments: list[DeploymentCreateRequest] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class DeploymentBatchStartRequest(BaseModel):
+    """Request schema for starting several deployments"""
+    
+    ids: list[str] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class DeploymentCompleteItem(BaseModel):
+    """One deployment to complete in a batch"""
+    
+    id: str
+    success: bool = True
+    error: Optional[str] = None
+
+
+class DeploymentBatchCompleteRequest(BaseModel):
+    """Request schema for completing several deployments"""
+    
+    deployments: list[DeploymentCompleteItem] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class DeploymentBatchItemResult(BaseModel):
+    """Outcome of one item of a batch request"""
+    
+    id: str
+    status_code: int
+    deployment: Optional[DeploymentResponse] = None
+    error: Optional[str] = None
+    message: Optional[str] = None
+
+
+class DeploymentBatchResponse(BaseModel):
+    """Response schema for batch requests, results are in request order"""
+    
+    results: list[DeploymentBatchItemResult]
+    succeeded: int
+    failed: int
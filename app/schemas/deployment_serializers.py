@@ -0,0 +1,83 @@
+"""
+Deployment Serializers
+Precompiled JSON serializers for deployment responses
+"""
+from typing import Iterable, List, Optional, Sequence
+from typing_extensions import TypedDict
+from pydantic import TypeAdapter
+from app.models.deployment import Deployment
+
+# Deployments are validated when they are created and updated. Serializing
+# them directly with pydantic-core skips building a DeploymentResponse for
+# every item and a second validation against the endpoint's response_model;
+# DeploymentResponse mirrors the fields of Deployment.
+
+
+class _DeploymentList(TypedDict):
+    deployments: List[Deployment]
+    total: int
+    page: int
+    page_size: int
+    next_cursor: Optional[str]
+
+
+class BatchItemPayload(TypedDict):
+    """One item of a DeploymentBatchResponse"""
+    
+    id: str
+    status_code: int
+    deployment: Optional[Deployment]
+    error: Optional[str]
+    message: Optional[str]
+
+
+class _BatchResult(TypedDict):
+    results: List[BatchItemPayload]
+    succeeded: int
+    failed: int
+
+
+_deployment = Deployment.__pydantic_serializer__
+_deployment_list = TypeAdapter(_DeploymentList)
+_batch_result = TypeAdapter(_BatchResult)
+
+
+def deployment_json(deployment: Deployment) -> bytes:
+    """Serialize one deployment as a DeploymentResponse"""
+    return _deployment.to_json(deployment)
+
+
+def deployment_list_json(
+    deployments: Sequence[Deployment],
+    total: int,
+    page: int,
+    page_size: int,
+    next_cursor: Optional[str],
+    fields: Optional[Iterable[str]] = None
+) -> bytes:
+    """Serialize a page as a DeploymentListResponse, optionally with only some fields"""
+    payload: _DeploymentList = {
+        "deployments": list(deployments),
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "next_cursor": next_cursor,
+    }
+    include = None
+    if fields is not None:
+        include = {key: True for key in payload}
+        include["deployments"] = {"__all__": set(fields)}
+    return _deployment_list.dump_json(payload, include=include)
+
+
+def deployment_fields_json(deployment: Deployment, fields: Iterable[str]) -> bytes:
+    """Serialize only some fields of a deployment"""
+    return _deployment.to_json(deployment, include=set(fields))
+
+
+def batch_result_json(items: List[BatchItemPayload]) -> bytes:
+    """Serialize per-item batch outcomes as a DeploymentBatchResponse"""
+    failed = sum(1 for item in items if item["deployment"] is None)
+    return _batch_result.dump_json(
+        {"results": items, "succeeded": len(items) - failed, "failed": failed}
+    )
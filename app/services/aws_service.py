@@ -2,44 +2,242 @@
 AWS Integration Service
 Handles interactions with AWS services (ECR, ECS, CloudWatch)
 """
+import asyncio
+import functools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
+from app.config import settings
+from app.core.exceptions import ServiceUnavailableError
+from app.services.cache_service import CacheService
+from app.utils.circuit_breaker import CircuitBreaker
 
 logger = logging.getLogger(__name__)
 
+_SERVICES = ("ecs", "ecr", "cloudwatch")
+_THROTTLING_CODES = frozenset({
+    "Throttling", "ThrottlingException", "ThrottledException",
+    "RequestLimitExceeded", "TooManyRequestsException",
+})
+
 
 class AWSService:
-    """Service for AWS operations"""
+    """
+    Service for AWS operations
+    
+    boto3 clients are created once by start(), with connection pools and
+    timeouts from the settings, and shared by all requests (clients are
+    thread-safe). SDK calls block, so they run in a bounded thread pool
+    instead of on the event loop. Responses are cached with a TTL per
+    operation, and concurrent identical lookups share a single SDK call.
+    A circuit breaker per AWS service turns repeated connection errors,
+    throttling and 5xx responses into fast ServiceUnavailableErrors.
+    
+    When AWS access is disabled the methods return placeholder data, so
+    the application runs without boto3 or credentials. `endpoint_url`
+    points the clients at a local stand-in such as moto_server.
+    """
+    
+    def __init__(
+        self,
+        region: str = "us-east-1",
+        enabled: bool = False,
+        endpoint_url: Optional[str] = None,
+        max_pool_connections: int = 10,
+        max_workers: int = 8,
+        connect_timeout_seconds: float = 2.0,
+        read_timeout_seconds: float = 5.0,
+        max_attempts: int = 3,
+        cache_ttls: Optional[Dict[str, float]] = None,
+        cache: Optional[CacheService] = None
+    ):
+        self.region = region
+        self.enabled = enabled
+        self.endpoint_url = endpoint_url
+        self.max_pool_connections = max_pool_connections
+        self.max_workers = max_workers
+        self.connect_timeout_seconds = connect_timeout_seconds
+        self.read_timeout_seconds = read_timeout_seconds
+        self.max_attempts = max_attempts
+        self.cache_ttls = cache_ttls or {}
+        self.cache = cache or CacheService(name="aws", max_entries=1000)
+        self.breakers = {service: CircuitBreaker(f"aws-{service}") for service in _SERVICES}
+        self._clients: Dict[str, Any] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    def start(self) -> None:
+        """Create the boto3 clients and the worker threads"""
+        if not self.enabled or self._clients:
+            return
+        try:
+            import boto3
+            from botocore.config import Config
+        except ImportError as e:
+            raise RuntimeError("AWS access requires the 'boto3' package") from e
+        
+        config = Config(
+            region_name=self.region,
+            max_pool_connections=self.max_pool_connections,
+            connect_timeout=self.connect_timeout_seconds,
+            read_timeout=self.read_timeout_seconds,
+            # botocore retries throttling and transient errors with jitter
+            retries={"mode": "standard", "max_attempts": self.max_attempts}
+        )
+        # Sessions are not thread-safe, the clients created from one are
+        session = boto3.session.Session()
+        self._clients = {
+            service: session.client(service, config=config, endpoint_url=self.endpoint_url)
+            for service in _SERVICES
+        }
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="aws")
+        logger.info(
+            f"AWS clients created for {self.region}",
+            extra={"endpoint_url": self.endpoint_url, "max_workers": self.max_workers}
+        )
     
-    def __init__(self):
-        # In production, would initialize boto3 clients here
-        pass
+    def close(self) -> None:
+        """Stop the worker threads and close the client connection pools"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        for client in self._clients.values():
+            client.close()
+        self._clients = {}
     
-    def get_ecs_cluster_info(self, cluster_name: str) -> Dict[str, Any]:
+    async def get_ecs_cluster_info(self, cluster_name: str) -> Dict[str, Any]:
         """Get ECS cluster information"""
-        # Placeholder - would use boto3 in production
-        logger.info(f"Fetching ECS cluster info for {cluster_name}")
+        if not self.enabled:
+            return {
+                "cluster_name": cluster_name,
+                "status": "ACTIVE",
+                "running_tasks": 2,
+                "pending_tasks": 0
+            }
+        return await self.cache.get_or_load(
+            f"ecs:cluster:{cluster_name}",
+            lambda: self._call("ecs", self._describe_cluster, cluster_name),
+            self.cache_ttls.get("ecs")
+        )
+    
+    async def get_ecr_image_info(self, repository: str, tag: str) -> Dict[str, Any]:
+        """Get ECR image information"""
+        if not self.enabled:
+            return {
+                "repository": repository,
+                "tag": tag,
+                "digest": "sha256:abc123...",
+                "pushed_at": "2024-01-20T00:00:00Z"
+            }
+        return await self.cache.get_or_load(
+            f"ecr:image:{repository}:{tag}",
+            lambda: self._call("ecr", self._describe_image, repository, tag),
+            self.cache_ttls.get("ecr")
+        )
+    
+    async def get_cloudwatch_metrics(self, namespace: str) -> Dict[str, Any]:
+        """Fetch CloudWatch metrics"""
+        if not self.enabled:
+            return {
+                "namespace": namespace,
+                "metrics": []
+            }
+        return await self.cache.get_or_load(
+            f"cloudwatch:metrics:{namespace}",
+            lambda: self._call("cloudwatch", self._list_metrics, namespace),
+            self.cache_ttls.get("cloudwatch")
+        )
+    
+    async def ping(self) -> None:
+        """Check ECS answers, a cheap call for readiness checks"""
+        if self.enabled:
+            await self._call("ecs", self._list_clusters)
+    
+    async def _call(self, service: str, operation, *args) -> Dict[str, Any]:
+        """Run a blocking SDK operation in the thread pool"""
+        if self._executor is None:
+            raise ServiceUnavailableError(f"AWS {service}")
+        breaker = self.breakers[service]
+        breaker.before_call()
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(
+                self._executor, functools.partial(operation, self._clients[service], *args)
+            )
+        except Exception as e:
+            if not self._is_service_failure(e):
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            logger.warning(f"AWS {service} call failed: {e}")
+            raise ServiceUnavailableError(f"AWS {service}") from e
+        breaker.record_success()
+        return result
+    
+    @staticmethod
+    def _is_service_failure(error: Exception) -> bool:
+        """Whether an SDK error means AWS is unreachable or overloaded"""
+        response = getattr(error, "response", None)
+        if not isinstance(response, dict):
+            # Connection errors and timeouts carry no response
+            return isinstance(error, OSError) or type(error).__module__.startswith("botocore")
+        code = response.get("Error", {}).get("Code")
+        status = response.get("ResponseMetadata", {}).get("HTTPStatusCode") or 0
+        return status >= 500 or code in _THROTTLING_CODES
+    
+    @staticmethod
+    def _list_clusters(client) -> Dict[str, Any]:
+        return client.list_clusters(maxResults=1)
+    
+    @staticmethod
+    def _describe_cluster(client, cluster_name: str) -> Dict[str, Any]:
+        response = client.describe_clusters(clusters=[cluster_name])
+        if not response["clusters"]:
+            reason = response["failures"][0]["reason"] if response.get("failures") else "MISSING"
+            return {"cluster_name": cluster_name, "status": reason, "running_tasks": 0, "pending_tasks": 0}
+        cluster = response["clusters"][0]
         return {
-            "cluster_name": cluster_name,
-            "status": "ACTIVE",
-            "running_tasks": 2,
-            "pending_tasks": 0
+            "cluster_name": cluster["clusterName"],
+            "status": cluster["status"],
+            "running_tasks": cluster.get("runningTasksCount", 0),
+            "pending_tasks": cluster.get("pendingTasksCount", 0)
         }
     
-    def get_ecr_image_info(self, repository: str, tag: str) -> Dict[str, Any]:
-        """Get ECR image information"""
-        logger.info(f"Fetching ECR image info for {repository}:{tag}")
+    @staticmethod
+    def _describe_image(client, repository: str, tag: str) -> Dict[str, Any]:
+        response = client.describe_images(repositoryName=repository, imageIds=[{"imageTag": tag}])
+        image = response["imageDetails"][0]
+        pushed_at = image.get("imagePushedAt")
         return {
             "repository": repository,
             "tag": tag,
-            "digest": "sha256:abc123...",
-            "pushed_at": "2024-01-20T00:00:00Z"
+            "digest": image["imageDigest"],
+            "pushed_at": pushed_at.isoformat() if pushed_at is not None else None
         }
     
-    def get_cloudwatch_metrics(self, namespace: str) -> Dict[str, Any]:
-        """Fetch CloudWatch metrics"""
-        logger.info(f"Fetching CloudWatch metrics from {namespace}")
+    @staticmethod
+    def _list_metrics(client, namespace: str) -> Dict[str, Any]:
+        metrics = []
+        for page in client.get_paginator("list_metrics").paginate(Namespace=namespace):
+            for metric in page["Metrics"]:
+                metrics.append({
+                    "name": metric["MetricName"],
+                    "dimensions": {d["Name"]: d["Value"] for d in metric.get("Dimensions", [])}
+                })
         return {
             "namespace": namespace,
-            "metrics": []
+            "metrics": metrics
         }
+
+
+# Global AWS service instance
+aws_service = AWSService(
+    region=settings.aws_region,
+    enabled=settings.aws_enabled,
+    endpoint_url=settings.aws_endpoint_url,
+    max_pool_connections=settings.aws_max_pool_connections,
+    max_workers=settings.aws_max_workers,
+    connect_timeout_seconds=settings.aws_connect_timeout_seconds,
+    read_timeout_seconds=settings.aws_read_timeout_seconds,
+    max_attempts=settings.aws_max_attempts,
+    cache_ttls=settings.aws_cache_ttl_seconds
+)
@@ -2,67 +2,220 @@
 Cache Service
 In-memory caching for frequently accessed data
 """
-from typing import Any, Optional
-from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional, Union
+from collections import OrderedDict
+import asyncio
+import inspect
 import logging
+import threading
+import time
+from app.metrics.prometheus_metrics import metrics as prom_metrics
+from app.utils.constants import DEFAULT_CACHE_TTL_SECONDS
 
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+_STAT_ATTRS = {
+    "hit": "hits",
+    "miss": "misses",
+    "eviction": "evictions",
+    "expiration": "expirations",
+}
+
 
 class CacheEntry:
     """Cache entry with expiration"""
     
-    def __init__(self, value: Any, ttl_seconds: int = 300):
+    __slots__ = ("value", "expires_at")
+    
+    def __init__(self, value: Any, ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS):
         self.value = value
-        self.expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
+        self.expires_at = time.monotonic() + ttl_seconds
     
-    def is_expired(self) -> bool:
+    def is_expired(self, now: Optional[float] = None) -> bool:
         """Check if cache entry is expired"""
-        return datetime.utcnow() > self.expires_at
+        return (time.monotonic() if now is None else now) > self.expires_at
 
 
 class CacheService:
-    """Simple in-memory cache service"""
+    """
+    Bounded in-memory LRU cache with per-entry TTL
+    
+    Entries expire on a monotonic clock. When the cache is full the least
+    recently used entry is evicted. Expired entries are removed when read
+    and by a small sweep of the oldest entries on every few writes, so no
+    call ever pays for a full scan.
+    
+    The synchronous methods may be called from worker threads, e.g. a
+    service invalidating an entry after a write. get_or_load runs on the
+    event loop; a delete that arrives while a load of the same key is in
+    progress keeps the loaded value out of the cache, since the loader may
+    have read it before the change.
+    """
     
-    def __init__(self):
-        self._cache: dict[str, CacheEntry] = {}
+    def __init__(
+        self,
+        name: str = "default",
+        max_entries: int = 10000,
+        default_ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+        sweep_every: int = 64,
+        sweep_batch: int = 32
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.default_ttl_seconds = default_ttl_seconds
+        self.sweep_every = sweep_every
+        self.sweep_batch = sweep_batch
+        self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        # Keys deleted while a load was in progress
+        self._invalidated: set[str] = set()
+        self._lock = threading.RLock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
-        entry = self._cache.get(key)
+        with self._lock:
+            value = self._lookup(key)
+        return None if value is _MISSING else value
+    
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Set value in cache with TTL"""
+        ttl = self.default_ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._cache[key] = CacheEntry(value, ttl)
+            self._cache.move_to_end(key)
+            
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+                self._record("eviction")
+            
+            self._writes += 1
+            if self._writes % self.sweep_every == 0:
+                self._sweep()
+    
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Union[Any, Awaitable[Any]]],
+        ttl_seconds: Optional[float] = None
+    ) -> Any:
+        """
+        Read-through lookup
         
-        if entry is None:
-            return None
+        On a miss the loader is called and its result cached. Concurrent
+        misses for the same key wait for the first load instead of calling
+        the loader again. Loader exceptions are propagated and not cached.
+        """
+        with self._lock:
+            value = self._lookup(key)
+        if value is not _MISSING:
+            return value
         
-        if entry.is_expired():
-            del self._cache[key]
-            return None
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
         
-        return entry.value
-    
-    def set(self, key: str, value: Any, ttl_seconds: int = 300) -> None:
-        """Set value in cache with TTL"""
-        self._cache[key] = CacheEntry(value, ttl_seconds)
-        logger.debug(f"Cached key: {key} with TTL: {ttl_seconds}s")
+        future = asyncio.get_running_loop().create_future()
+        with self._lock:
+            self._inflight[key] = future
+            self._invalidated.discard(key)
+        try:
+            value = loader()
+            if inspect.isawaitable(value):
+                value = await value
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark the exception retrieved when no other caller was waiting
+            future.exception()
+            raise
+        else:
+            with self._lock:
+                if key not in self._invalidated:
+                    self.set(key, value, ttl_seconds)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                del self._inflight[key]
+                self._invalidated.discard(key)
     
     def delete(self, key: str) -> None:
         """Delete key from cache"""
-        if key in self._cache:
-            del self._cache[key]
+        with self._lock:
+            self._cache.pop(key, None)
+            if key in self._inflight:
+                self._invalidated.add(key)
     
     def clear(self) -> None:
         """Clear all cache entries"""
-        self._cache.clear()
-        logger.info("Cache cleared")
+        with self._lock:
+            self._cache.clear()
+            self._invalidated.update(self._inflight)
+        logger.info(f"Cache {self.name} cleared")
     
     def cleanup_expired(self) -> int:
         """Remove expired entries and return count"""
-        expired_keys = [
-            key for key, entry in self._cache.items()
-            if entry.is_expired()
-        ]
+        now = time.monotonic()
+        with self._lock:
+            expired_keys = [
+                key for key, entry in self._cache.items()
+                if entry.is_expired(now)
+            ]
+            
+            for key in expired_keys:
+                del self._cache[key]
+                self._record("expiration")
         
-        for key in expired_keys:
+        return len(expired_keys)
+    
+    def stats(self) -> dict[str, int]:
+        """Get cache statistics"""
+        return {
+            "entries": len(self._cache),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+    
+    def _lookup(self, key: str) -> Any:
+        entry = self._cache.get(key)
+        
+        if entry is None:
+            self._record("miss")
+            return _MISSING
+        
+        if entry.is_expired():
             del self._cache[key]
+            self._record("expiration")
+            self._record("miss")
+            return _MISSING
         
-        return len(expired_keys)
+        self._cache.move_to_end(key)
+        self._record("hit")
+        return entry.value
+    
+    def _sweep(self) -> None:
+        """Expire a bounded number of the least recently used entries"""
+        now = time.monotonic()
+        expired_keys = []
+        for index, (key, entry) in enumerate(self._cache.items()):
+            if index >= self.sweep_batch:
+                break
+            if entry.is_expired(now):
+                expired_keys.append(key)
+        
+        for key in expired_keys:
+            del self._cache[key]
+            self._record("expiration")
+    
+    def _record(self, event: str) -> None:
+        attr = _STAT_ATTRS[event]
+        setattr(self, attr, getattr(self, attr) + 1)
+        prom_metrics.record_cache_event(self.name, event)
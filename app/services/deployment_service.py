@@ -3,20 +3,57 @@ Deployment Service
 Business logic for deployment operations
 """
 import logging
-from typing import List
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from datetime import datetime
-from app.models.deployment import Deployment, DeploymentStatus
-from app.repositories.deployment_repository import DeploymentRepository
-from app.core.exceptions import DeploymentNotFoundError, DeploymentFailedError
+from app.models.deployment import Deployment, DeploymentFilter, DeploymentStatus
+from app.repositories.deployment_repository import DeploymentRepository, Transition, decode_cursor
+from app.repositories.sql_deployment_repository import SQLDeploymentRepository
+from app.services.cache_service import CacheService
+from app.services.notification_service import NotificationService
+from app.services.event_bus import (
+    DeploymentEventBus,
+    EVENT_COMPLETED,
+    EVENT_CREATED,
+    EVENT_STARTED,
+    EVENT_UPDATED
+)
+from app.metrics.deployment_aggregator import DeploymentMetricsAggregator
+from app.utils.constants import EXPORT_BATCH_SIZE
+from app.core.exceptions import (
+    ApplicationError,
+    DeploymentNotFoundError,
+    DeploymentFailedError,
+    ValidationError
+)
 
 logger = logging.getLogger(__name__)
 
+# Per-item outcome of a batch operation: the requested ID and the
+# updated deployment or the error of that item
+BatchResult = Tuple[str, Union[Deployment, ApplicationError]]
+
+
+def deployment_cache_key(deployment_id: str) -> str:
+    """Cache key of a single deployment"""
+    return f"deployment:{deployment_id}"
+
 
 class DeploymentService:
     """Service for deployment business logic"""
     
-    def __init__(self, repository: DeploymentRepository):
+    def __init__(
+        self,
+        repository: Union[DeploymentRepository, SQLDeploymentRepository],
+        cache: Optional[CacheService] = None,
+        aggregator: Optional[DeploymentMetricsAggregator] = None,
+        events: Optional[DeploymentEventBus] = None,
+        notifications: Optional[NotificationService] = None
+    ):
         self.repository = repository
+        self.cache = cache
+        self.aggregator = aggregator
+        self.events = events
+        self.notifications = notifications
     
     def create_deployment(
         self,
@@ -30,16 +67,26 @@ class DeploymentService:
             f"Creating deployment for {application} v{version} to {environment}"
         )
         
-        deployment = Deployment(
-            id="",  # Will be generated by repository
-            application=application,
-            version=version,
-            environment=environment,
-            deployed_by=deployed_by,
-            status=DeploymentStatus.PENDING
-        )
+        deployment = self._new_deployment(application, version, environment, deployed_by)
+        deployment = self.repository.create(deployment)
+        self._record_created(deployment)
+        return deployment
+    
+    def create_deployments(self, items: Sequence[Dict[str, str]]) -> List[Deployment]:
+        """
+        Create several deployments with one repository write
         
-        return self.repository.create(deployment)
+        Each item holds the keyword arguments of create_deployment. The
+        batch is written in a single transaction, so it is created entirely
+        or not at all.
+        """
+        logger.info(f"Creating {len(items)} deployments")
+        deployments = self.repository.create_many(
+            [self._new_deployment(**item) for item in items]
+        )
+        for deployment in deployments:
+            self._record_created(deployment)
+        return deployments
     
     def get_deployment(self, deployment_id: str) -> Deployment:
         """Get deployment by ID"""
@@ -48,34 +95,230 @@ class DeploymentService:
             raise DeploymentNotFoundError(deployment_id)
         return deployment
     
-    def list_deployments(self, page: int = 1, page_size: int = 20) -> tuple[List[Deployment], int]:
-        """List deployments with pagination"""
-        skip = (page - 1) * page_size
-        deployments = self.repository.list_all(skip=skip, limit=page_size)
-        total = self.repository.count()
-        return deployments, total
+    def get_revision(self, deployment_id: str) -> Tuple[datetime, DeploymentStatus]:
+        """Last update time and status of a deployment, for conditional requests"""
+        revision = self.repository.get_revision(deployment_id)
+        if revision is None:
+            raise DeploymentNotFoundError(deployment_id)
+        return revision
+    
+    def collection_version(self) -> str:
+        """Token that changes with every deployment write, for conditional list requests"""
+        return self.repository.collection_version()
     
-    def start_deployment(self, deployment_id: str) -> Deployment:
-        """Start a deployment"""
-        deployment = self.get_deployment(deployment_id)
+    def list_deployments(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        filters: Optional[DeploymentFilter] = None
+    ) -> tuple[List[Deployment], int, Optional[str]]:
+        """
+        List deployments with pagination
         
-        logger.info(f"Starting deployment {deployment_id}")
-        deployment.status = DeploymentStatus.IN_PROGRESS
+        When a cursor is given the page number is ignored and the page
+        continues after the cursor, so deep pages cost the same as the first.
+        Returns the matching deployments, their total count and the next
+        page cursor.
+        """
+        if cursor:
+            deployments, next_cursor = self.repository.list_page(
+                cursor=cursor, limit=page_size, filters=filters
+            )
+        else:
+            skip = (page - 1) * page_size
+            deployments = self.repository.list_all(skip=skip, limit=page_size + 1, filters=filters)
+            next_cursor = None
+            if len(deployments) > page_size:
+                deployments = deployments[:page_size]
+                next_cursor = self.repository.cursor_after(deployments[-1])
+        total = self.repository.count_matching(filters)
+        return deployments, total, next_cursor
+    
+    def export_deployments(
+        self,
+        filters: Optional[DeploymentFilter] = None,
+        cursor: Optional[str] = None,
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> Iterator[List[Tuple[str, Deployment]]]:
+        """
+        Iterate over every matching deployment in creation order
         
-        return self.repository.update(deployment)
+        Yields batches of (cursor, deployment) pairs, where the cursor
+        resumes after that deployment. Only one batch is held at a time,
+        so memory does not grow with the history. An invalid cursor is
+        rejected here, before iteration starts.
+        """
+        if cursor:
+            decode_cursor(cursor)
+        return self._export_batches(filters, cursor, batch_size)
+    
+    def start_deployment(self, deployment_id: str) -> Deployment:
+        """Start a pending deployment"""
+        logger.info(f"Starting deployment {deployment_id}")
+        deployment, old_status = self.repository.transition(
+            deployment_id,
+            DeploymentStatus.IN_PROGRESS,
+            lambda d: self._mark_started(d, datetime.utcnow())
+        )
+        self._record_transition(deployment, old_status)
+        return deployment
+    
+    def start_deployments(self, deployment_ids: Sequence[str]) -> List[BatchResult]:
+        """Start several pending deployments with one repository write"""
+        now = datetime.utcnow()
+        logger.info(f"Starting {len(deployment_ids)} deployments")
+        return self._transition_many([
+            (deployment_id, DeploymentStatus.IN_PROGRESS, lambda d: self._mark_started(d, now))
+            for deployment_id in deployment_ids
+        ])
     
     def complete_deployment(self, deployment_id: str, success: bool = True, error: str = None) -> Deployment:
-        """Complete a deployment"""
-        deployment = self.get_deployment(deployment_id)
-        
-        deployment.status = DeploymentStatus.SUCCESS if success else DeploymentStatus.FAILED
-        deployment.completed_at = datetime.utcnow()
-        
-        if error:
-            deployment.error_message = error
+        """Complete a deployment in progress"""
+        deployment, old_status = self.repository.transition(
+            deployment_id,
+            self._completed_status(success),
+            lambda d: self._mark_completed(d, datetime.utcnow(), success, error)
+        )
         
         logger.info(
             f"Deployment {deployment_id} completed with status {deployment.status}"
         )
         
-        return self.repository.update(deployment)
+        self._record_transition(deployment, old_status)
+        return deployment
+    
+    def complete_deployments(
+        self,
+        items: Sequence[Tuple[str, bool, Optional[str]]]
+    ) -> List[BatchResult]:
+        """Complete several deployments, given as (id, success, error), with one repository write"""
+        now = datetime.utcnow()
+        logger.info(f"Completing {len(items)} deployments")
+        return self._transition_many([
+            (
+                deployment_id,
+                self._completed_status(success),
+                lambda d, s=success, e=error: self._mark_completed(d, now, s, e)
+            )
+            for deployment_id, success, error in items
+        ])
+    
+    def _export_batches(
+        self,
+        filters: Optional[DeploymentFilter],
+        cursor: Optional[str],
+        batch_size: int
+    ) -> Iterator[List[Tuple[str, Deployment]]]:
+        while True:
+            entries = self.repository.scan(cursor=cursor, limit=batch_size, filters=filters)
+            if entries:
+                yield entries
+            if len(entries) < batch_size:
+                return
+            cursor = entries[-1][0]
+    
+    def _transition_many(self, transitions: Sequence[Transition]) -> List[BatchResult]:
+        """
+        Apply a state change to several deployments
+        
+        Missing, repeated and wrongly placed IDs fail individually; every
+        other deployment is changed and written back in one repository call.
+        """
+        unique: List[Transition] = []
+        seen = set()
+        for transition in transitions:
+            if transition[0] not in seen:
+                seen.add(transition[0])
+                unique.append(transition)
+        outcomes = iter(self.repository.transition_many(unique))
+        
+        results: List[BatchResult] = []
+        seen.clear()
+        for deployment_id, _, _ in transitions:
+            if deployment_id in seen:
+                error = ValidationError(f"Deployment {deployment_id} appears more than once")
+                results.append((deployment_id, error))
+                continue
+            seen.add(deployment_id)
+            outcome = next(outcomes)
+            if isinstance(outcome, ApplicationError):
+                results.append((deployment_id, outcome))
+                continue
+            deployment, old_status = outcome
+            self._record_transition(deployment, old_status)
+            results.append((deployment_id, deployment))
+        return results
+    
+    @staticmethod
+    def _new_deployment(
+        application: str,
+        version: str,
+        environment: str,
+        deployed_by: str = "system"
+    ) -> Deployment:
+        return Deployment(
+            id="",  # Will be generated by repository
+            application=application,
+            version=version,
+            environment=environment,
+            deployed_by=deployed_by,
+            status=DeploymentStatus.PENDING
+        )
+    
+    @staticmethod
+    def _completed_status(success: bool) -> DeploymentStatus:
+        return DeploymentStatus.SUCCESS if success else DeploymentStatus.FAILED
+    
+    @staticmethod
+    def _mark_started(deployment: Deployment, now: datetime) -> None:
+        deployment.status = DeploymentStatus.IN_PROGRESS
+        deployment.started_at = now
+    
+    @staticmethod
+    def _mark_completed(deployment: Deployment, now: datetime, success: bool, error: Optional[str]) -> None:
+        deployment.status = DeploymentStatus.SUCCESS if success else DeploymentStatus.FAILED
+        deployment.completed_at = now
+        if error:
+            deployment.error_message = error
+    
+    def _record_created(self, deployment: Deployment) -> None:
+        """Propagate a new deployment to caches, aggregates and watchers"""
+        self._invalidate(deployment.id)
+        if self.aggregator is not None:
+            self.aggregator.record_created(deployment)
+        if self.events is not None:
+            self.events.publish(EVENT_CREATED, deployment)
+    
+    def _record_transition(self, deployment: Deployment, old_status: DeploymentStatus) -> None:
+        """Propagate a state change to caches, aggregates, watchers and notifications"""
+        self._invalidate(deployment.id)
+        if self.aggregator is not None:
+            self.aggregator.record_transition(deployment, old_status)
+        status = DeploymentStatus(deployment.status)
+        if self.events is not None:
+            if status == DeploymentStatus.IN_PROGRESS:
+                event_type = EVENT_STARTED
+            elif status in (DeploymentStatus.SUCCESS, DeploymentStatus.FAILED):
+                event_type = EVENT_COMPLETED
+            else:
+                event_type = EVENT_UPDATED
+            self.events.publish(event_type, deployment)
+        if self.notifications is not None:
+            # Only queued here, delivery happens in the background
+            if status == DeploymentStatus.IN_PROGRESS:
+                self.notifications.send_deployment_started(
+                    deployment.id, deployment.application, deployment.environment
+                )
+            elif status in (DeploymentStatus.SUCCESS, DeploymentStatus.FAILED):
+                self.notifications.send_deployment_completed(
+                    deployment.id,
+                    deployment.application,
+                    deployment.environment,
+                    success=status == DeploymentStatus.SUCCESS
+                )
+    
+    def _invalidate(self, deployment_id: str) -> None:
+        """Drop cached reads affected by a deployment change"""
+        if self.cache is not None:
+            self.cache.delete(deployment_cache_key(deployment_id))
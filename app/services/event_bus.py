@@ -0,0 +1,198 @@
+"""
+Deployment Event Bus
+In-process publish/subscribe for deployment lifecycle events
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+from app.config import settings
+from app.metrics.prometheus_metrics import metrics as prom_metrics
+from app.models.deployment import Deployment
+from app.schemas.deployment_serializers import deployment_json
+
+logger = logging.getLogger(__name__)
+
+EVENT_CREATED = "created"
+EVENT_STARTED = "started"
+EVENT_COMPLETED = "completed"
+EVENT_UPDATED = "updated"
+
+
+class DeploymentEvent:
+    """A deployment state change, encoded once and shared by every subscriber"""
+    
+    __slots__ = ("type", "application", "environment", "deployment_id", "data", "_sse", "_text")
+    
+    def __init__(self, event_type: str, deployment: Deployment):
+        self.type = event_type
+        self.application = deployment.application
+        self.environment = deployment.environment
+        self.deployment_id = deployment.id
+        self.data = b'{"type":"' + event_type.encode() + b'","deployment":' + deployment_json(deployment) + b"}"
+        self._sse: Optional[bytes] = None
+        self._text: Optional[str] = None
+    
+    @property
+    def sse(self) -> bytes:
+        """Server-Sent Events frame of the event"""
+        if self._sse is None:
+            self._sse = b"event: " + self.type.encode() + b"\ndata: " + self.data + b"\n\n"
+        return self._sse
+    
+    @property
+    def text(self) -> str:
+        """JSON of the event as text, for WebSocket text frames"""
+        if self._text is None:
+            self._text = self.data.decode()
+        return self._text
+
+
+class SlowConsumerError(Exception):
+    """Raised to a subscriber whose queue overflowed"""
+
+
+class Subscription:
+    """Bounded queue of events for one watcher"""
+    
+    def __init__(
+        self,
+        bus: "DeploymentEventBus",
+        queue_size: int,
+        application: Optional[str] = None,
+        environment: Optional[str] = None,
+        deployment_id: Optional[str] = None
+    ):
+        self.bus = bus
+        self.application = application
+        self.environment = environment
+        self.deployment_id = deployment_id
+        self.overflowed = False
+        self._queue: "asyncio.Queue[DeploymentEvent]" = asyncio.Queue(maxsize=queue_size)
+    
+    async def get(self) -> DeploymentEvent:
+        """Wait for the next event, SlowConsumerError once the queue overflowed"""
+        event = await self._queue.get()
+        if self.overflowed:
+            raise SlowConsumerError()
+        return event
+    
+    def drain(self) -> List[DeploymentEvent]:
+        """Take every queued event without waiting"""
+        if self.overflowed:
+            raise SlowConsumerError()
+        events = []
+        while not self._queue.empty():
+            events.append(self._queue.get_nowait())
+        return events
+    
+    def close(self) -> None:
+        """Stop receiving events"""
+        self.bus.unsubscribe(self)
+    
+    def _offer(self, event: DeploymentEvent) -> bool:
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+
+class DeploymentEventBus:
+    """
+    Fan-out of deployment events to subscribers
+    
+    Subscribers are indexed by their filter, so publishing looks up at
+    most five subscriber sets instead of testing every watcher. Each event
+    is serialized once and the same bytes are queued for every matching
+    subscriber; publishing never waits. A subscriber whose queue is full
+    is a slow consumer: it is unsubscribed and its next get() raises
+    SlowConsumerError, so the endpoint can disconnect it.
+    """
+    
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: Dict[Tuple[Optional[str], Optional[str]], Set[Subscription]] = defaultdict(set)
+        self._by_deployment: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._count = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    @property
+    def subscriber_count(self) -> int:
+        return self._count
+    
+    def subscribe(
+        self,
+        application: Optional[str] = None,
+        environment: Optional[str] = None,
+        deployment_id: Optional[str] = None,
+        queue_size: Optional[int] = None
+    ) -> Subscription:
+        """Register a watcher; call close() on the subscription when done"""
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(
+            self, queue_size or self.queue_size, application, environment, deployment_id
+        )
+        index, key = self._index_key(subscription)
+        index[key].add(subscription)
+        self._count += 1
+        prom_metrics.event_subscribers.inc()
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a watcher, a no-op when it is already gone"""
+        index, key = self._index_key(subscription)
+        subscribers = index.get(key)
+        if subscribers is None or subscription not in subscribers:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del index[key]
+        self._count -= 1
+        prom_metrics.event_subscribers.dec()
+    
+    def publish(self, event_type: str, deployment: Deployment) -> None:
+        """Queue an event for every matching subscriber"""
+        if not self._count:
+            return
+        event = DeploymentEvent(event_type, deployment)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._dispatch(event)
+        elif self._loop is not None and not self._loop.is_closed():
+            # Published from a worker thread, queues belong to the event loop
+            self._loop.call_soon_threadsafe(self._dispatch, event)
+    
+    def _dispatch(self, event: DeploymentEvent) -> None:
+        prom_metrics.record_event_published(event.type)
+        groups = [
+            self._subscribers.get((None, None)),
+            self._subscribers.get((event.application, None)),
+            self._subscribers.get((None, event.environment)),
+            self._subscribers.get((event.application, event.environment)),
+            self._by_deployment.get(event.deployment_id),
+        ]
+        slow = []
+        for subscribers in groups:
+            if subscribers:
+                for subscription in subscribers:
+                    if not subscription._offer(event):
+                        slow.append(subscription)
+        for subscription in slow:
+            subscription.overflowed = True
+            self.unsubscribe(subscription)
+            prom_metrics.event_slow_consumers.inc()
+        if slow:
+            logger.warning(f"Disconnecting {len(slow)} slow event subscribers")
+    
+    def _index_key(self, subscription: Subscription) -> Tuple[dict, Any]:
+        if subscription.deployment_id is not None:
+            return self._by_deployment, subscription.deployment_id
+        return self._subscribers, (subscription.application, subscription.environment)
+
+
+# Global event bus instance
+deployment_events = DeploymentEventBus(queue_size=settings.event_queue_size)
@@ -2,55 +2,41 @@
 Metrics Service
 Business logic for metrics collection and aggregation
 """
-import psutil
-from datetime import datetime
 from app.models.metrics import SystemMetrics, ApplicationMetrics, DeploymentMetrics
-from app.repositories.metrics_repository import MetricsRepository
+from app.repositories.metrics_repository import MetricsRepository, metrics_repository
+from app.metrics.system_sampler import SystemMetricsSampler, system_sampler
+from app.metrics.deployment_aggregator import DeploymentMetricsAggregator, deployment_aggregator
 
 
 class MetricsService:
     """Service for metrics operations"""
     
-    def __init__(self):
-        self.repository = MetricsRepository()
+    def __init__(
+        self,
+        sampler: SystemMetricsSampler = system_sampler,
+        aggregator: DeploymentMetricsAggregator = deployment_aggregator,
+        repository: MetricsRepository = metrics_repository
+    ):
+        self.repository = repository
+        self.sampler = sampler
+        self.aggregator = aggregator
     
     def get_system_metrics(self) -> SystemMetrics:
-        """Collect current system metrics"""
-        return SystemMetrics(
-            cpu_usage_percent=psutil.cpu_percent(interval=1),
-            memory_usage_percent=psutil.virtual_memory().percent,
-            disk_usage_percent=psutil.disk_usage('/').percent,
-            timestamp=datetime.utcnow()
-        )
+        """Get the latest system metrics snapshot from the background sampler"""
+        return self.sampler.latest()
     
     def get_application_metrics(self) -> ApplicationMetrics:
         """Get application metrics"""
         return self.repository.get_application_metrics()
     
-    def get_deployment_metrics(self, deployment_repository) -> DeploymentMetrics:
-        """Calculate deployment metrics"""
-        from app.models.deployment import DeploymentStatus
-        
-        total = deployment_repository.count()
-        successful = deployment_repository.count_by_status(DeploymentStatus.SUCCESS)
-        failed = deployment_repository.count_by_status(DeploymentStatus.FAILED)
-        
-        return DeploymentMetrics(
-            total_deployments=total,
-            successful_deployments=successful,
-            failed_deployments=failed,
-            average_deployment_time_seconds=0.0,  # Would calculate from actual data
-            timestamp=datetime.utcnow()
-        )
+    def get_deployment_metrics(self) -> DeploymentMetrics:
+        """Get incrementally maintained deployment metrics"""
+        return self.aggregator.snapshot()
     
-    def record_request(self) -> None:
-        """Record a request"""
-        self.repository.increment_request_count()
+    def request_started(self) -> None:
+        """Record a request that is being handled"""
+        self.repository.request_started()
     
-    def record_error(self) -> None:
-        """Record an error"""
-        self.repository.increment_error_count()
-    
-    def record_response_time(self, time_ms: float) -> None:
-        """Record response time"""
-        self.repository.record_response_time(time_ms)
+    def record_request(self, method: str, route: str, status_code: int, duration_ms: float) -> None:
+        """Record a completed request, server errors count as errors"""
+        self.repository.record_request(f"{method} {route}", duration_ms, status_code >= 500)
@@ -0,0 +1,345 @@
+"""
+Notification Dispatcher
+Asynchronous, batched delivery of notifications to external channels
+"""
+import asyncio
+import json
+import logging
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import settings
+from app.metrics.prometheus_metrics import metrics as prom_metrics
+from app.utils.retry import JITTER_FULL, backoff_delay
+
+logger = logging.getLogger(__name__)
+
+DROP_QUEUE_FULL = "queue_full"
+DROP_COALESCED = "coalesced"
+DROP_FAILED = "failed"
+DROP_REJECTED = "rejected"
+DROP_SHUTDOWN = "shutdown"
+
+
+class Notification:
+    """A message for one channel"""
+    
+    __slots__ = ("channel", "payload", "key", "queued_at")
+    
+    def __init__(self, channel: str, payload: Dict[str, Any], key: Optional[str] = None):
+        self.channel = channel
+        self.payload = payload
+        # Queued notifications with the same key coalesce into the newest one
+        self.key = key
+        self.queued_at = time.monotonic()
+
+
+class DeliveryError(Exception):
+    """A channel could not deliver a batch"""
+    
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class LogChannel:
+    """Channel without an endpoint, writes notifications to the log"""
+    
+    async def deliver(self, channel: str, payloads: List[Dict[str, Any]]) -> None:
+        for payload in payloads:
+            logger.info(f"Notification [{channel}]: {payload.get('text', payload)}")
+
+
+class WebhookChannel:
+    """
+    Channel that POSTs every batch as one JSON document to an HTTP endpoint
+    
+    The body is {"channel": ..., "notifications": [...]}. Connection
+    errors, 429 and 5xx responses are retryable, other responses are not.
+    """
+    
+    def __init__(self, url: str, timeout_seconds: float = 5.0):
+        self.url = url
+        self.timeout_seconds = timeout_seconds
+    
+    async def deliver(self, channel: str, payloads: List[Dict[str, Any]]) -> None:
+        body = json.dumps({"channel": channel, "notifications": payloads}).encode()
+        await asyncio.to_thread(self._post, body)
+    
+    def _post(self, body: bytes) -> None:
+        request = urllib.request.Request(
+            self.url,
+            data=body,
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout_seconds) as response:
+                response.read()
+        except urllib.error.HTTPError as exc:
+            raise DeliveryError(
+                f"{self.url} returned {exc.code}",
+                retryable=exc.code == 429 or exc.code >= 500
+            ) from exc
+        except OSError as exc:
+            raise DeliveryError(f"{self.url} unreachable: {exc}") from exc
+
+
+class RateLimiter:
+    """Token bucket allowing `rate` acquisitions per second, `burst` at once"""
+    
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+    
+    async def acquire(self) -> None:
+        """Take a token, waiting until one is available"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        # Reserve the token up front, so concurrent callers queue up in order
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
+class NotificationDispatcher:
+    """
+    Background delivery of notifications
+    
+    submit() only puts the notification on a bounded queue and never
+    waits; when the queue is full the notification is dropped. A collector
+    task groups queued notifications per channel: a batch is sent when
+    its window has passed since its first notification, or when it is
+    full. Within a batch, notifications with the same key are coalesced
+    and only the newest is sent. A pool of workers delivers the batches,
+    at most `rate_limits[channel]` batches per second per channel,
+    retrying retryable failures with full-jitter exponential backoff.
+    """
+    
+    def __init__(
+        self,
+        channels: Dict[str, Any],
+        queue_size: int = 1000,
+        workers: int = 4,
+        batch_window_seconds: float = 1.0,
+        max_batch_size: int = 50,
+        rate_limits: Optional[Dict[str, float]] = None,
+        max_attempts: int = 5,
+        retry_base_seconds: float = 0.5,
+        retry_max_seconds: float = 30.0
+    ):
+        self.channels = channels
+        self.workers = workers
+        self.batch_window_seconds = batch_window_seconds
+        self.max_batch_size = max_batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self._limiters = {
+            channel: RateLimiter(rate)
+            for channel, rate in (rate_limits or {}).items()
+            if channel in channels and rate > 0
+        }
+        self._queue: "asyncio.Queue[Notification]" = asyncio.Queue(maxsize=queue_size)
+        # Full batches wait here for a worker; when it fills up the
+        # collector stops reading and new notifications are dropped
+        self._batches: "asyncio.Queue[Tuple[str, List[Notification]]]" = asyncio.Queue(maxsize=2 * workers)
+        self._pending: Dict[str, "OrderedDict[Any, Notification]"] = {}
+        self._deadlines: Dict[str, float] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def submit(self, notification: Notification) -> bool:
+        """Queue a notification, False when it was dropped"""
+        if notification.channel not in self.channels:
+            self._drop(notification.channel, DROP_REJECTED)
+            return False
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if self._loop is None or running is self._loop:
+            return self._enqueue(notification)
+        if self._loop.is_closed():
+            return False
+        # Submitted from a worker thread, the queue belongs to the event loop
+        self._loop.call_soon_threadsafe(self._enqueue, notification)
+        return True
+    
+    async def start(self) -> None:
+        """Start the collector and the delivery workers"""
+        if self._tasks:
+            return
+        self._loop = asyncio.get_running_loop()
+        # Queues bind to the first loop that waits on them; start with fresh
+        # ones, keeping what was submitted before the dispatcher started
+        queued = self._queue
+        self._queue = asyncio.Queue(maxsize=queued.maxsize)
+        while not queued.empty():
+            self._queue.put_nowait(queued.get_nowait())
+        self._batches = asyncio.Queue(maxsize=self._batches.maxsize)
+        self._tasks.append(asyncio.create_task(self._collect(), name="notification-collector"))
+        for index in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._work(), name=f"notification-worker-{index}"))
+        logger.info(f"Notification dispatcher started with {self.workers} workers")
+    
+    async def stop(self, timeout_seconds: float = 5.0) -> None:
+        """Deliver what is queued, waiting at most `timeout_seconds`, then stop"""
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self._drain(), timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.warning("Notification queue not drained before shutdown")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+        
+        while not self._queue.empty():
+            self._drop(self._queue.get_nowait().channel, DROP_SHUTDOWN)
+        for channel, pending in self._pending.items():
+            self._drop(channel, DROP_SHUTDOWN, len(pending))
+        while not self._batches.empty():
+            channel, batch = self._batches.get_nowait()
+            self._drop(channel, DROP_SHUTDOWN, len(batch))
+        self._pending.clear()
+        self._deadlines.clear()
+    
+    def _enqueue(self, notification: Notification) -> bool:
+        try:
+            self._queue.put_nowait(notification)
+            return True
+        except asyncio.QueueFull:
+            self._drop(notification.channel, DROP_QUEUE_FULL)
+            return False
+    
+    async def _collect(self) -> None:
+        while True:
+            try:
+                notification = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = None
+                if self._deadlines:
+                    timeout = max(min(self._deadlines.values()) - time.monotonic(), 0.0)
+                try:
+                    notification = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    notification = None
+            if notification is not None:
+                self._add(notification)
+                self._queue.task_done()
+            await self._flush(time.monotonic())
+    
+    def _add(self, notification: Notification) -> None:
+        channel = notification.channel
+        pending = self._pending.get(channel)
+        if pending is None:
+            pending = self._pending[channel] = OrderedDict()
+            # The window starts when the collector sees the notification, so
+            # a backlog is still sent in full batches
+            self._deadlines[channel] = time.monotonic() + self.batch_window_seconds
+        key = notification.key if notification.key is not None else id(notification)
+        if pending.pop(key, None) is not None:
+            self._drop(channel, DROP_COALESCED)
+        pending[key] = notification
+        if len(pending) >= self.max_batch_size:
+            self._deadlines[channel] = 0.0
+    
+    async def _flush(self, now: Optional[float] = None) -> None:
+        """Hand batches whose window has passed (every batch when now is None) to the workers"""
+        due = [
+            channel for channel, deadline in self._deadlines.items()
+            if now is None or deadline <= now
+        ]
+        for channel in due:
+            # Another flush may have taken it while this one waited
+            pending = self._pending.pop(channel, None)
+            if pending is None:
+                continue
+            del self._deadlines[channel]
+            await self._batches.put((channel, list(pending.values())))
+    
+    async def _drain(self) -> None:
+        await self._queue.join()
+        await self._flush()
+        await self._batches.join()
+    
+    async def _work(self) -> None:
+        while True:
+            channel, batch = await self._batches.get()
+            try:
+                await self._deliver(channel, batch)
+            except Exception:
+                logger.exception(f"Notification delivery to {channel} failed")
+                self._drop(channel, DROP_FAILED, len(batch))
+            finally:
+                self._batches.task_done()
+    
+    async def _deliver(self, channel: str, batch: List[Notification]) -> None:
+        payloads = [notification.payload for notification in batch]
+        limiter = self._limiters.get(channel)
+        for attempt in range(1, self.max_attempts + 1):
+            if limiter is not None:
+                await limiter.acquire()
+            try:
+                await self.channels[channel].deliver(channel, payloads)
+            except DeliveryError as exc:
+                if not exc.retryable:
+                    logger.error(f"Notification batch rejected by {channel}: {exc}")
+                    self._drop(channel, DROP_REJECTED, len(batch))
+                    return
+                if attempt == self.max_attempts:
+                    logger.error(f"Notification batch to {channel} failed after {attempt} attempts: {exc}")
+                    self._drop(channel, DROP_FAILED, len(batch))
+                    return
+                delay = backoff_delay(
+                    attempt, self.retry_base_seconds,
+                    max_delay_seconds=self.retry_max_seconds, jitter=JITTER_FULL
+                )
+                logger.warning(
+                    f"Attempt {attempt}/{self.max_attempts} to notify {channel} failed: {exc}. "
+                    f"Retrying in {delay:.2f}s..."
+                )
+                await asyncio.sleep(delay)
+            else:
+                now = time.monotonic()
+                prom_metrics.record_notifications_delivered(
+                    channel, [now - notification.queued_at for notification in batch]
+                )
+                return
+    
+    @staticmethod
+    def _drop(channel: str, reason: str, count: int = 1) -> None:
+        prom_metrics.record_notifications_dropped(channel, reason, count)
+
+
+def build_channels(channels: List[str], webhook_urls: Dict[str, str], timeout_seconds: float) -> Dict[str, Any]:
+    """Webhook channels for the configured URLs, log channels for the rest"""
+    return {
+        channel: WebhookChannel(webhook_urls[channel], timeout_seconds)
+        if channel in webhook_urls else LogChannel()
+        for channel in channels
+    }
+
+
+# Global notification dispatcher instance
+notification_dispatcher = NotificationDispatcher(
+    build_channels(
+        settings.notification_channels,
+        settings.notification_webhook_urls,
+        settings.notification_timeout_seconds
+    ),
+    queue_size=settings.notification_queue_size,
+    workers=settings.notification_workers,
+    batch_window_seconds=settings.notification_batch_window_seconds,
+    max_batch_size=settings.notification_max_batch_size,
+    rate_limits=settings.notification_rate_limits,
+    max_attempts=settings.notification_max_attempts
+)
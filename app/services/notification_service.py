@@ -3,8 +3,14 @@ Notification Service
 Handles notifications for deployment events
 """
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
 from enum import Enum
+from app.config import settings
+from app.services.notification_dispatcher import (
+    Notification,
+    NotificationDispatcher,
+    notification_dispatcher
+)
 
 logger = logging.getLogger(__name__)
 
@@ -17,10 +23,24 @@ class NotificationType(str, Enum):
 
 
 class NotificationService:
-    """Service for sending notifications"""
+    """
+    Service for sending notifications
     
-    def __init__(self):
-        self.enabled = True
+    Notifications are handed to the dispatcher and delivered in the
+    background, so sending never waits for SNS, Slack or email. A
+    deployment that starts and completes within one batch window is
+    reported once, with its final state.
+    """
+    
+    def __init__(
+        self,
+        dispatcher: Optional[NotificationDispatcher] = None,
+        channels: Optional[Sequence[str]] = None
+    ):
+        self.dispatcher = dispatcher or notification_dispatcher
+        channels = settings.notification_channels if channels is None else channels
+        self.channels: List[NotificationType] = [NotificationType(channel) for channel in channels]
+        self.enabled = bool(self.channels)
     
     def send_deployment_started(
         self,
@@ -29,12 +49,13 @@ class NotificationService:
         environment: str
     ) -> bool:
         """Send notification when deployment starts"""
-        logger.info(
-            f"Sending deployment started notification for {application} "
-            f"in {environment} (ID: {deployment_id})"
-        )
-        # Would integrate with SNS, Slack, etc. in production
-        return True
+        return self._send(deployment_id, {
+            "event": "deployment_started",
+            "deployment_id": deployment_id,
+            "application": application,
+            "environment": environment,
+            "text": f"Deployment of {application} to {environment} started (ID: {deployment_id})",
+        })
     
     def send_deployment_completed(
         self,
@@ -45,13 +66,29 @@ class NotificationService:
     ) -> bool:
         """Send notification when deployment completes"""
         status = "succeeded" if success else "failed"
-        logger.info(
-            f"Sending deployment {status} notification for {application} "
-            f"in {environment} (ID: {deployment_id})"
-        )
-        return True
+        return self._send(deployment_id, {
+            "event": "deployment_completed",
+            "deployment_id": deployment_id,
+            "application": application,
+            "environment": environment,
+            "success": success,
+            "text": f"Deployment of {application} to {environment} {status} (ID: {deployment_id})",
+        })
     
     def send_alert(self, message: str, severity: str = "info") -> bool:
-        """Send generic alert"""
+        """Send generic alert, repeats within a batch window are sent once"""
         logger.warning(f"Alert [{severity}]: {message}")
-        return True
+        return self._send(f"alert:{severity}:{message}", {
+            "event": "alert",
+            "severity": severity,
+            "text": message,
+        })
+    
+    def _send(self, key: str, payload: Dict[str, Any]) -> bool:
+        """Queue the notification on every channel, False if any dropped it"""
+        if not self.enabled:
+            return False
+        queued = True
+        for channel in self.channels:
+            queued &= self.dispatcher.submit(Notification(channel.value, payload, key=key))
+        return queued
@@ -0,0 +1,101 @@
+"""
+Circuit Breaker
+Fails fast while an external dependency keeps failing
+"""
+import logging
+import threading
+import time
+from typing import Optional
+from app.core.exceptions import CircuitOpenError
+from app.metrics.prometheus_metrics import metrics as prom_metrics
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for calls to one dependency
+    
+    After `failure_threshold` consecutive failures the circuit opens and
+    before_call() raises CircuitOpenError without the dependency being
+    called. Once `reset_timeout_seconds` have passed the circuit is half
+    open and lets one trial call through: a success closes it, a failure
+    opens it again. A trial call that never reports back is replaced by
+    another one after `reset_timeout_seconds`.
+    
+    Calls that fail for reasons other than the dependency (exceptions the
+    caller does not count as failures) should be reported as successes.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout_seconds: float = 30.0
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_started_at: Optional[float] = None
+        self._lock = threading.Lock()
+        prom_metrics.set_circuit_state(name, STATE_CLOSED)
+    
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == STATE_OPEN and time.monotonic() - self._opened_at >= self.reset_timeout_seconds:
+                self._transition(STATE_HALF_OPEN)
+            return self._state
+    
+    def before_call(self) -> None:
+        """Admit a call, CircuitOpenError while the circuit is open"""
+        if self._state == STATE_CLOSED:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if self._state == STATE_OPEN:
+                retry_after = self._opened_at + self.reset_timeout_seconds - now
+                if retry_after > 0:
+                    prom_metrics.record_circuit_rejection(self.name)
+                    raise CircuitOpenError(self.name, retry_after)
+                self._transition(STATE_HALF_OPEN)
+            if self._state == STATE_HALF_OPEN:
+                trial = self._trial_started_at
+                if trial is not None and now - trial < self.reset_timeout_seconds:
+                    prom_metrics.record_circuit_rejection(self.name)
+                    raise CircuitOpenError(self.name, trial + self.reset_timeout_seconds - now)
+                self._trial_started_at = now
+    
+    def record_success(self) -> None:
+        """Report a call the dependency answered"""
+        if self._state == STATE_CLOSED and not self._failures:
+            return
+        with self._lock:
+            self._failures = 0
+            if self._state != STATE_CLOSED:
+                self._transition(STATE_CLOSED)
+    
+    def record_failure(self) -> None:
+        """Report a failed call"""
+        with self._lock:
+            self._failures += 1
+            if self._state == STATE_HALF_OPEN or (
+                self._state == STATE_CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._opened_at = time.monotonic()
+                self._transition(STATE_OPEN)
+    
+    def _transition(self, state: str) -> None:
+        if state != STATE_HALF_OPEN:
+            self._trial_started_at = None
+        self._state = state
+        prom_metrics.set_circuit_state(self.name, state)
+        log = logger.warning if state == STATE_OPEN else logger.info
+        log(f"Circuit {self.name} is {state}")
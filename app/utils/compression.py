@@ -0,0 +1,162 @@
+"""
+Compression Utilities
+Content-Encoding negotiation, gzip/brotli encoders and pre-encoded bodies
+"""
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+GZIP = "gzip"
+BROTLI = "br"
+# In order of preference when a client accepts several with the same weight
+SUPPORTED_ENCODINGS = (BROTLI, GZIP) if brotli is not None else (GZIP,)
+MAX_LEVELS = {GZIP: 9, BROTLI: 11}
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+)
+# Events have to reach the client one by one, not when a buffer fills
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+
+
+def choose_encoding(
+    accept_encoding: Optional[str],
+    available: Iterable[str] = SUPPORTED_ENCODINGS
+) -> Optional[str]:
+    """Preferred available encoding the client accepts, None for identity"""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        weight = 1.0
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+    
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compressible(headers: Headers) -> bool:
+    """Whether a response with these headers is worth encoding"""
+    content_type = headers.get("content-type", "")
+    if "content-encoding" in headers or content_type.startswith(UNCOMPRESSED_TYPES):
+        return False
+    # Already negotiated by whoever built the response, e.g. a pre-encoded body
+    if "accept-encoding" in headers.get("vary", "").lower():
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES) or content_type.split(";")[0].endswith("+json")
+
+
+def set_encoded_headers(headers: MutableHeaders, encoding: str, content_length: Optional[int]) -> None:
+    """Adjust response headers to an encoded body, of unknown length when streamed"""
+    headers["Content-Encoding"] = encoding
+    headers.add_vary_header("Accept-Encoding")
+    if content_length is None:
+        if "content-length" in headers:
+            del headers["content-length"]
+    else:
+        headers["Content-Length"] = str(content_length)
+    # The encoded bytes differ, a strong validator would claim they do not
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    """Encode a complete body"""
+    if encoding == BROTLI:
+        return brotli.compress(body, quality=level)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _GZIP_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+class StreamEncoder:
+    """
+    Incremental encoder for streamed bodies
+    
+    Every encoded chunk is flushed, so the client can decode each part of
+    the stream as soon as it arrives instead of waiting for the end.
+    """
+    
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == BROTLI:
+            self._brotli = brotli.Compressor(quality=level)
+        else:
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, _GZIP_WBITS)
+    
+    def encode(self, chunk: bytes) -> bytes:
+        if self.encoding == BROTLI:
+            return self._brotli.process(chunk) + self._brotli.flush()
+        return self._zlib.compress(chunk) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+    
+    def finish(self) -> bytes:
+        if self.encoding == BROTLI:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class StaticBody:
+    """
+    A response that never changes, with its encoded variants built once
+    
+    Variants are encoded at the highest levels, since that cost is paid
+    once, and kept only when they are smaller than the original. Each
+    variant keeps its own header list, so sending one copies nothing.
+    """
+    
+    __slots__ = ("status_code", "variants")
+    
+    def __init__(
+        self,
+        status_code: int,
+        headers: List[Tuple[bytes, bytes]],
+        body: bytes,
+        minimum_size: int,
+        encodings: Iterable[str] = SUPPORTED_ENCODINGS
+    ):
+        self.status_code = status_code
+        self.variants: Dict[Optional[str], Tuple[List[Tuple[bytes, bytes]], bytes]] = {}
+        if len(body) >= minimum_size and compressible(Headers(raw=headers)):
+            for encoding in encodings:
+                encoded = compress(body, encoding, MAX_LEVELS[encoding])
+                if len(encoded) < len(body):
+                    encoded_headers = MutableHeaders(raw=list(headers))
+                    set_encoded_headers(encoded_headers, encoding, len(encoded))
+                    self.variants[encoding] = (encoded_headers.raw, encoded)
+        if self.variants:
+            # Caches must not hand the plain body to clients that accept an encoding
+            headers = MutableHeaders(raw=list(headers))
+            headers.add_vary_header("Accept-Encoding")
+            headers = headers.raw
+        self.variants[None] = (headers, body)
+    
+    @property
+    def encodings(self) -> List[str]:
+        return [encoding for encoding in self.variants if encoding is not None]
+    
+    async def send(self, send: Send, encoding: Optional[str] = None) -> None:
+        headers, body = self.variants[encoding]
+        await send({"type": "http.response.start", "status": self.status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -11,10 +11,12 @@ APP_VERSION = "1.0.0"
 MAX_DEPLOYMENT_RETRIES = 3
 DEPLOYMENT_TIMEOUT_SECONDS = 600
 DEFAULT_DEPLOYMENT_ENVIRONMENT = "prod"
+MAX_BATCH_SIZE = 500
 
 # Pagination
 DEFAULT_PAGE_SIZE = 20
 MAX_PAGE_SIZE = 100
+EXPORT_BATCH_SIZE = 500
 
 # Cache
 DEFAULT_CACHE_TTL_SECONDS = 300
@@ -2,55 +2,232 @@
 Retry Utilities
 Implements retry logic with exponential backoff
 """
+import asyncio
+import inspect
+import random
+import threading
 import time
 import logging
-from typing import Callable, Any, Type
+from typing import Callable, Any, Optional, Type
 from functools import wraps
+from app.metrics.prometheus_metrics import metrics as prom_metrics
+from app.utils.circuit_breaker import CircuitBreaker
 
 logger = logging.getLogger(__name__)
 
+JITTER_NONE = "none"
+JITTER_FULL = "full"
+JITTER_DECORRELATED = "decorrelated"
+_JITTERS = (JITTER_NONE, JITTER_FULL, JITTER_DECORRELATED)
+
+
+def backoff_delay(
+    attempt: int,
+    delay_seconds: float,
+    backoff_factor: float = 2.0,
+    max_delay_seconds: float = 30.0,
+    jitter: str = JITTER_NONE,
+    previous_delay: Optional[float] = None
+) -> float:
+    """
+    Seconds to wait before retry number `attempt` (1 for the first retry)
+    
+    Full jitter waits a random time up to the exponential delay.
+    Decorrelated jitter waits between `delay_seconds` and three times the
+    previous delay. Both spread out callers that failed at the same
+    moment, so their retries do not arrive together.
+    """
+    if jitter == JITTER_DECORRELATED:
+        previous = previous_delay or delay_seconds
+        return min(max_delay_seconds, random.uniform(delay_seconds, previous * 3))
+    delay = min(max_delay_seconds, delay_seconds * backoff_factor ** (attempt - 1))
+    if jitter == JITTER_FULL:
+        return random.uniform(0, delay)
+    return delay
+
+
+class RetryBudget:
+    """
+    Caps retries at a share of calls
+    
+    Every call deposits `ratio` tokens and every retry takes one, with
+    `min_retries_per_second` tokens added over time so rarely used
+    operations can still retry. Once a failing dependency has used up the
+    budget, calls fail after their first attempt instead of multiplying
+    the load on it.
+    """
+    
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_retries_per_second: float = 1.0,
+        max_tokens: float = 10.0
+    ):
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def record_call(self) -> None:
+        """Count a first attempt"""
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+    
+    def try_retry(self) -> bool:
+        """Take a token for a retry, False when the budget is spent"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.max_tokens,
+                self._tokens + (now - self._updated) * self.min_retries_per_second
+            )
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
 
 def retry(
     max_attempts: int = 3,
     delay_seconds: float = 1.0,
     backoff_factor: float = 2.0,
-    exceptions: tuple[Type[Exception], ...] = (Exception,)
+    exceptions: tuple[Type[Exception], ...] = (Exception,),
+    jitter: str = JITTER_NONE,
+    max_delay_seconds: float = 30.0,
+    deadline_seconds: Optional[float] = None,
+    budget: Optional[RetryBudget] = None,
+    breaker: Optional[CircuitBreaker] = None
 ):
     """
     Retry decorator with exponential backoff
     
+    Works on functions and coroutine functions. Coroutines wait with
+    asyncio.sleep, so the event loop keeps serving other requests during
+    the backoff; plain functions still use time.sleep and must not be
+    called from the event loop.
+    
     Args:
         max_attempts: Maximum number of retry attempts
         delay_seconds: Initial delay between retries
         backoff_factor: Multiplier for delay after each retry
         exceptions: Tuple of exceptions to catch and retry
+        jitter: "none", "full" or "decorrelated"; opt in to spread out
+            the retries of callers that failed together
+        max_delay_seconds: Upper bound of a single delay
+        deadline_seconds: Overall time for all attempts; coroutine attempts
+            are cancelled when it passes, which counts as a failure for the
+            breaker
+        budget: Retry budget shared by the callers of a dependency
+        breaker: Circuit breaker of the dependency; while it is open calls
+            raise CircuitOpenError without being attempted
     """
+    if jitter not in _JITTERS:
+        raise ValueError(f"Unknown retry jitter: {jitter}")
+    
     def decorator(func: Callable) -> Callable:
+        name = func.__qualname__
+        
+        def next_delay(attempt: int, started: float, previous_delay: Optional[float], exc: Exception) -> Optional[float]:
+            """Delay before the next attempt, None to give up"""
+            if attempt >= max_attempts:
+                logger.error(f"Function {name} failed after {max_attempts} attempts")
+                prom_metrics.record_retry(name, "exhausted")
+                return None
+            delay = backoff_delay(
+                attempt, delay_seconds, backoff_factor, max_delay_seconds, jitter, previous_delay
+            )
+            if deadline_seconds is not None and time.monotonic() - started + delay >= deadline_seconds:
+                logger.error(f"Function {name} failed, deadline of {deadline_seconds}s reached")
+                prom_metrics.record_retry(name, "deadline")
+                return None
+            if budget is not None and not budget.try_retry():
+                logger.error(f"Function {name} failed, retry budget exhausted")
+                prom_metrics.record_retry(name, "budget")
+                return None
+            logger.warning(
+                f"Attempt {attempt}/{max_attempts} failed for {name}: {exc}. "
+                f"Retrying in {delay:.2f}s..."
+            )
+            prom_metrics.record_retry(name, "retried")
+            return delay
+        
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs) -> Any:
+                started = time.monotonic()
+                delay = None
+                if budget is not None:
+                    budget.record_call()
+                attempt = 1
+                while True:
+                    if breaker is not None:
+                        breaker.before_call()
+                    try:
+                        if deadline_seconds is None:
+                            result = await func(*args, **kwargs)
+                        else:
+                            remaining = deadline_seconds - (time.monotonic() - started)
+                            result = await asyncio.wait_for(func(*args, **kwargs), max(remaining, 0.0))
+                    except exceptions as e:
+                        if breaker is not None:
+                            breaker.record_failure()
+                        delay = next_delay(attempt, started, delay, e)
+                        if delay is None:
+                            raise
+                        await asyncio.sleep(delay)
+                        attempt += 1
+                    except asyncio.TimeoutError:
+                        # Usually the deadline cancelling an attempt that hung on the
+                        # dependency, which is the failure the breaker is there for
+                        if breaker is not None:
+                            breaker.record_failure()
+                        logger.error(f"Function {name} failed, deadline of {deadline_seconds}s reached")
+                        prom_metrics.record_retry(name, "deadline")
+                        raise
+                    except Exception:
+                        # Not a failure of the dependency
+                        if breaker is not None:
+                            breaker.record_success()
+                        raise
+                    else:
+                        if breaker is not None:
+                            breaker.record_success()
+                        return result
+            
+            return async_wrapper
+        
         @wraps(func)
         def wrapper(*args, **kwargs) -> Any:
+            started = time.monotonic()
+            delay = None
+            if budget is not None:
+                budget.record_call()
             attempt = 1
-            current_delay = delay_seconds
-            
-            while attempt <= max_attempts:
+            while True:
+                if breaker is not None:
+                    breaker.before_call()
                 try:
-                    return func(*args, **kwargs)
+                    result = func(*args, **kwargs)
                 except exceptions as e:
-                    if attempt == max_attempts:
-                        logger.error(
-                            f"Function {func.__name__} failed after {max_attempts} attempts"
-                        )
+                    if breaker is not None:
+                        breaker.record_failure()
+                    delay = next_delay(attempt, started, delay, e)
+                    if delay is None:
                         raise
-                    
-                    logger.warning(
-                        f"Attempt {attempt}/{max_attempts} failed for {func.__name__}: {e}. "
-                        f"Retrying in {current_delay}s..."
-                    )
-                    
-                    time.sleep(current_delay)
-                    current_delay *= backoff_factor
+                    time.sleep(delay)
                     attempt += 1
-            
-            return None
+                except Exception:
+                    # Not a failure of the dependency
+                    if breaker is not None:
+                        breaker.record_success()
+                    raise
+                else:
+                    if breaker is not None:
+                        breaker.record_success()
+                    return result
         
         return wrapper
     return decorator
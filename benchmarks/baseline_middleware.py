@@ -0,0 +1,98 @@
+"""
+Baseline Middleware
+The BaseHTTPMiddleware stack that RequestContextMiddleware replaced
+
+Kept only so bench_middleware can compare against it; the application
+does not use these.
+"""
+import logging
+import time
+import uuid
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+from app.core.exceptions import ApplicationError
+
+logger = logging.getLogger(__name__)
+
+
+class RequestIDMiddleware(BaseHTTPMiddleware):
+    """Middleware to add request ID to all requests"""
+    
+    async def dispatch(self, request: Request, call_next) -> Response:
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        
+        return response
+
+
+class LoggingMiddleware(BaseHTTPMiddleware):
+    """Middleware to log all requests and responses"""
+    
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        
+        logger.info(
+            f"Request started: {request.method} {request.url.path}",
+            extra={
+                "method": request.method,
+                "path": request.url.path,
+                "request_id": getattr(request.state, "request_id", None),
+            }
+        )
+        
+        response = await call_next(request)
+        
+        duration = time.time() - start_time
+        
+        logger.info(
+            f"Request completed: {request.method} {request.url.path}",
+            extra={
+                "method": request.method,
+                "path": request.url.path,
+                "status_code": response.status_code,
+                "duration_ms": round(duration * 1000, 2),
+                "request_id": getattr(request.state, "request_id", None),
+            }
+        )
+        
+        return response
+
+
+async def error_handler_middleware(request: Request, call_next):
+    """Global error handling middleware"""
+    try:
+        return await call_next(request)
+    except ApplicationError as exc:
+        logger.error(
+            f"Application error: {exc.message}",
+            extra={
+                "error_code": exc.code,
+                "request_id": getattr(request.state, "request_id", None),
+            }
+        )
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "error": exc.code,
+                "message": exc.message,
+                "request_id": getattr(request.state, "request_id", None),
+            }
+        )
+    except Exception as exc:
+        logger.exception(
+            "Unhandled exception",
+            extra={"request_id": getattr(request.state, "request_id", None)}
+        )
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={
+                "error": "INTERNAL_SERVER_ERROR",
+                "message": "An unexpected error occurred",
+                "request_id": getattr(request.state, "request_id", None),
+            }
+        )
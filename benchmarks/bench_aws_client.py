@@ -0,0 +1,87 @@
+"""
+AWS Client Layer Benchmark
+Compares a boto3 client per request with the pooled, cached AWSService
+
+Runs against moto's in-process server, so no AWS account is needed
+(requires `pip install boto3 "moto[server]"`).
+
+Usage: python -m benchmarks.bench_aws_client [--requests 200] [--clusters 20]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+import boto3
+from moto.server import ThreadedMotoServer
+from app.services.aws_service import AWSService
+
+REGION = "us-east-1"
+
+
+def seed(endpoint_url: str, clusters: int) -> None:
+    ecs = boto3.client("ecs", region_name=REGION, endpoint_url=endpoint_url)
+    for index in range(clusters):
+        ecs.create_cluster(clusterName=f"cluster-{index}")
+
+
+async def per_request_clients(endpoint_url: str, names: list) -> float:
+    """What the old placeholder comment suggested: a client and a blocking call per request"""
+    async def handle(name: str) -> None:
+        client = boto3.client("ecs", region_name=REGION, endpoint_url=endpoint_url)
+        client.describe_clusters(clusters=[name])
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(handle(name) for name in names))
+    return time.perf_counter() - start
+
+
+async def pooled(service: AWSService, names: list) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(service.get_ecs_cluster_info(name) for name in names))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--clusters", type=int, default=20)
+    args = parser.parse_args()
+    
+    logging.disable(logging.CRITICAL)
+    # moto accepts any credentials, but botocore needs some to sign requests
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+    server = ThreadedMotoServer(port=0, verbose=False)
+    server.start()
+    host, port = server.get_host_and_port()
+    endpoint_url = f"http://{host}:{port}"
+    seed(endpoint_url, args.clusters)
+    names = [f"cluster-{index % args.clusters}" for index in range(args.requests)]
+    
+    elapsed = asyncio.run(per_request_clients(endpoint_url, names))
+    print(f"{'client per request':<28} {elapsed * 1000:>9.1f} ms  {args.requests} SDK calls")
+    
+    service = AWSService(region=REGION, enabled=True, endpoint_url=endpoint_url)
+    service.start()
+    sdk_calls = 0
+    
+    def count_call(**kwargs) -> None:
+        nonlocal sdk_calls
+        sdk_calls += 1
+    
+    service._clients["ecs"].meta.events.register("before-call.ecs.*", count_call)
+    
+    async def run() -> None:
+        for label in ("pooled, cold cache", "pooled, warm cache"):
+            calls_before = sdk_calls
+            elapsed = await pooled(service, names)
+            print(f"{label:<28} {elapsed * 1000:>9.1f} ms  {sdk_calls - calls_before} SDK calls")
+    
+    asyncio.run(run())
+    service.close()
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
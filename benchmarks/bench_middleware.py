@@ -0,0 +1,89 @@
+"""
+Middleware Stack Benchmark
+Compares requests/sec of the BaseHTTPMiddleware stack with the fused ASGI middleware
+
+Usage: python -m benchmarks.bench_middleware [--requests 5000]
+"""
+import argparse
+import asyncio
+import logging
+import time
+from fastapi import FastAPI
+from app.middlewares.request_context import RequestContextMiddleware
+from benchmarks.baseline_middleware import (
+    LoggingMiddleware,
+    RequestIDMiddleware,
+    error_handler_middleware
+)
+
+
+def build_app(fused: bool) -> FastAPI:
+    app = FastAPI()
+    
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+    
+    if fused:
+        app.add_middleware(RequestContextMiddleware)
+    else:
+        app.add_middleware(RequestIDMiddleware)
+        app.add_middleware(LoggingMiddleware)
+        app.middleware("http")(error_handler_middleware)
+    return app
+
+
+async def drive(app: FastAPI, requests: int, path: str = "/ping") -> float:
+    """Call the ASGI app directly so only the app and middleware are measured"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+    
+    start = time.perf_counter()
+    for _ in range(requests):
+        messages = [{"type": "http.request", "body": b"", "more_body": False}]
+        response_complete = asyncio.Event()
+        
+        async def receive():
+            if messages:
+                return messages.pop()
+            # Like uvicorn, report a disconnect once the response is complete
+            await response_complete.wait()
+            return {"type": "http.disconnect"}
+        
+        async def send(message):
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                response_complete.set()
+        
+        await app(dict(scope), receive, send)
+    return requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    
+    # Measure middleware overhead, not stdout throughput
+    logging.disable(logging.CRITICAL)
+    
+    for name, fused in (("BaseHTTPMiddleware stack", False), ("fused ASGI middleware", True)):
+        app = build_app(fused)
+        asyncio.run(drive(app, 200))  # warm up
+        rate = asyncio.run(drive(app, args.requests))
+        print(f"{name:<26} {rate:>10.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Notification Dispatcher Benchmark
+Delivers deployment notifications to a local HTTP stand-in for Slack/SNS/email
+
+The stand-in answers every POST after --latency-ms and fails a share of
+them (--failure-rate) with 503, so batching, coalescing, rate limiting and
+retries can be observed without any external service.
+
+Usage: python -m benchmarks.bench_notifications [--deployments 2000] [--latency-ms 50]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from app.metrics.prometheus_metrics import metrics as prom_metrics
+from app.services.notification_dispatcher import NotificationDispatcher, build_channels
+from app.services.notification_service import NotificationService
+
+
+class StandIn:
+    """Local webhook endpoint that records what it receives"""
+    
+    def __init__(self, latency_seconds: float, failure_rate: float):
+        self.latency_seconds = latency_seconds
+        self.failure_rate = failure_rate
+        self.requests = 0
+        self.failures = 0
+        self.notifications = 0
+        self._lock = threading.Lock()
+        stand_in = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                time.sleep(stand_in.latency_seconds)
+                failed = random.random() < stand_in.failure_rate
+                with stand_in._lock:
+                    stand_in.requests += 1
+                    if failed:
+                        stand_in.failures += 1
+                    else:
+                        stand_in.notifications += len(json.loads(body)["notifications"])
+                self.send_response(503 if failed else 204)
+                self.end_headers()
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+async def run(args: argparse.Namespace, stand_in: StandIn) -> None:
+    channels = ["slack", "sns"]
+    dispatcher = NotificationDispatcher(
+        build_channels(channels, {channel: f"{stand_in.url}/{channel}" for channel in channels}, 5.0),
+        queue_size=args.queue_size,
+        workers=args.workers,
+        batch_window_seconds=args.window,
+        max_batch_size=args.batch_size,
+        rate_limits={"slack": args.rate, "sns": args.rate},
+        retry_base_seconds=0.05
+    )
+    service = NotificationService(dispatcher=dispatcher, channels=channels)
+    await dispatcher.start()
+    
+    start = time.perf_counter()
+    for index in range(args.deployments):
+        deployment_id = f"deployment-{index}"
+        service.send_deployment_started(deployment_id, "api", "prod")
+        service.send_deployment_completed(deployment_id, "api", "prod", success=True)
+        if index % 100 == 0:
+            # Let the collector run, as it would between requests
+            await asyncio.sleep(0)
+    submit_seconds = time.perf_counter() - start
+    
+    await dispatcher.stop(timeout_seconds=120)
+    total_seconds = time.perf_counter() - start
+    
+    sent = 4 * args.deployments
+    print(f"submitted {sent} notifications in {submit_seconds * 1000:.1f} ms "
+          f"({submit_seconds / sent * 1e6:.1f} us each)")
+    print(f"delivered {stand_in.notifications} notifications in {stand_in.requests} requests "
+          f"({stand_in.failures} failed and retried) in {total_seconds:.2f}s")
+    print(f"not delivered: {dict(dropped_by_reason())}")
+
+
+def dropped_by_reason() -> Counter:
+    dropped: Counter = Counter()
+    for metric in prom_metrics.notifications_dropped.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_total"):
+                dropped[sample.labels["reason"]] += int(sample.value)
+    return dropped
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--deployments", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--failure-rate", type=float, default=0.1)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queue-size", type=int, default=10000)
+    parser.add_argument("--window", type=float, default=0.2)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--rate", type=float, default=20.0, help="batches per second per channel")
+    args = parser.parse_args()
+    
+    logging.disable(logging.CRITICAL)
+    stand_in = StandIn(args.latency_ms / 1000, args.failure_rate)
+    asyncio.run(run(args, stand_in))
+    stand_in.server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Prometheus Scrape Benchmark
+Measures multiprocess scrape cost as the number of series grows
+
+Usage: python -m benchmarks.bench_prometheus_scrape [--workers 2] [--repeat 5]
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+
+# Must be set before prometheus_client is imported by the app
+MULTIPROC_DIR = tempfile.mkdtemp(prefix="prom-bench-")
+os.environ["PROMETHEUS_MULTIPROC_DIR"] = MULTIPROC_DIR
+
+from app.metrics.prometheus_metrics import metrics  # noqa: E402
+
+SERIES_COUNTS = [100, 1_000, 10_000]
+
+
+def record_series(endpoints: int) -> None:
+    """Simulate one worker serving requests across many endpoints"""
+    for i in range(endpoints):
+        metrics.record_request("GET", f"/bench/{i}", 200, 0.01)
+
+
+def run(series: int, workers: int, repeat: int) -> tuple[float, int]:
+    for name in os.listdir(MULTIPROC_DIR):
+        os.remove(os.path.join(MULTIPROC_DIR, name))
+    
+    # Each request series produces one counter and one histogram per endpoint
+    endpoints = max(1, series // 2)
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=record_series, args=(endpoints,)) for _ in range(workers)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = len(metrics.export_metrics())
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    print(f"{'series':>8} {'workers':>8} {'scrape ms':>10} {'bytes':>10}")
+    for series in SERIES_COUNTS:
+        seconds, size = run(series, args.workers, args.repeat)
+        print(f"{series:>8} {args.workers:>8} {seconds * 1000:>10.1f} {size:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Deployment Repository Concurrency Benchmark
+Races many writer threads over the same deployments in each in-memory store
+
+Every writer walks all deployments in its own random order and tries to
+start and then complete each one, while inserter threads add new pending
+deployments and a reader pages through the store by status. Afterwards
+the run is checked for double wins (a deployment started or completed by
+more than one writer), status index drift and reader errors.
+
+With 0 lock stripes the stores rely on the event loop thread alone, which
+threads break; 1 stripe serializes all writers behind a single lock.
+
+Usage: python -m benchmarks.bench_repository_concurrency [--deployments 2000] [--writers 16]
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from app.core.exceptions import InvalidStateTransitionError
+from app.models.deployment import Deployment, DeploymentFilter, DeploymentStatus
+from app.repositories.compact_deployment_repository import CompactDeploymentRepository
+from app.repositories.deployment_repository import DeploymentRepository
+
+STORES = {
+    "objects": DeploymentRepository,
+    "compact": CompactDeploymentRepository,
+}
+INSERTERS = 2
+
+
+def pending(index: int) -> Deployment:
+    return Deployment(
+        id="",
+        application=f"service-{index % 20}",
+        version="1.0.0",
+        environment=("dev", "staging", "prod")[index % 3],
+        deployed_by=f"user-{index % 5}",
+        status=DeploymentStatus.PENDING
+    )
+
+
+def mark_started(deployment: Deployment) -> None:
+    deployment.status = DeploymentStatus.IN_PROGRESS
+
+
+def mark_completed(deployment: Deployment) -> None:
+    deployment.status = DeploymentStatus.SUCCESS
+
+
+def run(store: str, stripes: int, deployments: int, writers: int, inserts: int) -> dict:
+    repository = STORES[store](lock_stripes=stripes)
+    ids = [d.id for d in repository.create_many([pending(i) for i in range(deployments)])]
+    wins = Counter()
+    errors = Counter()
+    tally = threading.Lock()
+    stop = threading.Event()
+    
+    def writer(seed: int) -> None:
+        order = ids[:]
+        random.Random(seed).shuffle(order)
+        won = Counter()
+        for deployment_id in order:
+            for target, apply in (
+                (DeploymentStatus.IN_PROGRESS, mark_started),
+                (DeploymentStatus.SUCCESS, mark_completed),
+            ):
+                try:
+                    repository.transition(deployment_id, target, apply)
+                    won[deployment_id, target] += 1
+                except InvalidStateTransitionError:
+                    pass
+                except Exception as e:
+                    errors[type(e).__name__] += 1
+        with tally:
+            wins.update(won)
+    
+    def inserter(offset: int) -> None:
+        for index in range(inserts):
+            try:
+                repository.create(pending(offset + index))
+            except Exception as e:
+                errors[type(e).__name__] += 1
+    
+    def reader() -> None:
+        filters = DeploymentFilter(status=DeploymentStatus.IN_PROGRESS)
+        while not stop.is_set():
+            try:
+                cursor = None
+                while True:
+                    _, cursor = repository.list_page(cursor=cursor, limit=200, filters=filters)
+                    if cursor is None:
+                        break
+            except Exception as e:
+                errors[f"reader {type(e).__name__}"] += 1
+    
+    threads = [threading.Thread(target=writer, args=(seed,)) for seed in range(writers)]
+    threads += [
+        threading.Thread(target=inserter, args=(deployments + n * inserts,)) for n in range(INSERTERS)
+    ]
+    watcher = threading.Thread(target=reader)
+    watcher.start()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    watcher.join()
+    
+    expected_total = deployments + INSERTERS * inserts
+    by_status = {status: repository.count_by_status(status) for status in DeploymentStatus}
+    indexed = sum(by_status.values())
+    return {
+        "attempts": writers * deployments * 2,
+        "elapsed": elapsed,
+        "double_wins": sum(count - 1 for count in wins.values() if count > 1),
+        "lost": deployments * 2 - len(wins),
+        "index_drift": abs(indexed - expected_total) + abs(repository.count() - expected_total),
+        "complete": by_status[DeploymentStatus.SUCCESS] == deployments,
+        "errors": sum(errors.values()),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--deployments", type=int, default=2000)
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--inserts", type=int, default=2000)
+    parser.add_argument("--stripes", type=int, nargs="+", default=[0, 1, 64])
+    args = parser.parse_args()
+    
+    # Switch threads as often as possible, so races show up within one run
+    sys.setswitchinterval(1e-6)
+    print(
+        f"{'store':<8} {'stripes':>7} {'attempts/s':>11} {'double wins':>12} "
+        f"{'lost':>5} {'index drift':>12} {'errors':>7} {'all done':>9}"
+    )
+    for store in STORES:
+        for stripes in args.stripes:
+            result = run(store, stripes, args.deployments, args.writers, args.inserts)
+            print(
+                f"{store:<8} {stripes:>7} {result['attempts'] / result['elapsed']:>11,.0f} "
+                f"{result['double_wins']:>12} {result['lost']:>5} {result['index_drift']:>12} "
+                f"{result['errors']:>7} {'yes' if result['complete'] else 'no':>9}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Deployment Repository Memory Benchmark
+Compares resident memory of the object and compact in-memory stores
+
+Each store is filled in its own process with completed deployments that
+look like a long-running history, so the numbers do not mix.
+
+Usage: python -m benchmarks.bench_repository_memory [--records 1000000]
+"""
+import argparse
+import gc
+import multiprocessing
+import time
+import uuid
+from datetime import datetime, timedelta
+import psutil
+from app.models.deployment import Deployment, DeploymentStatus
+from app.repositories.compact_deployment_repository import CompactDeploymentRepository
+from app.repositories.deployment_repository import DeploymentRepository
+
+STORES = {
+    "objects": DeploymentRepository,
+    "compact": CompactDeploymentRepository,
+}
+CHUNK = 10000
+
+
+def history(count: int, offset: int):
+    """Deployments of 200 services by 50 users, mostly successful"""
+    started = datetime(2024, 1, 1)
+    for i in range(offset, offset + count):
+        failed = i % 20 == 0
+        start = started + timedelta(seconds=i * 30)
+        yield Deployment(
+            id=str(uuid.uuid4()),
+            application=f"service-{i % 200}",
+            version=f"1.{i % 50}.{i % 7}",
+            environment=("dev", "staging", "prod")[i % 3],
+            status=DeploymentStatus.FAILED if failed else DeploymentStatus.SUCCESS,
+            started_at=start,
+            completed_at=start + timedelta(seconds=90 + i % 600),
+            error_message="health check failed" if failed else None,
+            deployed_by=f"user-{i % 50}"
+        )
+
+
+def measure(store: str, records: int, results) -> None:
+    process = psutil.Process()
+    gc.collect()
+    baseline = process.memory_info().rss
+    repository = STORES[store]()
+    
+    start = time.perf_counter()
+    for offset in range(0, records, CHUNK):
+        repository.create_many(list(history(min(CHUNK, records - offset), offset)))
+    elapsed = time.perf_counter() - start
+    
+    gc.collect()
+    used = process.memory_info().rss - baseline
+    assert repository.count() == records
+    page, _ = repository.list_page(limit=100)
+    assert len(page) == min(100, records)
+    results.put((store, used, elapsed))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=1_000_000)
+    args = parser.parse_args()
+    
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    print(f"{'store':<8} {'records':>9} {'memory':>10} {'per record':>11} {'insert':>9}")
+    for store in STORES:
+        worker = context.Process(target=measure, args=(store, args.records, results))
+        worker.start()
+        name, used, elapsed = results.get()
+        worker.join()
+        print(
+            f"{name:<8} {args.records:>9} {used / 2 ** 20:>7.0f} MB "
+            f"{used / args.records:>8.0f} B {elapsed:>8.1f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
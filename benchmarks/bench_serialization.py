@@ -0,0 +1,76 @@
+"""
+Deployment List Serialization Benchmark
+Compares the response_model path with the precompiled serializer for list pages
+
+Usage: python -m benchmarks.bench_serialization [--rounds 200]
+"""
+import argparse
+import asyncio
+import json
+import time
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.core.responses import FastJSONResponse
+from app.repositories.deployment_repository import DeploymentRepository
+from app.schemas.deployment_schema import DeploymentListResponse, DeploymentResponse
+from app.schemas.deployment_serializers import deployment_list_json
+from app.services.deployment_service import DeploymentService
+
+PAGE_SIZES = (20, 100, 1000)
+
+# What FastAPI does with a response_model when an endpoint returns a model
+_list_field = create_response_field(name="list_deployments", type_=DeploymentListResponse)
+
+
+async def response_model_path(deployments, total: int, page_size: int) -> bytes:
+    """Previous endpoint: model_validate per item, then response_model validation and json.dumps"""
+    content = DeploymentListResponse(
+        deployments=[DeploymentResponse.model_validate(d) for d in deployments],
+        total=total,
+        page=1,
+        page_size=page_size,
+        next_cursor=None
+    )
+    encoded = await serialize_response(field=_list_field, response_content=content, is_coroutine=True)
+    return JSONResponse(encoded).body
+
+
+async def fast_path(deployments, total: int, page_size: int) -> bytes:
+    """Current endpoint: serialize the validated deployments once with pydantic-core"""
+    return FastJSONResponse(deployment_list_json(deployments, total, 1, page_size, None)).body
+
+
+async def measure(path, deployments, total: int, page_size: int, rounds: int) -> float:
+    await path(deployments, total, page_size)  # warm up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await path(deployments, total, page_size)
+    return (time.perf_counter() - start) / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    
+    service = DeploymentService(DeploymentRepository())
+    service.create_deployments([
+        {"application": f"service-{i % 40}", "version": f"1.{i}", "environment": "prod"}
+        for i in range(max(PAGE_SIZES))
+    ])
+    
+    print(f"{'page size':>9} {'response_model':>16} {'fast path':>12} {'speedup':>8}")
+    for page_size in PAGE_SIZES:
+        deployments, total, _ = service.list_deployments(page=1, page_size=page_size)
+        # Both paths must produce the same document
+        assert json.loads(asyncio.run(response_model_path(deployments, total, page_size))) == json.loads(
+            asyncio.run(fast_path(deployments, total, page_size))
+        )
+        slow = asyncio.run(measure(response_model_path, deployments, total, page_size, args.rounds))
+        fast = asyncio.run(measure(fast_path, deployments, total, page_size, args.rounds))
+        print(f"{page_size:>9} {slow * 1e3:>13.3f} ms {fast * 1e3:>9.3f} ms {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()